@@ -7,6 +7,10 @@
     return typeof value === "object" && value !== null && !Array.isArray(value);
   }
 
+  function hasOwn(object, key) {
+    return Object.prototype.hasOwnProperty.call(object, key);
+  }
+
   function unique(items) {
     return [...new Set(items)];
   }
@@ -113,8 +117,11 @@
     return metadata;
   }
 
-  function buildIndexes(materias) {
+  function buildIndexes(materias, graph = null) {
     const byId = Object.fromEntries(materias.map((materia) => [materia.id, materia]));
+    if (graph) {
+      return { byId, dependents: graph.dependents };
+    }
     const dependents = materias.reduce((acc, materia) => {
       materia.correlativas.forEach((correlativaId) => {
         if (!acc[correlativaId]) acc[correlativaId] = [];
@@ -125,6 +132,148 @@
     return { byId, dependents };
   }
 
+  const GRAPH_VERSION = 1;
+
+  function decodeBitset(encoded, size) {
+    const bytes = new Uint8Array(Math.ceil(size / 8));
+    const binary = atob(encoded);
+    for (let index = 0; index < binary.length && index < bytes.length; index += 1) {
+      bytes[index] = binary.charCodeAt(index);
+    }
+    return bytes;
+  }
+
+  function hasBit(bitset, index) {
+    return (bitset[index >> 3] & (1 << (index & 7))) !== 0;
+  }
+
+  function graphFromOrder(order, prerequisites, depth, closure) {
+    const position = Object.fromEntries(order.map((id, index) => [id, index]));
+    const dependents = {};
+    order.forEach((id) => {
+      prerequisites[id].forEach((correlativaId) => {
+        if (!dependents[correlativaId]) dependents[correlativaId] = [];
+        dependents[correlativaId].push(id);
+      });
+    });
+    return {
+      order,
+      position,
+      dependents,
+      depth: Object.fromEntries(order.map((id, index) => [id, depth[index]])),
+      criticalPath: depth.length > 0 ? Math.max(...depth) + 1 : 0,
+      closure
+    };
+  }
+
+  // Same algorithm as build_dependency_graph in tools/pdf_to_plan_json.py,
+  // for plans published without the precomputed "grafo" section.
+  function computeGraphIndex(materias) {
+    const byId = Object.fromEntries(materias.map((materia) => [materia.id, materia]));
+    const prerequisites = {};
+    const pending = {};
+    const dependentIds = {};
+    materias.forEach((materia) => {
+      // Repeated correlativas count once, as in dict.fromkeys() on the Python side.
+      prerequisites[materia.id] = [...new Set(materia.correlativas)].filter((cid) => byId[cid] && cid !== materia.id);
+      pending[materia.id] = prerequisites[materia.id].length;
+      dependentIds[materia.id] = [];
+    });
+    materias.forEach((materia) => {
+      prerequisites[materia.id].forEach((cid) => dependentIds[cid].push(materia.id));
+    });
+
+    const byRank = (a, b) => {
+      const diff = byId[a].cuatrimestre - byId[b].cuatrimestre;
+      if (diff !== 0) return diff;
+      return a < b ? -1 : a > b ? 1 : 0;
+    };
+    const ready = materias.map((materia) => materia.id).filter((id) => pending[id] === 0);
+    const order = [];
+    while (ready.length > 0) {
+      ready.sort(byRank);
+      const id = ready.shift();
+      order.push(id);
+      dependentIds[id].forEach((dependentId) => {
+        pending[dependentId] -= 1;
+        if (pending[dependentId] === 0) ready.push(dependentId);
+      });
+    }
+    if (order.length !== materias.length) return null;
+
+    const position = Object.fromEntries(order.map((id, index) => [id, index]));
+    const depth = [];
+    const closure = [];
+    order.forEach((id, index) => {
+      const bits = new Uint8Array(Math.ceil(index / 8));
+      let level = 0;
+      prerequisites[id].forEach((cid) => {
+        const prereqIndex = position[cid];
+        closure[prereqIndex].forEach((byte, byteIndex) => {
+          bits[byteIndex] |= byte;
+        });
+        bits[prereqIndex >> 3] |= 1 << (prereqIndex & 7);
+        level = Math.max(level, depth[prereqIndex] + 1);
+      });
+      depth.push(level);
+      closure.push(bits);
+    });
+    return graphFromOrder(order, prerequisites, depth, closure);
+  }
+
+  function decodeGraphIndex(materias, rawGraph) {
+    if (!isPlainObject(rawGraph) || rawGraph.version !== GRAPH_VERSION) return null;
+    const { orden, dependientes, profundidad, prerrequisitos } = rawGraph;
+    const size = materias.length;
+    if (![orden, dependientes, profundidad, prerrequisitos].every((list) => Array.isArray(list) && list.length === size)) {
+      return null;
+    }
+
+    const position = {};
+    orden.forEach((id, index) => {
+      position[id] = index;
+    });
+    const prerequisites = {};
+    let edgeCount = 0;
+    for (const materia of materias) {
+      if (!(materia.id in position)) return null;
+      prerequisites[materia.id] = materia.correlativas;
+      for (const correlativaId of materia.correlativas) {
+        // A stale section (plan edited after publishing) no longer matches the edges.
+        if (!(position[correlativaId] < position[materia.id])) return null;
+        if (!dependientes[position[correlativaId]]?.includes?.(position[materia.id])) return null;
+        edgeCount += 1;
+      }
+    }
+    const listed = dependientes.reduce((total, list) => total + (Array.isArray(list) ? list.length : 0), 0);
+    if (listed !== edgeCount) return null;
+
+    try {
+      const closure = prerrequisitos.map((encoded, index) => decodeBitset(String(encoded), index));
+      return graphFromOrder(orden, prerequisites, profundidad.map(Number), closure);
+    } catch {
+      return null;
+    }
+  }
+
+  function buildGraphIndex(materias, rawGraph) {
+    return decodeGraphIndex(materias, rawGraph) || computeGraphIndex(materias);
+  }
+
+  function hasPrerequisite(graph, id, prerequisiteId) {
+    const index = graph.position[id];
+    const prereqIndex = graph.position[prerequisiteId];
+    if (index === undefined || prereqIndex === undefined || prereqIndex >= index) return false;
+    return hasBit(graph.closure[index], prereqIndex);
+  }
+
+  function getPrerequisiteIds(graph, id) {
+    const index = graph.position[id];
+    if (index === undefined) return [];
+    const bits = graph.closure[index];
+    return graph.order.slice(0, index).filter((_, prereqIndex) => hasBit(bits, prereqIndex));
+  }
+
   function getState(progressMap, id) {
     return progressMap[id] ?? 0;
   }
@@ -155,9 +304,22 @@
     return valid;
   }
 
-  function normalizeProgressMap(progressMap, materias, materiasById) {
+  function normalizeProgressMap(progressMap, materias, materiasById, graph = null) {
     const nextProgress = { ...progressMap };
     let changed = false;
+
+    if (graph) {
+      // Correlativas come first in topological order, so their states are
+      // final by the time a materia is checked: one pass reaches the fixpoint.
+      graph.order.forEach((id) => {
+        const state = getState(nextProgress, id);
+        if (state === 0 || canAdvanceTo(id, state, nextProgress, materiasById)) return;
+        nextProgress[id] = state === 2 && canAdvanceTo(id, 1, nextProgress, materiasById) ? 1 : 0;
+        changed = true;
+      });
+      return { progress: nextProgress, changed };
+    }
+
     let keepFixing = true;
 
     while (keepFixing) {
@@ -309,6 +471,107 @@
     return { ...result, targetState };
   }
 
+  // Same folding as slugify() in tools/pdf_to_plan_json.py, which builds the shards.
+  function foldSearchText(value) {
+    return String(value ?? "")
+      .normalize("NFKD")
+      .replace(/\p{M}/gu, "")
+      .toLowerCase();
+  }
+
+  function searchTerms(query, minLength = 2) {
+    return unique(foldSearchText(query).split(/[^a-z0-9]+/).filter((term) => term.length >= minLength));
+  }
+
+  // The shard a query needs: the one holding its longest (most selective) term.
+  function searchShardKey(terms, prefixLength = 2) {
+    const lead = terms.reduce((best, term) => (term.length > best.length ? term : best), "");
+    return lead.length >= prefixLength ? lead.slice(0, prefixLength) : "";
+  }
+
+  function matchSearchShard(shard, terms, limit = 20) {
+    if (!isPlainObject(shard) || !isPlainObject(shard.tokens) || !Array.isArray(shard.docs) || !terms.length) {
+      return [];
+    }
+    const lead = terms.reduce((best, term) => (term.length > best.length ? term : best), "");
+    const candidates = new Set();
+    Object.entries(shard.tokens).forEach(([token, indexes]) => {
+      if (token.startsWith(lead) && Array.isArray(indexes)) indexes.forEach((index) => candidates.add(index));
+    });
+
+    const results = [];
+    [...candidates].sort((a, b) => a - b).forEach((index) => {
+      const doc = shard.docs[index];
+      if (!Array.isArray(doc)) return;
+      const [slug, id, nombre] = doc;
+      const words = foldSearchText(nombre).split(/[^a-z0-9]+/);
+      if (!terms.every((term) => words.some((word) => word.startsWith(term)))) return;
+      results.push({ slug: String(slug), id: id == null ? null : String(id), nombre: String(nombre) });
+    });
+
+    // Careers first, then materias by name.
+    results.sort((a, b) => {
+      if ((a.id === null) !== (b.id === null)) return a.id === null ? -1 : 1;
+      return a.nombre.localeCompare(b.nombre, "es");
+    });
+    return results.slice(0, limit);
+  }
+
+  // Deltas come from plan_delta() in tools/pdf_to_plan_json.py, which checks
+  // that apply_plan_delta (the Python twin of this function) rebuilds the
+  // new materias exactly.
+  function applyPlanDelta(materias, delta) {
+    const ids = isPlainObject(delta?.ids) ? delta.ids : {};
+    const removed = new Set(Array.isArray(delta?.eliminadas) ? delta.eliminadas : []);
+    const names = isPlainObject(delta?.nombres) ? delta.nombres : {};
+    const semesters = isPlainObject(delta?.cuatrimestres) ? delta.cuatrimestres : {};
+    const requirements = isPlainObject(delta?.correlativas) ? delta.correlativas : {};
+    const mapId = (id) => (hasOwn(ids, id) ? ids[id] : id);
+
+    const result = [];
+    materias.forEach((materia) => {
+      if (removed.has(materia.id)) return;
+      const id = mapId(materia.id);
+      result.push({
+        id,
+        nombre: hasOwn(names, id) ? names[id] : materia.nombre,
+        cuatrimestre: hasOwn(semesters, id) ? semesters[id] : materia.cuatrimestre,
+        correlativas: hasOwn(requirements, id) ? requirements[id] : materia.correlativas.map(mapId)
+      });
+    });
+    if (Array.isArray(delta?.agregadas)) {
+      delta.agregadas.forEach((materia) => result.push({ ...materia }));
+    }
+    if (Array.isArray(delta?.orden)) {
+      const position = new Map(delta.orden.map((id, index) => [id, index]));
+      const rank = (materia) => (position.has(materia.id) ? position.get(materia.id) : position.size);
+      result.sort((a, b) => rank(a) - rank(b));
+    }
+    return result;
+  }
+
+  // Carry stored progress across a delta: renumbered materias keep their
+  // state and removed ones are dropped.
+  function migrateProgressIds(progressMap, delta) {
+    const ids = isPlainObject(delta?.ids) ? delta.ids : {};
+    const removed = new Set(Array.isArray(delta?.eliminadas) ? delta.eliminadas : []);
+    const next = {};
+    Object.entries(isPlainObject(progressMap) ? progressMap : {}).forEach(([id, state]) => {
+      if (removed.has(id)) return;
+      next[hasOwn(ids, id) ? ids[id] : id] = state;
+    });
+    return next;
+  }
+
+  // Renames, cuatrimestre moves and new materias cannot invalidate stored
+  // states; only removed materias or changed correlativas call for
+  // normalizeProgressMap.
+  function planDeltaAffectsRules(delta) {
+    const removed = Array.isArray(delta?.eliminadas) ? delta.eliminadas : [];
+    const requirements = isPlainObject(delta?.correlativas) ? delta.correlativas : {};
+    return removed.length > 0 || Object.keys(requirements).length > 0;
+  }
+
   const api = {
     VALID_STATES: [0, 1, 2],
     unique,
@@ -316,6 +579,11 @@
     validateMateriasSchema,
     validateMetadataSchema,
     buildIndexes,
+    computeGraphIndex,
+    decodeGraphIndex,
+    buildGraphIndex,
+    hasPrerequisite,
+    getPrerequisiteIds,
     coerceProgressMap,
     canAdvanceTo,
     normalizeProgressMap,
@@ -323,7 +591,14 @@
     getMissingCorrelativas,
     getSemesterCycleTarget,
     applySemesterTargetAction,
-    applySemesterCycleAction
+    applySemesterCycleAction,
+    foldSearchText,
+    searchTerms,
+    searchShardKey,
+    matchSearchShard,
+    applyPlanDelta,
+    migrateProgressIds,
+    planDeltaAffectsRules
   };
 
   if (typeof module !== "undefined" && module.exports) {
@@ -10,7 +10,13 @@
 
 const DEFAULT_PLAN_URL = "data/planes/licenciatura-en-gestion-de-tecnologias-de-la-informacion.materias.json";
 const DEFAULT_CATALOG_URL = "data/planes/catalog.json";
+const CONTENT_HASHED_JSON = /\.[0-9a-f]{12}\.json$/i;
 const SELECTED_PLAN_KEY = "unpaz_selected_plan";
+const PLAN_CACHE_PREFIX = "unpaz_plan_cache:";
+const PLAN_METADATA_CACHE_PREFIX = "unpaz_plan_metadata:";
+// <slug>.json fields not covered by metadata_version() in tools/pdf_to_plan_json.py.
+const METADATA_VERSION_SKIP = ["materias", "grafo", "generado_en_utc"];
+const PLAN_VERSION_PATTERN = /^[0-9a-f]{12}$/;
 const MILESTONES_HIDDEN_PREFIX = "unpaz_milestones_hidden:";
 const THEME_KEY = "unpaz_theme";
 const PROGRESS_SCHEMA_VERSION = 2;
@@ -32,12 +38,14 @@ const Core = window.UnpazCore;
 
 let STORAGE_KEY = "unpaz_progress:demo";
 let PLAN_CATALOG = [];
+let PLAN_SEARCH = null;
 let ACTIVE_PLAN = null;
 let ACTIVE_PLAN_META = null;
 
 let MATERIAS = [];
 let MATERIAS_BY_ID = {};
 let DEPENDENTS = {};
+let GRAPH = null;
 let milestoneStateByKey = {};
 let milestonesPanelHidden = false;
 let careerFabOpen = false;
@@ -640,9 +648,10 @@ function toggleTheme() {
   setTheme(current === "dark" ? "light" : "dark");
 }
 
-function setMaterias(materias) {
+function setMaterias(materias, rawGraph = null) {
   MATERIAS = materias;
-  const indexes = Core.buildIndexes(MATERIAS);
+  GRAPH = Core.buildGraphIndex(MATERIAS, rawGraph);
+  const indexes = Core.buildIndexes(MATERIAS, GRAPH);
   MATERIAS_BY_ID = indexes.byId;
   DEPENDENTS = indexes.dependents;
 }
@@ -704,7 +713,7 @@ function canAdvanceTo(id, targetState) {
 }
 
 function normalizeProgressState() {
-  const normalized = Core.normalizeProgressMap(progress, MATERIAS, MATERIAS_BY_ID);
+  const normalized = Core.normalizeProgressMap(progress, MATERIAS, MATERIAS_BY_ID, GRAPH);
   progress = normalized.progress;
   return normalized.changed;
 }
@@ -824,6 +833,15 @@ function edgeColorIndexForMateria(materiaId) {
 }
 
 function getUpstreamGraph(targetId) {
+  if (GRAPH) {
+    const nodes = new Set([targetId, ...Core.getPrerequisiteIds(GRAPH, targetId)]);
+    const edges = new Set();
+    nodes.forEach((id) => {
+      (MATERIAS_BY_ID[id]?.correlativas ?? []).forEach((prevId) => edges.add(`${prevId}->${id}`));
+    });
+    return { nodes, edges };
+  }
+
   const nodes = new Set([targetId]);
   const edges = new Set();
   const visited = new Set();
@@ -2136,11 +2154,29 @@ function normalizeCatalogEntry(raw, basePath) {
     throw new Error(`Entrada de catálogo inválida: materias debe ser .json (${materiasUrl}).`);
   }
 
+  // Optional plan and metadata versions and deltas from older versions (tools/pdf_to_plan_json.py).
+  const version = PLAN_VERSION_PATTERN.test(String(raw.version || "")) ? String(raw.version) : "";
+  const metadataVersion = PLAN_VERSION_PATTERN.test(String(raw.version_metadata || ""))
+    ? String(raw.version_metadata)
+    : "";
+  const deltas = {};
+  if (version && raw.deltas && typeof raw.deltas === "object") {
+    Object.entries(raw.deltas).forEach(([fromVersion, file]) => {
+      const deltaUrl = String(file || "").trim();
+      if (PLAN_VERSION_PATTERN.test(fromVersion) && /\.json$/i.test(deltaUrl)) {
+        deltas[fromVersion] = joinPath(basePath, deltaUrl);
+      }
+    });
+  }
+
   return {
     slug,
     carrera,
     materiasUrl: joinPath(basePath, materiasUrl),
-    metadataUrl: metadataUrl ? joinPath(basePath, metadataUrl) : ""
+    metadataUrl: metadataUrl ? joinPath(basePath, metadataUrl) : "",
+    version,
+    metadataVersion,
+    deltas
   };
 }
 
@@ -2165,8 +2201,10 @@ async function fetchJson(url, label) {
     throw new Error(`Bloqueado por seguridad: ${label} debe ser un archivo .json.`);
   }
 
+  // Content-hashed files (tools/pdf_to_plan_json.py --publish) never change,
+  // so they may come straight from the HTTP cache; anything else is revalidated.
   const response = await fetch(resolvedUrl.toString(), {
-    cache: "no-store",
+    cache: CONTENT_HASHED_JSON.test(resolvedUrl.pathname) ? "default" : "no-cache",
     headers: { Accept: "application/json, text/plain;q=0.9, */*;q=0.1" }
   });
   if (!response.ok) {
@@ -2196,6 +2234,7 @@ async function loadPlanCatalog() {
       slugSet.add(entry.slug);
     });
 
+    PLAN_SEARCH = normalizeSearchIndex(payload?.busqueda, basePath);
     return catalog.length > 0 ? catalog : fallback;
   } catch (error) {
     console.warn(error);
@@ -2203,6 +2242,78 @@ async function loadPlanCatalog() {
   }
 }
 
+function normalizeSearchIndex(raw, basePath) {
+  if (!raw || typeof raw !== "object" || raw.version !== 1) return null;
+  const ruta = String(raw.ruta || "").trim();
+  const prefixLength = Number(raw.prefijo);
+  if (!ruta || !Number.isInteger(prefixLength) || prefixLength < 1) return null;
+  return {
+    baseUrl: joinPath(basePath, ruta.endsWith("/") ? ruta : `${ruta}/`),
+    prefixLength,
+    shards: new Map()
+  };
+}
+
+// Only the shard holding the query's longest term is fetched (once per session).
+async function searchPlans(query) {
+  if (!PLAN_SEARCH) return [];
+  const terms = Core.searchTerms(query, PLAN_SEARCH.prefixLength);
+  const key = Core.searchShardKey(terms, PLAN_SEARCH.prefixLength);
+  if (!key) return [];
+
+  let shard = PLAN_SEARCH.shards.get(key);
+  if (!shard) {
+    // A missing shard just means no indexed word starts with that prefix.
+    shard = fetchJson(`${PLAN_SEARCH.baseUrl}${key}.json`, "índice de búsqueda").catch(() => null);
+    PLAN_SEARCH.shards.set(key, shard);
+  }
+  const hits = Core.matchSearchShard(await shard, terms);
+  const known = new Set(PLAN_CATALOG.map((plan) => plan.slug));
+  return hits.filter((hit) => known.has(hit.slug));
+}
+
+function renderPlanSearchResults(results, query) {
+  const list = document.getElementById("plan-search-results");
+  if (!list) return;
+  list.innerHTML = "";
+  if (!query) {
+    list.hidden = true;
+    return;
+  }
+
+  if (results.length === 0) {
+    const empty = document.createElement("li");
+    empty.className = "plan-search-empty";
+    empty.textContent = "Sin resultados.";
+    list.appendChild(empty);
+  }
+  results.forEach((hit) => {
+    const item = document.createElement("li");
+    const button = document.createElement("button");
+    button.type = "button";
+    button.dataset.slug = hit.slug;
+    if (hit.id !== null) button.dataset.id = hit.id;
+    button.textContent = hit.nombre;
+    const detail = document.createElement("small");
+    const carrera = PLAN_CATALOG.find((plan) => plan.slug === hit.slug)?.carrera || hit.slug;
+    detail.textContent = hit.id === null ? "Carrera" : carrera;
+    button.appendChild(detail);
+    item.appendChild(button);
+    list.appendChild(item);
+  });
+  list.hidden = false;
+}
+
+function flashSearchHit(id) {
+  const card = document.querySelector(`.subject-card[data-id="${id}"]`);
+  if (!card) return;
+  card.scrollIntoView({ block: "center", inline: "center", behavior: "smooth" });
+  card.classList.remove("search-hit");
+  void card.offsetWidth; // eslint-disable-line no-unused-expressions
+  card.classList.add("search-hit");
+  setTimeout(() => card.classList.remove("search-hit"), 1500);
+}
+
 function populateCareerSelect(catalog, selectedSlug) {
   const selects = getCareerSelectElements();
   if (selects.length === 0) return;
@@ -2228,14 +2339,118 @@ function populateCareerSelect(catalog, selectedSlug) {
   }
 }
 
-async function loadPlanData(plan) {
+function readCachedPlan(slug) {
+  try {
+    const cached = JSON.parse(safeStorageGet(`${PLAN_CACHE_PREFIX}${slug}`) || "null");
+    if (cached && PLAN_VERSION_PATTERN.test(cached.version) && Array.isArray(cached.materias)) return cached;
+  } catch {
+    // ignore corrupt cache
+  }
+  return null;
+}
+
+function writeCachedPlan(slug, version, materias) {
+  safeStorageSet(`${PLAN_CACHE_PREFIX}${slug}`, JSON.stringify({ version, materias }));
+}
+
+function readCachedMetadata(slug) {
+  try {
+    const cached = JSON.parse(safeStorageGet(`${PLAN_METADATA_CACHE_PREFIX}${slug}`) || "null");
+    if (cached && PLAN_VERSION_PATTERN.test(cached.version) && isPlainObject(cached.metadata)) return cached;
+  } catch {
+    // ignore corrupt cache
+  }
+  return null;
+}
+
+function writeCachedMetadata(slug, version, metadata) {
+  safeStorageSet(`${PLAN_METADATA_CACHE_PREFIX}${slug}`, JSON.stringify({ version, metadata }));
+}
+
+// Same id as plan_version() and metadata_version() in
+// tools/pdf_to_plan_json.py: SHA-256 of the minified JSON. null where
+// SubtleCrypto is unavailable (non-secure origins).
+async function computePlanVersion(rawMaterias) {
+  if (!window.crypto?.subtle || typeof TextEncoder === "undefined") return null;
+  const digest = await window.crypto.subtle.digest("SHA-256", new TextEncoder().encode(JSON.stringify(rawMaterias)));
+  return [...new Uint8Array(digest)].map((byte) => byte.toString(16).padStart(2, "0")).join("").slice(0, 12);
+}
+
+// The raw materias of the catalog's version: from the local copy when it is
+// current, from the local copy plus a delta when the catalog has one from
+// that version, otherwise downloaded in full. A delta is only applied to a
+// local copy whose hash is its `desde` and kept only if the result hashes
+// to the catalog's version; where hashes cannot be computed the plan is
+// downloaded in full. `delta` is set when one was applied, so stored
+// progress can be migrated.
+async function loadPlanMaterias(plan) {
+  const cached = plan.version ? readCachedPlan(plan.slug) : null;
+  if (cached?.version === plan.version) {
+    return { rawMaterias: cached.materias, delta: null };
+  }
+
+  const deltaUrl = cached ? plan.deltas[cached.version] : "";
+  if (deltaUrl && (await computePlanVersion(cached.materias)) === cached.version) {
+    try {
+      const delta = await fetchJson(deltaUrl, "cambios del plan");
+      if (delta?.desde === cached.version && delta?.hasta === plan.version) {
+        const rawMaterias = Core.applyPlanDelta(cached.materias, delta);
+        if ((await computePlanVersion(rawMaterias)) === plan.version) {
+          writeCachedPlan(plan.slug, plan.version, rawMaterias);
+          return { rawMaterias, delta };
+        }
+      }
+    } catch (error) {
+      console.warn("No se pudo aplicar el delta del plan, se descarga completo:", error);
+    }
+  }
+
   const rawMaterias = await fetchJson(plan.materiasUrl, "plan de materias");
+  if (plan.version && (await computePlanVersion(rawMaterias)) === plan.version) {
+    writeCachedPlan(plan.slug, plan.version, rawMaterias);
+  }
+  return { rawMaterias, delta: null };
+}
+
+function migrateStoredProgress(delta) {
+  try {
+    const migrated = migrateLegacyProgressPayload(JSON.parse(safeStorageGet(STORAGE_KEY) || "null"));
+    if (!migrated) return;
+    const nextProgress = Core.migrateProgressIds(migrated.progress, delta);
+    safeStorageSet(STORAGE_KEY, JSON.stringify({ ...migrated, progress: nextProgress }));
+  } catch {
+    // loadProgress() handles unreadable progress
+  }
+}
+
+// <slug>.json repeats the materias and their graph. When the catalog
+// announces its metadata version, the rest is kept locally and the file is
+// only downloaded again when that version changes; the graph is then
+// rebuilt from the materias.
+async function loadPlanMetadata(plan) {
+  const cached = plan.metadataVersion ? readCachedMetadata(plan.slug) : null;
+  if (cached?.version === plan.metadataVersion) return cached.metadata;
+
+  const rawMetadata = await fetchJson(plan.metadataUrl, "metadata de carrera");
+  if (plan.metadataVersion && isPlainObject(rawMetadata)) {
+    const kept = Object.fromEntries(
+      Object.entries(rawMetadata).filter(([key]) => !METADATA_VERSION_SKIP.includes(key))
+    );
+    if ((await computePlanVersion(kept)) === plan.metadataVersion) {
+      writeCachedMetadata(plan.slug, plan.metadataVersion, kept);
+    }
+  }
+  return rawMetadata;
+}
+
+async function loadPlanData(plan) {
+  const { rawMaterias, delta } = await loadPlanMaterias(plan);
   const materias = Core.validateMateriasSchema(rawMaterias);
 
   let metadata = null;
   if (plan.metadataUrl) {
     try {
-      const rawMetadata = await fetchJson(plan.metadataUrl, "metadata de carrera");
+      const rawMetadata = await loadPlanMetadata(plan);
       metadata = Core.validateMetadataSchema(rawMetadata);
     } catch (error) {
       console.warn("Metadata inválida, se usará fallback:", error);
@@ -2243,25 +2458,28 @@ async function loadPlanData(plan) {
     }
   }
 
-  return { materias, metadata };
+  return { materias, metadata, delta };
 }
 
 async function activatePlan(plan, allowDemoFallback = false) {
   try {
-    const { materias, metadata } = await loadPlanData(plan);
+    const { materias, metadata, delta } = await loadPlanData(plan);
 
     ACTIVE_PLAN = plan;
     ACTIVE_PLAN_META = metadata || { carrera: plan.carrera, hitos: [] };
 
     setStorageKeyForSlug(plan.slug);
     milestonesPanelHidden = areMilestonesHidden();
-    setMaterias(materias);
+    setMaterias(materias, metadata?.grafo);
+    if (delta) migrateStoredProgress(delta);
     progress = loadProgress();
     milestoneStateByKey = {};
     accordionOpenBySemester = {};
     clearAchievementNotifications();
     clearRequirementHighlights();
-    if (normalizeProgressState()) saveProgress();
+    // Progress carried over by a delta that only renamed, moved or added
+    // materias is still consistent; anything else is revalidated.
+    if ((!delta || Core.planDeltaAffectsRules(delta)) && normalizeProgressState()) saveProgress();
 
     setCareerTitle(ACTIVE_PLAN_META.carrera || plan.carrera);
     setSubtitle(`Plan cargado (${MATERIAS.length} materias). Hacé clic en cada materia para registrar tu progreso.`);
@@ -2426,6 +2644,38 @@ function bindUiEvents() {
     });
   });
 
+  const planSearchInput = document.getElementById("plan-search");
+  const planSearchResults = document.getElementById("plan-search-results");
+  if (planSearchInput && planSearchResults) {
+    let searchTimer = null;
+    let searchSeq = 0;
+    planSearchInput.addEventListener("input", () => {
+      clearTimeout(searchTimer);
+      searchTimer = setTimeout(async () => {
+        const query = planSearchInput.value.trim();
+        const seq = ++searchSeq;
+        const results = await searchPlans(query);
+        if (seq === searchSeq) renderPlanSearchResults(results, query);
+      }, 120);
+    });
+    planSearchInput.addEventListener("keydown", (event) => {
+      if (event.key === "Escape") {
+        planSearchInput.value = "";
+        renderPlanSearchResults([], "");
+      }
+    });
+    planSearchResults.addEventListener("click", async (event) => {
+      const button = event.target instanceof Element ? event.target.closest("button[data-slug]") : null;
+      if (!button) return;
+      planSearchInput.value = "";
+      renderPlanSearchResults([], "");
+      await handleCareerChange(button.dataset.slug);
+      if (button.dataset.id && ACTIVE_PLAN?.slug === button.dataset.slug) {
+        flashSearchHit(button.dataset.id);
+      }
+    });
+  }
+
   const careerFabButton = document.getElementById("btn-career-fab");
   if (careerFabButton) {
     careerFabButton.addEventListener("click", (event) => {
@@ -2446,6 +2696,11 @@ function bindUiEvents() {
       setToolsMenuOpen(false);
     }
 
+    const planSearch = document.querySelector(".plan-search");
+    if (planSearch && !planSearch.contains(target)) {
+      renderPlanSearchResults([], "");
+    }
+
     if (careerFabOpen) {
       const panel = document.getElementById("career-fab-panel");
       const button = document.getElementById("btn-career-fab");
@@ -2531,6 +2786,8 @@ async function init() {
     PLAN_CATALOG[0];
 
   populateCareerSelect(PLAN_CATALOG, selectedPlan?.slug);
+  const planSearch = document.querySelector(".plan-search");
+  if (planSearch) planSearch.hidden = !PLAN_SEARCH;
   await activatePlan(selectedPlan, true);
   suppressAchievementNotifications = false;
 
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The tools are scripts, not a package: make them importable by the tests.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "tools"))
@@ -111,3 +111,189 @@ test("validateMateriasSchema rechaza correlativas inexistentes", () => {
     /correlativas/i
   );
 });
+
+function loadPublishedPlan(slug) {
+  const fs = require("node:fs");
+  const path = require("node:path");
+  const dir = path.join(__dirname, "..", "data", "planes");
+  const materias = Core.validateMateriasSchema(
+    JSON.parse(fs.readFileSync(path.join(dir, `${slug}.materias.json`), "utf8"))
+  );
+  const metadata = JSON.parse(fs.readFileSync(path.join(dir, `${slug}.json`), "utf8"));
+  return { materias, grafo: metadata.grafo };
+}
+
+const PUBLISHED_SLUGS = [
+  "ingenieria-en-informatica",
+  "licenciatura-en-gestion-de-tecnologias-de-la-informacion",
+  "licenciatura-en-produccion-y-desarrollo-de-videojuegos"
+];
+
+test("computeGraphIndex: orden topológico, profundidad y prerrequisitos transitivos", () => {
+  const graph = Core.computeGraphIndex(sampleMaterias());
+
+  assert.deepEqual(graph.order, ["A", "B", "C", "D"]);
+  assert.deepEqual(graph.depth, { A: 0, B: 1, C: 2, D: 2 });
+  assert.equal(graph.criticalPath, 3);
+  assert.deepEqual(graph.dependents, { A: ["B"], B: ["C", "D"] });
+  assert.deepEqual(Core.getPrerequisiteIds(graph, "C"), ["A", "B"]);
+  assert.equal(Core.hasPrerequisite(graph, "D", "A"), true);
+  assert.equal(Core.hasPrerequisite(graph, "D", "C"), false);
+});
+
+test("computeGraphIndex devuelve null si hay ciclos", () => {
+  const materias = [
+    { id: "A", nombre: "A", cuatrimestre: 1, correlativas: ["B"] },
+    { id: "B", nombre: "B", cuatrimestre: 1, correlativas: ["A"] }
+  ];
+  assert.equal(Core.computeGraphIndex(materias), null);
+});
+
+test("computeGraphIndex cuenta una sola vez las correlativas repetidas", () => {
+  const repeated = sampleMaterias().map((materia) => ({
+    ...materia,
+    correlativas: [...materia.correlativas, ...materia.correlativas]
+  }));
+  const graph = Core.computeGraphIndex(repeated);
+  const expected = Core.computeGraphIndex(sampleMaterias());
+
+  assert.deepEqual(graph.dependents, { A: ["B"], B: ["C", "D"] });
+  assert.deepEqual(graph.order, expected.order);
+  assert.deepEqual(graph.depth, expected.depth);
+  assert.deepEqual(graph.closure, expected.closure);
+});
+
+test("decodeGraphIndex coincide con el grafo calculado en el navegador", () => {
+  PUBLISHED_SLUGS.forEach((slug) => {
+    const { materias, grafo } = loadPublishedPlan(slug);
+    const decoded = Core.decodeGraphIndex(materias, grafo);
+    const computed = Core.computeGraphIndex(materias);
+
+    assert.ok(decoded, slug);
+    assert.deepEqual(decoded.order, computed.order);
+    assert.deepEqual(decoded.depth, computed.depth);
+    assert.equal(decoded.criticalPath, grafo.camino_critico);
+    computed.order.forEach((id) => {
+      assert.deepEqual(Core.getPrerequisiteIds(decoded, id), Core.getPrerequisiteIds(computed, id));
+    });
+  });
+});
+
+test("decodeGraphIndex descarta un grafo desactualizado", () => {
+  const { materias, grafo } = loadPublishedPlan(PUBLISHED_SLUGS[0]);
+  const last = materias[materias.length - 1];
+  const edited = materias.map((materia) =>
+    materia.id === materias[0].id ? { ...materia, correlativas: [last.id] } : materia
+  );
+  assert.equal(Core.decodeGraphIndex(edited, grafo), null);
+  assert.equal(Core.decodeGraphIndex(materias, { ...grafo, version: 99 }), null);
+});
+
+test("normalizeProgressMap con grafo: una pasada, mismo resultado", () => {
+  PUBLISHED_SLUGS.forEach((slug) => {
+    const { materias, grafo } = loadPublishedPlan(slug);
+    const graph = Core.decodeGraphIndex(materias, grafo);
+    const { byId } = Core.buildIndexes(materias, graph);
+
+    let seed = 7;
+    const random = () => {
+      seed = (seed * 1103515245 + 12345) % 2147483648;
+      return seed / 2147483648;
+    };
+    for (let round = 0; round < 50; round += 1) {
+      const progress = {};
+      materias.forEach((materia) => {
+        progress[materia.id] = Math.floor(random() * 3);
+      });
+      assert.deepEqual(
+        Core.normalizeProgressMap(progress, materias, byId, graph),
+        Core.normalizeProgressMap(progress, materias, byId)
+      );
+    }
+  });
+});
+
+test("searchTerms pliega acentos y mayúsculas como slugify", () => {
+  assert.deepEqual(Core.searchTerms("  Programación  II · Álgebra "), ["programacion", "ii", "algebra"]);
+  assert.deepEqual(Core.searchTerms("a"), []);
+  assert.equal(Core.searchShardKey(["ii", "programacion"]), "pr");
+  assert.equal(Core.searchShardKey(["x"]), "");
+});
+
+test("matchSearchShard: un solo shard resuelve la consulta completa", () => {
+  const fs = require("node:fs");
+  const path = require("node:path");
+  const dir = path.join(__dirname, "..", "data", "planes");
+  const catalog = JSON.parse(fs.readFileSync(path.join(dir, "catalog.json"), "utf8"));
+  const { ruta, prefijo } = catalog.busqueda;
+  const search = (query) => {
+    const terms = Core.searchTerms(query, prefijo);
+    const key = Core.searchShardKey(terms, prefijo);
+    const shard = JSON.parse(fs.readFileSync(path.join(dir, ruta, `${key}.json`), "utf8"));
+    return Core.matchSearchShard(shard, terms);
+  };
+
+  const { materias } = loadPublishedPlan(PUBLISHED_SLUGS[0]);
+  const target = materias.find((materia) => Core.searchTerms(materia.nombre).length >= 2);
+  const hits = search(target.nombre.toUpperCase());
+  assert.ok(hits.some((hit) => hit.slug === PUBLISHED_SLUGS[0] && hit.id === target.id), target.nombre);
+  hits.forEach((hit) => {
+    Core.searchTerms(target.nombre).forEach((term) => {
+      assert.ok(Core.searchTerms(hit.nombre).some((word) => word.startsWith(term)), hit.nombre);
+    });
+  });
+
+  const careers = search("videojuegos");
+  assert.equal(careers[0].slug, PUBLISHED_SLUGS[2]);
+  assert.equal(careers[0].id, null);
+});
+
+test("applyPlanDelta reconstruye el plan nuevo y migra el progreso", () => {
+  const old = [
+    { id: "01", nombre: "Intro", cuatrimestre: 1, correlativas: [] },
+    { id: "02", nombre: "Algo", cuatrimestre: 2, correlativas: ["01"] },
+    { id: "03", nombre: "POO", cuatrimestre: 2, correlativas: ["02"] },
+    { id: "04", nombre: "Redes", cuatrimestre: 3, correlativas: ["02"] }
+  ];
+  const delta = {
+    version: 1,
+    desde: "aaaaaaaaaaaa",
+    hasta: "bbbbbbbbbbbb",
+    ids: { "02": "12" },
+    eliminadas: ["04"],
+    agregadas: [{ id: "05", nombre: "Datos", cuatrimestre: 1, correlativas: [] }],
+    nombres: { "03": "Programación Orientada a Objetos" },
+    cuatrimestres: { "03": 3 },
+    orden: ["05", "01", "12", "03"]
+  };
+
+  assert.deepEqual(Core.applyPlanDelta(old, delta), [
+    { id: "05", nombre: "Datos", cuatrimestre: 1, correlativas: [] },
+    { id: "01", nombre: "Intro", cuatrimestre: 1, correlativas: [] },
+    { id: "12", nombre: "Algo", cuatrimestre: 2, correlativas: ["01"] },
+    { id: "03", nombre: "Programación Orientada a Objetos", cuatrimestre: 3, correlativas: ["12"] }
+  ]);
+  assert.deepEqual(old[2].correlativas, ["02"]);
+
+  assert.deepEqual(Core.migrateProgressIds({ "01": 2, "02": 2, "03": 1, "04": 1 }, delta), {
+    "01": 2,
+    "12": 2,
+    "03": 1
+  });
+  assert.equal(Core.planDeltaAffectsRules(delta), true);
+  assert.equal(Core.planDeltaAffectsRules({ ids: { "02": "12" }, nombres: { "03": "POO II" } }), false);
+  assert.equal(Core.planDeltaAffectsRules({ correlativas: { "03": [] } }), true);
+});
+
+test("catalog.json: version coincide con el hash que calcula la UI", () => {
+  const fs = require("node:fs");
+  const path = require("node:path");
+  const crypto = require("node:crypto");
+  const dir = path.join(__dirname, "..", "data", "planes");
+  const catalog = JSON.parse(fs.readFileSync(path.join(dir, "catalog.json"), "utf8"));
+  catalog.carreras.forEach((entry) => {
+    const raw = JSON.parse(fs.readFileSync(path.join(dir, entry.materias), "utf8"));
+    const digest = crypto.createHash("sha256").update(JSON.stringify(raw)).digest("hex");
+    assert.equal(digest.slice(0, 12), entry.version, entry.slug);
+  });
+});
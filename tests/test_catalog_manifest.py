@@ -0,0 +1,81 @@
+"""catalog.json built from the catalog manifest instead of re-reading every plan."""
+
+import json
+
+import pdf_to_plan_json as plan
+
+
+def career_plan(carrera: str, *nombres: str) -> dict:
+    nombres = nombres or ("Matemática", "Programación")
+    return {
+        "carrera": carrera,
+        "materias": [
+            {"id": f"{index:02d}", "nombre": nombre, "cuatrimestre": 1, "anio": 1, "correlativas": []}
+            for index, nombre in enumerate(nombres, 1)
+        ],
+        "hitos": [],
+    }
+
+
+def catalog_slugs(output_dir) -> list[str]:
+    payload = json.loads((output_dir / "catalog.json").read_text(encoding="utf-8"))
+    return [entry["slug"] for entry in payload["carreras"]]
+
+
+def test_manifest_catalog_matches_rescan(tmp_path):
+    records = [
+        plan.write_plan_outputs(career_plan(carrera), source, tmp_path).record
+        for carrera, source in (("Tecnicatura en Beta", "b.pdf"), ("Licenciatura en Alfa", "a.pdf"))
+    ]
+    plan.write_catalog(tmp_path, records)
+    from_manifest = (tmp_path / "catalog.json").read_text(encoding="utf-8")
+    assert catalog_slugs(tmp_path) == ["licenciatura-en-alfa", "tecnicatura-en-beta"]
+
+    (tmp_path / plan.MANIFEST_NAME).unlink()
+    plan.write_catalog(tmp_path)
+    rescanned = json.loads((tmp_path / "catalog.json").read_text(encoding="utf-8"))
+    assert rescanned["carreras"] == json.loads(from_manifest)["carreras"]
+
+
+def test_corrupt_manifest_is_rebuilt_from_the_plans(tmp_path):
+    record = plan.write_plan_outputs(career_plan("Licenciatura en Alfa"), "a.pdf", tmp_path).record
+    plan.write_catalog(tmp_path, [record])
+    (tmp_path / plan.MANIFEST_NAME).write_text("{no es json", encoding="utf-8")
+
+    assert plan.CatalogManifest.load(tmp_path) is None
+    plan.write_catalog(tmp_path)
+    assert catalog_slugs(tmp_path) == ["licenciatura-en-alfa"]
+    assert plan.CatalogManifest.load(tmp_path) is not None
+
+
+def test_plans_whose_files_are_gone_leave_the_catalog(tmp_path):
+    records = [
+        plan.write_plan_outputs(career_plan(carrera), source, tmp_path).record
+        for carrera, source in (("Licenciatura en Alfa", "a.pdf"), ("Tecnicatura en Beta", "b.pdf"))
+    ]
+    plan.write_catalog(tmp_path, records)
+    (tmp_path / "tecnicatura-en-beta.materias.json").unlink()
+
+    plan.write_catalog(tmp_path)
+    assert catalog_slugs(tmp_path) == ["licenciatura-en-alfa"]
+
+
+def test_one_entry_per_source_pdf(tmp_path):
+    manifest = plan.CatalogManifest(tmp_path)
+    for slug, source, generated in (
+        ("alfa", "plan.pdf", "2026-01-01T00:00:00+00:00"),
+        ("beta", "plan.pdf", "2026-02-01T00:00:00+00:00"),
+        ("gamma", "otro.pdf", "2025-01-01T00:00:00+00:00"),
+    ):
+        payload = {"carrera": slug.capitalize(), "fuente_pdf": source, "generado_en_utc": generated}
+        manifest.update(plan.manifest_record(slug, payload))
+    assert [entry["slug"] for entry in manifest.catalog_entries()] == ["beta", "gamma"]
+
+
+def test_plan_coming_back_unchanged_is_current_again(tmp_path):
+    # Alfa keeps its first generado_en_utc when it comes back unchanged
+    # (keep_timestamp), but it is the PDF's current plan again.
+    for carrera in ("Licenciatura en Alfa", "Licenciatura en Beta", "Licenciatura en Alfa"):
+        outputs = plan.write_plan_outputs(career_plan(carrera), "plan.pdf", tmp_path)
+        plan.write_catalog(tmp_path, [outputs.record])
+    assert catalog_slugs(tmp_path) == ["licenciatura-en-alfa"]
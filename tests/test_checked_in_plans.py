@@ -0,0 +1,53 @@
+"""
+Career names, titles and slugs of the checked-in data/planes/*.json,
+re-extracted from their PDFs. The PDFs are not versioned: copy them to
+data/pdfs/ to run these checks, otherwise they are skipped.
+"""
+
+import json
+from pathlib import Path, PureWindowsPath
+
+import pytest
+
+import pdf_to_plan_json as plan
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def checked_in_plans() -> list:
+    params = []
+    for metadata_path in sorted((ROOT / "data" / "planes").glob("*.json")):
+        if metadata_path.name.endswith(".materias.json") or metadata_path.name == "catalog.json":
+            continue
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        pdf_path = ROOT / "data" / "pdfs" / PureWindowsPath(str(metadata.get("fuente_pdf", ""))).name
+        params.append(pytest.param(metadata_path.stem, metadata, pdf_path, id=metadata_path.stem))
+    return params
+
+
+def hito_names(extracted: dict) -> list[str]:
+    return [hito["nombre"] for hito in extracted["hitos"]]
+
+
+@pytest.fixture
+def extracted(pdf_path: Path) -> dict:
+    if not pdf_path.is_file():
+        pytest.skip(f"{pdf_path.name} no está en data/pdfs/")
+    return plan.extract_plan(pdf_path, {}, extraction=plan.ExtractionOptions(prefilter=False))
+
+
+@pytest.mark.parametrize(("slug", "metadata", "pdf_path"), checked_in_plans())
+def test_metadata_matches_the_checked_in_plan(slug, metadata, pdf_path, extracted):
+    assert extracted["carrera"] == metadata["carrera"]
+    assert hito_names(extracted) == hito_names(metadata)
+    assert plan.slugify(extracted["carrera"]) == slug
+
+
+@pytest.mark.parametrize(("slug", "metadata", "pdf_path"), checked_in_plans())
+def test_page_text_metadata_matches_pypdf_text(slug, metadata, pdf_path, extracted):
+    # Metadata comes from pdfplumber's page text; the baseline read pypdf's.
+    if plan.load_pdf_reader() is None:
+        pytest.skip("pypdf no está instalado")
+    baseline = plan.scan_metadata(plan.iter_page_texts(pdf_path)).result(pdf_path.stem)
+    expected = plan.assemble_plan(extracted["materias"], baseline)
+    assert (extracted["carrera"], hito_names(extracted)) == (expected["carrera"], hito_names(expected))
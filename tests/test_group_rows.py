@@ -0,0 +1,26 @@
+"""Row clustering: group_rows over a WordTable and group_page_rows per page."""
+
+import bench_pdf_to_plan as bench
+import pdf_to_plan_json as plan
+
+
+def test_page_rows_match_the_table_and_the_reference_scan():
+    words = bench.synthetic_page_words(600, 5)
+    table = plan.WordTable()
+    table.extend_page(3, words)
+
+    rows = plan.group_page_rows(words, 3)
+    assert bench.row_signature(rows) == bench.row_signature(plan.group_rows(table))
+    assert bench.row_signature(rows) == bench.row_signature(bench.group_page_rows_scan(words, 3))
+
+
+def test_row_text_joins_tokens_left_to_right():
+    words = [
+        {"text": "Matemática", "x0": 60.0, "top": 100.5},
+        {"text": "01", "x0": 20.0, "top": 100.0},
+        {"text": "I", "x0": 120.0, "top": 101.0},
+        {"text": "02", "x0": 20.0, "top": 120.0},
+    ]
+    rows = plan.group_page_rows(words, 0)
+    assert [row.text for row in rows] == ["01 Matemática I", "02"]
+    assert [token.x0 for token in rows[0].tokens] == [20.0, 60.0, 120.0]
@@ -0,0 +1,45 @@
+"""MetadataScanner: career name and titles from page texts."""
+
+import pdf_to_plan_json as plan
+
+
+def test_reads_metadata_across_a_page_break():
+    pages = [
+        "Universidad Nacional\nCarrera de grado",
+        "Licenciatura en Informática\nAnalista de Sistemas (2400 hs)\nLicenciada/o en Informática (4000 hs)",
+    ]
+    metadata = plan.scan_metadata(pages).result()
+    assert metadata.carrera == "Licenciatura en Informática"
+    assert metadata.titulo_intermedio == "Analista de Sistemas (2400 hs)"
+    assert metadata.titulo_final == "Licenciada/o en Informática (4000 hs)"
+
+
+def test_career_comes_from_the_top_pattern_even_when_later():
+    pages = ["Licenciatura en Otra Cosa", "Carrera de grado\nTecnicatura Universitaria en Datos"]
+    assert plan.scan_metadata(pages).result().carrera == "Tecnicatura Universitaria en Datos"
+
+
+def test_fallback_name_without_a_career():
+    metadata = plan.scan_metadata(["Programa de la asignatura"]).result("plan-sin-titulo")
+    assert metadata == plan.PlanMetadata("plan-sin-titulo", None, None)
+
+
+def test_single_text_helpers_match_the_scanner():
+    text = "Carrera de grado\nLicenciatura en Informática\nTítulo de grado: Licenciada/o en Informática"
+    assert plan.extract_career_name(text, "x") == "Licenciatura en Informática"
+    assert plan.extract_final_title(text) == "Licenciada/o en Informática"
+    assert plan.extract_intermediate_title(text) is None
+
+
+def test_intermediate_title_is_the_last_hs_variant():
+    pages = [
+        "Analista de Sistemas (título intermedio)",
+        "Analista de Sistemas (2400 hs)",
+        "Analista de Sistemas (2600 hs)\nAnalista de Sistemas (tercer año)",
+    ]
+    assert plan.scan_metadata(pages).result().titulo_intermedio == "Analista de Sistemas (2600 hs)"
+
+
+def test_intermediate_title_without_hours_is_the_last_match():
+    pages = ["Analista de Sistemas (primero)", "Analista de Sistemas (segundo)"]
+    assert plan.scan_metadata(pages).result().titulo_intermedio == "Analista de Sistemas (segundo)"
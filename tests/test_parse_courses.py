@@ -0,0 +1,20 @@
+"""group_rows + parse_courses over the synthetic tables of bench_pdf_to_plan."""
+
+import bench_pdf_to_plan as bench
+
+
+def parse_synthetic(count: int, seed: int) -> tuple[list[dict], list[dict]]:
+    materias = bench.synthetic_plan(count, seed)
+    table, _ = bench.render_plan_words(materias)
+    parsed, _, _ = bench.parse_rendered(table, bench.plan_split_map(materias))
+    return bench.web_view(materias), bench.web_view(parsed)
+
+
+def test_reads_a_rendered_plan():
+    expected, parsed = parse_synthetic(40, 7)
+    assert parsed == expected
+
+
+def test_reads_plans_spanning_many_pages():
+    expected, parsed = parse_synthetic(300, 3)
+    assert parsed == expected
@@ -0,0 +1,64 @@
+"""PlanCache: extracted plans keyed by PDF content, PARSER_VERSION and --split."""
+
+import pdf_to_plan_json as plan
+
+PLAN = {"carrera": "Licenciatura en Pruebas", "materias": [], "hitos": []}
+
+
+def test_hit_needs_same_pdf_parser_and_split(tmp_path, monkeypatch):
+    pdf_path = tmp_path / "plan.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 primera version")
+    cache = plan.PlanCache(tmp_path / "cache")
+    cache.put(pdf_path, {1: 5}, PLAN)
+
+    assert cache.get(pdf_path, {1: 5}) == PLAN
+    assert cache.get(pdf_path, {1: 4}) is None
+    with monkeypatch.context() as patch:
+        patch.setattr(plan, "PARSER_VERSION", plan.PARSER_VERSION + "-test")
+        assert cache.get(pdf_path, {1: 5}) is None
+
+    pdf_path.write_bytes(b"%PDF-1.4 segunda version, otro contenido")
+    assert cache.get(pdf_path, {1: 5}) is None
+
+
+def test_rebuild_refreshes_entries_without_reading_them(tmp_path):
+    pdf_path = tmp_path / "plan.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    plan.PlanCache(tmp_path / "cache").put(pdf_path, {}, PLAN)
+
+    rebuild = plan.PlanCache(tmp_path / "cache", read=False)
+    assert rebuild.get(pdf_path, {}) is None
+    rebuild.put(pdf_path, {}, {**PLAN, "carrera": "Otra"})
+    assert plan.PlanCache(tmp_path / "cache").get(pdf_path, {})["carrera"] == "Otra"
+
+
+def test_evict_drops_outdated_and_orphaned_entries(tmp_path):
+    kept, changed, removed = (tmp_path / f"{name}.pdf" for name in ("kept", "changed", "removed"))
+    for pdf_path in (kept, changed, removed):
+        pdf_path.write_bytes(f"%PDF-1.4 {pdf_path.stem}".encode())
+    cache = plan.PlanCache(tmp_path / "cache")
+    for pdf_path in (kept, changed, removed):
+        cache.put(pdf_path, {}, PLAN)
+
+    changed.write_bytes(b"%PDF-1.4 otro contenido")
+    removed.unlink()
+    # `kept` is not part of this run but still exists, so its entry stays.
+    assert len(cache.evict([changed], {})) == 2
+    assert cache.get(kept, {}) == PLAN
+    assert cache.evict([kept, changed], {}) == []
+
+
+def test_renamed_pdf_without_title_is_named_after_its_new_file(tmp_path, monkeypatch):
+    # A PDF without a career title takes its file name.
+    def extract_plan(pdf_path, split_map, **kwargs):
+        return {**PLAN, "carrera": pdf_path.stem}
+
+    monkeypatch.setattr(plan, "extract_plan", extract_plan)
+    cache = plan.PlanCache(tmp_path / "cache")
+    pdf_path = tmp_path / "alfa.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+    assert plan.process_pdf(pdf_path, tmp_path / "planes", {}, False, cache=cache).record["slug"] == "alfa"
+
+    pdf_path = pdf_path.rename(tmp_path / "beta.pdf")
+    assert plan.process_pdf(pdf_path, tmp_path / "planes", {}, False, cache=cache).record["slug"] == "beta"
+    assert len(cache.evict([pdf_path], {})) == 1
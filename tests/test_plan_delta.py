@@ -0,0 +1,138 @@
+"""Plan versions and the deltas between them."""
+
+import json
+import random
+
+import pdf_to_plan_json as plan
+
+
+def materia(materia_id: str, nombre: str, cuatrimestre: int = 1, correlativas: list[str] | None = None) -> dict:
+    return {"id": materia_id, "nombre": nombre, "cuatrimestre": cuatrimestre, "correlativas": correlativas or []}
+
+
+OLD = [
+    materia("01", "Matemática"),
+    materia("02", "Programación"),
+    materia("03", "Física", 2, ["01"]),
+    materia("04", "Taller", 2, ["02"]),
+]
+NEW = [
+    materia("01", "Matemática I"),
+    materia("12", "Programación"),
+    materia("03", "Física", 3, ["01", "12"]),
+    materia("05", "Química", 2),
+]
+
+
+def test_delta_covers_every_kind_of_change():
+    delta = plan.plan_delta(OLD, NEW)
+    assert delta == {
+        "ids": {"02": "12"},
+        "eliminadas": ["04"],
+        "agregadas": [NEW[3]],
+        "nombres": {"01": "Matemática I"},
+        "cuatrimestres": {"03": 3},
+        "correlativas": {"03": ["01", "12"]},
+    }
+    assert plan.apply_plan_delta(OLD, delta) == NEW
+
+
+def test_order_only_when_it_moved():
+    reordered = [NEW[1], NEW[0], NEW[2], NEW[3]]
+    delta = plan.plan_delta(OLD, reordered)
+    assert delta["orden"] == ["12", "01", "03", "05"]
+    assert plan.apply_plan_delta(OLD, delta) == reordered
+    assert plan.plan_delta(OLD, OLD) == {}
+
+
+def test_no_delta_when_it_cannot_rebuild_the_plan():
+    # apply_plan_delta only knows the web fields.
+    assert plan.plan_delta(OLD, [{**NEW[0], "anio": 1}]) is None
+    assert plan.plan_delta(OLD, [NEW[0], NEW[0]]) is None
+
+
+def test_random_changes_round_trip():
+    rnd = random.Random(4)
+    for _ in range(300):
+        old = [
+            materia(f"{index:02d}", f"Materia {rnd.randrange(1000)}", rnd.randint(1, 8), [])
+            for index in range(1, rnd.randint(1, 30))
+        ]
+        for index, item in enumerate(old):
+            item["correlativas"] = [other["id"] for other in rnd.sample(old[:index], k=min(index, rnd.randint(0, 3)))]
+        new = [dict(item, correlativas=list(item["correlativas"])) for item in old if rnd.random() > 0.1]
+        for item in new:
+            if rnd.random() < 0.1:
+                item["id"] = str(100 + rnd.randrange(900))
+            if rnd.random() < 0.1:
+                item["nombre"] += " II"
+            if rnd.random() < 0.1:
+                item["cuatrimestre"] += 1
+        new.extend(materia(str(1000 + index), f"Nueva {index}") for index in range(rnd.randint(0, 3)))
+        if rnd.random() < 0.2:
+            rnd.shuffle(new)
+        if len({item["id"] for item in new}) != len(new):
+            continue
+        delta = plan.plan_delta(old, new)
+        assert delta is not None
+        assert plan.apply_plan_delta(old, delta) == new
+
+
+def career_plan(materias: list[dict]) -> dict:
+    return {"carrera": "Licenciatura en Pruebas", "materias": [{**item, "anio": 1} for item in materias], "hitos": []}
+
+
+def test_catalog_announces_deltas_from_previous_versions(tmp_path):
+    for materias in (OLD, NEW):
+        outputs = plan.write_plan_outputs(career_plan(materias), "plan.pdf", tmp_path)
+        catalog_path = plan.write_catalog(tmp_path, [outputs.record])
+    (entry,) = json.loads(catalog_path.read_text(encoding="utf-8"))["carreras"]
+
+    old_version = plan.plan_version(OLD)
+    assert entry["version"] == plan.plan_version(NEW)
+    delta = json.loads((tmp_path / entry["deltas"][old_version]).read_text(encoding="utf-8"))
+    assert (delta["desde"], delta["hasta"]) == (old_version, entry["version"])
+    assert plan.apply_plan_delta(OLD, delta) == NEW
+
+
+def output_files(directory) -> dict[str, bytes]:
+    return {
+        str(path.relative_to(directory)): path.read_bytes()
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and path.name != plan.MANIFEST_NAME
+    }
+
+
+def test_only_changed_careers_are_versioned_again(tmp_path, monkeypatch):
+    output_dir = tmp_path / "planes"
+    alfa = plan.write_plan_outputs({**career_plan(OLD), "carrera": "Licenciatura en Alfa"}, "a.pdf", output_dir)
+    beta = plan.write_plan_outputs({**career_plan(OLD), "carrera": "Licenciatura en Beta"}, "b.pdf", output_dir)
+    plan.write_catalog(output_dir, [alfa.record, beta.record])
+
+    alfa = plan.write_plan_outputs({**career_plan(NEW), "carrera": "Licenciatura en Alfa"}, "a.pdf", output_dir)
+    hashed: list[list[dict]] = []
+    plan_version = plan.plan_version
+    monkeypatch.setattr(plan, "plan_version", lambda materias: hashed.append(materias) or plan_version(materias))
+    plan.write_catalog(output_dir, [alfa.record])
+    assert hashed == [NEW]
+
+    rebuilt = tmp_path / "rebuilt"
+    for path, content in output_files(output_dir).items():
+        (rebuilt / path).parent.mkdir(parents=True, exist_ok=True)
+        (rebuilt / path).write_bytes(content)
+    plan.write_catalog(rebuilt, rescan=True)
+    assert output_files(rebuilt) == output_files(output_dir)
+
+
+def test_metadata_version_ignores_what_the_materias_cover(tmp_path):
+    entries = []
+    for materias, hitos in ((OLD, []), (NEW, []), (NEW, [{"tipo": "titulo_final", "nombre": "Licenciada/o"}])):
+        outputs = plan.write_plan_outputs({**career_plan(materias), "hitos": hitos}, "plan.pdf", tmp_path)
+        catalog_path = plan.write_catalog(tmp_path, [outputs.record])
+        (entry,) = json.loads(catalog_path.read_text(encoding="utf-8"))["carreras"]
+        entries.append(entry)
+
+    metadata = json.loads(outputs.metadata_path.read_text(encoding="utf-8"))
+    kept = {key: value for key, value in metadata.items() if key not in ("materias", "grafo", "generado_en_utc")}
+    assert entries[2]["version_metadata"] == plan.publish_digest(plan.minify_json(kept))
+    assert entries[0]["version_metadata"] == entries[1]["version_metadata"] != entries[2]["version_metadata"]
@@ -0,0 +1,60 @@
+"""--store: SQLite plan store, its queries and the JSON export."""
+
+import pdf_to_plan_json as plan
+
+
+def career_plan(carrera: str) -> dict:
+    return {
+        "carrera": carrera,
+        "materias": [
+            {"id": "01", "nombre": "Matemática", "cuatrimestre": 1, "anio": 1, "correlativas": []},
+            {"id": "02", "nombre": "Análisis", "cuatrimestre": 2, "anio": 1, "correlativas": ["01"]},
+            {"id": "03", "nombre": "Física", "cuatrimestre": 3, "anio": 2, "correlativas": ["02", "01"]},
+        ],
+        "hitos": [{"tipo": "titulo_final", "nombre": "Plan completo", "criterio": {"tipo": "plan_completo"}}],
+    }
+
+
+def output_files(directory) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted(directory.iterdir())}
+
+
+def test_plan_round_trip_keeps_timestamp_while_unchanged(tmp_path):
+    extracted = career_plan("Licenciatura en Alfa")
+    with plan.PlanStore(tmp_path / "planes.sqlite") as store:
+        record = store.put_plan(extracted, "a.pdf")
+        assert store.plan(record["slug"]) == extracted
+        assert store.put_plan(extracted, "a.pdf")["generado_en_utc"] == record["generado_en_utc"]
+
+
+def test_export_matches_direct_outputs(tmp_path):
+    extracted = career_plan("Licenciatura en Alfa")
+    with plan.PlanStore(tmp_path / "planes.sqlite") as store:
+        store.put_plan(extracted, "a.pdf")
+        ((_, _, generated, _),) = store.plans()
+        plan.export_store(store, tmp_path / "store")
+    plan.write_plan_outputs(extracted, "a.pdf", tmp_path / "directo", generated_at=generated)
+
+    assert output_files(tmp_path / "store") == output_files(tmp_path / "directo")
+
+
+def test_cross_career_queries(tmp_path):
+    with plan.PlanStore(tmp_path / "planes.sqlite") as store:
+        store.put_plan(career_plan("Licenciatura en Alfa"), "a.pdf")
+        store.put_plan(career_plan("Tecnicatura en Beta"), "b.pdf")
+
+        assert [slug for slug, *_ in store.careers_with_materia("MATEMATICA")] == [
+            "licenciatura-en-alfa",
+            "tecnicatura-en-beta",
+        ]
+        assert sorted(store.dependents("licenciatura-en-alfa", "01")) == ["02", "03"]
+        assert store.remove_source("b.pdf") == ["tecnicatura-en-beta"]
+        assert [slug for slug, *_ in store.plans()] == ["licenciatura-en-alfa"]
+
+
+def test_renamed_career_replaces_the_old_one(tmp_path):
+    with plan.PlanStore(tmp_path / "planes.sqlite") as store:
+        store.put_plan(career_plan("Licenciatura en Alfa"), "plan.pdf")
+        store.put_plan(career_plan("Licenciatura en Gamma"), "otro.pdf")
+        store.put_plan(career_plan("Licenciatura en Beta"), "plan.pdf")
+        assert [slug for slug, *_ in store.plans()] == ["licenciatura-en-beta", "licenciatura-en-gamma"]
@@ -0,0 +1,37 @@
+"""Page prefilter: only course-table pages go through word extraction."""
+
+import pdf_to_plan_json as plan
+
+
+def test_keeps_header_pages_and_their_continuations():
+    pages = [
+        "Universidad Nacional\nPlan de estudios",
+        "Código Asignatura Correlatividad\n01 Matemática\n02 Programación 01",
+        "03 Física 01\n04 Química",
+        "Anexo\nReglamento de cursada",
+        "Código Asignatura Correlatividad\n20 Taller",
+    ]
+    assert plan.select_table_pages(pages) == frozenset({1, 2, 4})
+
+
+def test_header_without_accents_or_one_header_word():
+    assert plan.select_table_pages(["CODIGO CORRELATIVIDAD\n01 Matemática"]) == frozenset({0})
+
+
+def test_reads_every_page_without_a_header():
+    assert plan.select_table_pages(["Plan de estudios", "01 Matemática"]) is None
+
+
+def test_keeps_continuation_pages_without_a_leading_code():
+    pages = [
+        "Código Asignatura Correlatividad\n01 Matemática",
+        # pypdf put the codes of this page at the end of its lines.
+        "Matemática Discreta Programación Avanzada 12 13",
+        "Optativas: se eligen dos de la oferta anual",
+    ]
+    assert plan.select_table_pages(pages) == frozenset({0, 1})
+
+
+def test_reads_every_page_when_no_header_page_has_code_lines():
+    # pypdf's text order says nothing reliable about this PDF's tables.
+    assert plan.select_table_pages(["Código Asignatura Correlatividad Matemática 01", "02 Física"]) is None
@@ -0,0 +1,109 @@
+"""--publish: content-hashed, minified copies of the plans."""
+
+import hashlib
+import json
+
+import pdf_to_plan_json as plan
+
+
+def career_plan(*nombres: str) -> dict:
+    return {
+        "carrera": "Licenciatura en Pruebas",
+        "materias": [
+            {"id": f"{index:02d}", "nombre": nombre, "cuatrimestre": 1, "anio": 1, "correlativas": []}
+            for index, nombre in enumerate(nombres, 1)
+        ],
+        "hitos": [],
+    }
+
+
+def publish(output_dir, materia_plan: dict):
+    outputs = plan.write_plan_outputs(materia_plan, "plan.pdf", output_dir)
+    catalog_path = plan.write_catalog(output_dir, [outputs.record], publish=True)
+    (entry,) = json.loads(catalog_path.read_text(encoding="utf-8"))["carreras"]
+    return outputs, catalog_path, entry
+
+
+def test_catalog_points_at_hashed_copies(tmp_path):
+    outputs, catalog_path, entry = publish(tmp_path, career_plan("Matemática", "Programación"))
+
+    for key, source in (("materias", outputs.materias_path), ("metadata", outputs.metadata_path)):
+        hashed = tmp_path / entry[key]
+        text = hashed.read_text(encoding="utf-8")
+        assert hashed.parent.name == plan.PUBLISH_DIR
+        assert text == plan.minify_json(json.loads(source.read_text(encoding="utf-8")))
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[: plan.PUBLISH_HASH_LENGTH]
+        assert hashed.name == f"{source.name[: -len('.json')]}.{digest}.json"
+    assert catalog_path.read_text(encoding="utf-8") == plan.minify_json(json.loads(catalog_path.read_text(encoding="utf-8")))
+
+
+def test_changed_plan_replaces_its_old_copies(tmp_path):
+    _, _, first = publish(tmp_path, career_plan("Matemática"))
+    _, _, second = publish(tmp_path, career_plan("Matemática", "Física"))
+
+    assert second["materias"] != first["materias"]
+    assert (tmp_path / second["materias"]).is_file()
+    assert not (tmp_path / first["materias"]).exists()
+
+
+def test_normal_run_points_back_at_the_plan_files(tmp_path):
+    outputs, _, _ = publish(tmp_path, career_plan("Matemática"))
+    plan.write_catalog(tmp_path, [outputs.record])
+
+    (entry,) = json.loads((tmp_path / "catalog.json").read_text(encoding="utf-8"))["carreras"]
+    assert entry["materias"] == "licenciatura-en-pruebas.materias.json"
+    assert (tmp_path / "catalog.json").read_text(encoding="utf-8").endswith("}\n")
+
+
+def test_sidecars_of_earlier_publish_runs_are_removed(tmp_path):
+    outputs, _, entry = publish(tmp_path, career_plan("Matemática"))
+    sidecars = [
+        tmp_path / "catalog.json.gz",
+        tmp_path / plan.SEARCH_DIR / "ma.json.br",
+        tmp_path / (entry["materias"] + ".gz"),
+    ]
+    for sidecar in sidecars:
+        sidecar.write_bytes(b"viejo")
+
+    plan.write_catalog(tmp_path, [outputs.record], publish=True)
+    assert not any(sidecar.exists() for sidecar in sidecars)
+
+
+def test_normal_run_drops_hashed_copies(tmp_path):
+    outputs, _, _ = publish(tmp_path, career_plan("Matemática"))
+    plan.write_catalog(tmp_path, [outputs.record])
+    assert not (tmp_path / plan.PUBLISH_DIR).exists()
+
+
+def test_prune_drops_unreferenced_hashed_copies(tmp_path):
+    _, catalog_path, entry = publish(tmp_path, career_plan("Matemática"))
+    stale = tmp_path / plan.PUBLISH_DIR / "viejo.000000000000.json"
+    stale.write_text("{}", encoding="utf-8")
+
+    assert plan.prune_unreferenced_json(tmp_path, catalog_path) == [stale]
+    assert (tmp_path / entry["materias"]).is_file()
+    assert (tmp_path / entry["metadata"]).is_file()
+
+
+def test_only_publish_runs_hash_the_plans(tmp_path, monkeypatch):
+    hashed: list[str] = []
+    publish_digest = plan.publish_digest
+    monkeypatch.setattr(plan, "publish_digest", lambda text: hashed.append(text) or publish_digest(text))
+
+    outputs = plan.write_plan_outputs(career_plan("Matemática"), "plan.pdf", tmp_path)
+    plan.write_catalog(tmp_path, [outputs.record])
+    metadata = plan.minify_json(json.loads(outputs.metadata_path.read_text(encoding="utf-8")))
+    assert metadata not in hashed
+
+    plan.write_catalog(tmp_path, [outputs.record], publish=True)
+    assert hashed.count(metadata) == 1
+
+
+def test_repeated_publish_reuses_known_hashes(tmp_path):
+    outputs, _, first = publish(tmp_path, career_plan("Matemática"))
+    # Nothing changed, so neither plan file needs to be read again.
+    for path in (outputs.metadata_path, outputs.materias_path):
+        path.write_text("{roto", encoding="utf-8")
+
+    catalog_path = plan.write_catalog(tmp_path, [outputs.record], publish=True)
+    assert json.loads(catalog_path.read_text(encoding="utf-8"))["carreras"] == [first]
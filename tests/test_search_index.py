@@ -0,0 +1,91 @@
+"""Prefix-sharded search index written next to catalog.json."""
+
+import json
+
+import pdf_to_plan_json as plan
+
+
+def career_plan(carrera: str, *nombres: str) -> dict:
+    return {
+        "carrera": carrera,
+        "materias": [
+            {"id": f"{index:02d}", "nombre": nombre, "cuatrimestre": 1, "anio": 1, "correlativas": []}
+            for index, nombre in enumerate(nombres, 1)
+        ],
+        "hitos": [],
+    }
+
+
+def write(output_dir, *plans: tuple[str, dict]) -> dict:
+    records = [plan.write_plan_outputs(career, source, output_dir).record for source, career in plans]
+    catalog_path = plan.write_catalog(output_dir, records)
+    return json.loads(catalog_path.read_text(encoding="utf-8"))
+
+
+def shard(output_dir, key: str) -> dict:
+    return json.loads((output_dir / plan.SEARCH_DIR / f"{key}.json").read_text(encoding="utf-8"))
+
+
+def test_search_tokens_fold_accents_and_skip_stopwords():
+    assert plan.search_tokens("Introducción a la Programación") == ["introduccion", "programacion"]
+    assert plan.search_tokens("Álgebra y Álgebra II") == ["algebra", "ii"]
+
+
+def test_shards_hold_careers_and_materias_by_prefix(tmp_path):
+    catalog = write(
+        tmp_path,
+        ("a.pdf", career_plan("Licenciatura en Informática", "Matemática", "Programación")),
+        ("b.pdf", career_plan("Tecnicatura en Programación", "Programación Web")),
+    )
+    assert catalog["busqueda"] == {"version": plan.SEARCH_VERSION, "ruta": "busqueda/", "prefijo": 2}
+
+    programacion = shard(tmp_path, "pr")
+    docs = [programacion["docs"][index] for index in programacion["tokens"]["programacion"]]
+    assert sorted(docs, key=str) == sorted(
+        [
+            ["licenciatura-en-informatica", "02", "Programación"],
+            ["tecnicatura-en-programacion", None, "Tecnicatura en Programación"],
+            ["tecnicatura-en-programacion", "01", "Programación Web"],
+        ],
+        key=str,
+    )
+    assert set(shard(tmp_path, "we")["tokens"]) == {"web"}
+
+
+def test_shards_no_longer_needed_are_removed(tmp_path):
+    write(tmp_path, ("a.pdf", career_plan("Licenciatura en Informática", "Química")))
+    assert (tmp_path / plan.SEARCH_DIR / "qu.json").is_file()
+
+    write(tmp_path, ("a.pdf", career_plan("Licenciatura en Informática", "Física")))
+    assert not (tmp_path / plan.SEARCH_DIR / "qu.json").exists()
+    assert (tmp_path / plan.SEARCH_DIR / "fi.json").is_file()
+
+
+def search_files(output_dir) -> dict[str, bytes]:
+    return {path.name: path.read_bytes() for path in sorted((output_dir / plan.SEARCH_DIR).iterdir())}
+
+
+def test_only_changed_careers_are_indexed_again(tmp_path, monkeypatch):
+    output_dir = tmp_path / "planes"
+    write(
+        output_dir,
+        ("a.pdf", career_plan("Licenciatura en Informática", "Química", "Programación")),
+        ("b.pdf", career_plan("Tecnicatura en Programación", "Programación Web")),
+    )
+
+    read: list[str] = []
+    career_search_docs = plan.career_search_docs
+    monkeypatch.setattr(
+        plan, "career_search_docs", lambda directory, entry: read.append(entry["slug"]) or career_search_docs(directory, entry)
+    )
+    write(output_dir, ("a.pdf", career_plan("Licenciatura en Informática", "Física", "Programación")))
+    assert read == ["licenciatura-en-informatica"]
+
+    monkeypatch.setattr(plan, "career_search_docs", career_search_docs)
+    rebuilt = tmp_path / "rebuilt"
+    for path in output_dir.rglob("*"):
+        if path.is_file() and path.name != plan.MANIFEST_NAME:
+            (rebuilt / path.relative_to(output_dir)).parent.mkdir(parents=True, exist_ok=True)
+            (rebuilt / path.relative_to(output_dir)).write_bytes(path.read_bytes())
+    plan.write_catalog(rebuilt, rescan=True)
+    assert search_files(rebuilt) == search_files(output_dir)
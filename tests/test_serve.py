@@ -0,0 +1,86 @@
+"""--serve: status codes of the HTTP extraction service, run as the CLI does."""
+
+import http.client
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import pdf_to_plan_json as plan
+
+TOOL = Path(__file__).resolve().parents[1] / "tools" / "pdf_to_plan_json.py"
+
+
+def request(port: int, method: str, path: str, body: bytes | None = None, length: int | None = None):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    try:
+        conn.putrequest(method, path)
+        if length is not None:
+            conn.putheader("Content-Length", str(length))
+        conn.endheaders(body)
+        response = conn.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        free_port = probe.getsockname()[1]
+    process = subprocess.Popen(
+        [sys.executable, str(TOOL), "--serve", f"127.0.0.1:{free_port}", "--jobs", "1"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                request(free_port, "GET", "/health")
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    pytest.fail("--serve no arrancó")
+                time.sleep(0.1)
+        yield free_port
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+
+
+def test_health(port):
+    status, payload = request(port, "GET", "/health")
+    assert status == 200
+    assert payload["ok"] is True
+
+
+def test_unknown_routes(port):
+    assert request(port, "GET", "/plan")[0] == 404
+    assert request(port, "POST", "/otra", b"x", 1)[0] == 404
+
+
+def test_bad_split(port):
+    status, payload = request(port, "POST", "/plan?split=1-5", b"x", 1)
+    assert status == 400
+    assert "--split" in payload["error"]
+
+
+def test_missing_content_length(port):
+    assert request(port, "POST", "/plan")[0] == 411
+
+
+def test_empty_and_oversized_bodies(port):
+    assert request(port, "POST", "/plan", b"", 0)[0] == 400
+    assert request(port, "POST", "/plan", length=plan.SERVE_MAX_UPLOAD + 1)[0] == 413
+
+
+def test_unparseable_pdf(port):
+    status, payload = request(port, "POST", "/plan?nombre=roto.pdf", b"no es un PDF", 12)
+    assert status == 422
+    assert payload["error"]
@@ -0,0 +1,62 @@
+""".words.bin sidecars: raw word boxes kept for --from-words re-parses."""
+
+import pytest
+
+import pdf_to_plan_json as plan
+
+# (page, text, x0, top)
+WORDS = [
+    (0, "Código", 40.0, 100.0),
+    (0, "Asignatura", 90.0, 100.5),
+    (0, "Correlatividad", 400.0, 100.0),
+    (0, "01", 40.0, 120.0),
+    (0, "Matemática", 90.0, 120.0),
+    (0, "-", 400.0, 120.0),
+    (0, "02", 40.0, 140.0),
+    (0, "Programación", 90.0, 140.0),
+    (0, "01", 400.0, 141.0),
+    (1, "Anexo", 90.0, 60.0),
+]
+ROWS = [
+    (0, "Código Asignatura Correlatividad"),
+    (0, "01 Matemática -"),
+    (0, "02 Programación 01"),
+    (1, "Anexo"),
+]
+FULL_TEXT = "Licenciatura en Ñandúes\nCódigo Asignatura Correlatividad"
+
+
+def word_table(words: list[tuple[int, str, float, float]]) -> plan.WordTable:
+    table = plan.WordTable()
+    for page, text, x0, top in words:
+        table.extend_page(page, [{"text": text, "x0": x0, "top": top}])
+    return table
+
+
+def table_words(table: plan.WordTable) -> list[tuple[int, str, float, float]]:
+    return [
+        (page, table.texts[text_id], x0, top)
+        for page, text_id, x0, top in zip(table.page, table.text_id, table.x0, table.top)
+    ]
+
+
+def test_round_trip(tmp_path):
+    source = tmp_path / "carpeta con espacios" / "plan.pdf"
+    sidecar = tmp_path / f"plan{plan.WORDS_SUFFIX}"
+    document = plan.DocumentExtraction(rows=[], full_text=FULL_TEXT, words=word_table(WORDS))
+    plan.write_word_sidecar(sidecar, source, document)
+
+    loaded_source, loaded = plan.load_word_sidecar(sidecar)
+    assert loaded_source == str(source)
+    assert loaded.full_text == FULL_TEXT
+    assert table_words(loaded.words) == WORDS
+    # Each distinct text is stored once.
+    assert loaded.words.texts.count("01") == 1
+    assert [(row.page_index, row.text) for row in loaded.rows] == ROWS
+
+
+def test_rejects_other_files(tmp_path):
+    sidecar = tmp_path / f"otro{plan.WORDS_SUFFIX}"
+    sidecar.write_bytes(b"\0" * plan.WORDS_HEADER.size)
+    with pytest.raises(ValueError):
+        plan.load_word_sidecar(sidecar)
@@ -0,0 +1,51 @@
+"""Outputs are written atomically, and only when their bytes change."""
+
+import json
+import os
+
+import pdf_to_plan_json as plan
+
+PLAN = {
+    "carrera": "Licenciatura en Pruebas",
+    "materias": [{"id": "01", "nombre": "Matemática", "cuatrimestre": 1, "anio": 1, "correlativas": []}],
+    "hitos": [],
+}
+
+
+def test_write_text_if_changed_skips_identical_bytes(tmp_path):
+    path = tmp_path / "plan.json"
+    assert plan.write_text_if_changed(path, "uno")
+    os.utime(path, ns=(1, 1))
+
+    assert not plan.write_text_if_changed(path, "uno")
+    assert path.stat().st_mtime_ns == 1
+    assert plan.write_text_if_changed(path, "dos")
+    assert path.read_text(encoding="utf-8") == "dos"
+    # No temporary files are left behind.
+    assert [item.name for item in tmp_path.iterdir()] == ["plan.json"]
+
+
+def test_keep_timestamp_only_for_identical_content(tmp_path):
+    path = tmp_path / "plan.json"
+    path.write_text(json.dumps({"generado_en_utc": "antes", "carrera": "A"}), encoding="utf-8")
+
+    same = {"generado_en_utc": "ahora", "carrera": "A"}
+    plan.keep_timestamp(path, same)
+    assert same["generado_en_utc"] == "antes"
+    other = {"generado_en_utc": "ahora", "carrera": "B"}
+    plan.keep_timestamp(path, other)
+    assert other["generado_en_utc"] == "ahora"
+
+
+def test_regenerating_the_same_plan_rewrites_nothing(tmp_path):
+    for publish in (False, True):
+        first = plan.write_plan_outputs(PLAN, "plan.pdf", tmp_path)
+        changed: list = []
+        plan.write_catalog(tmp_path, [first.record], publish=publish, changed=changed)
+        assert changed
+
+        second = plan.write_plan_outputs(PLAN, "plan.pdf", tmp_path)
+        assert second.changed == ()
+        changed = []
+        plan.write_catalog(tmp_path, [second.record], publish=publish, changed=changed)
+        assert changed == []
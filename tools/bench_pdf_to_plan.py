@@ -0,0 +1,615 @@
+#!/usr/bin/env python3
+"""
+Offline micro-benchmarks for tools/pdf_to_plan_json.py.
+
+Usage:
+    python tools/bench_pdf_to_plan.py rows --words 5000 --pages 3
+    python tools/bench_pdf_to_plan.py suite --sizes 10,100,1000,10000
+    python tools/bench_pdf_to_plan.py smoke --planes data/planes
+    python tools/bench_pdf_to_plan.py golden --planes data/planes --pdfs data/pdfs
+    python tools/bench_pdf_to_plan.py backends --pdfs data/pdfs
+    python tools/bench_pdf_to_plan.py startup --budget-ms 150
+
+Benchmarks:
+- rows: row clustering (group_page_rows) on dense synthetic pages, compared
+  against the previous O(words x rows) scan for both speed and equality.
+- suite: synthetic plans of 10 to 10,000 materias laid out as plan-PDF
+  tables over many pages, fed straight into group_rows + parse_courses.
+  Reports pages/s and materias/s and checks the parsed plan round-trips.
+- smoke: lays out each checked-in data/planes plan the same way and checks
+  the parser reads it back. The input comes from the JSON being checked,
+  so this is a smoke test of the layout parser, not a golden check.
+- golden: runs the PDFs named in each plan's "fuente_pdf" (required --pdfs)
+  end to end through extract_plan and compares them with the checked-in
+  JSON. Fails when no PDF is found.
+- backends: runs every PDF through each extraction backend (--backend of
+  pdf_to_plan_json.py) and reports seconds and pages/s per backend, plus
+  whether the plan equals the checked-in one (matched by "fuente_pdf") or,
+  for PDFs without a checked-in plan, the reference backend's output.
+- startup: cold-start guard. Runs `import pdf_to_plan_json`, `--help` and
+  `--catalog-only --prune` (on a temporary copy of --planes) in fresh
+  interpreters under -X importtime; fails if the PDF stack, process pools
+  or http.server get imported, or if the module import exceeds --budget-ms.
+
+suite, smoke, golden, backends and startup accept --json PATH to save results for offline comparison.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path, PureWindowsPath
+from typing import Callable, Iterator
+
+import pdf_to_plan_json as plan
+
+
+def synthetic_page_words(word_count: int, seed: int) -> list[dict]:
+    """Dense table-like page: ~8 words per line, with a little vertical jitter."""
+    rnd = random.Random(seed)
+    words: list[dict] = []
+    line_count = max(1, word_count // 8)
+    for index in range(word_count):
+        line = index % line_count
+        top = 20 + line * 4.5 + rnd.uniform(-0.8, 0.8)
+        x0 = 10 + (index // line_count) * 70 + rnd.uniform(0, 5)
+        words.append({"text": f"w{index}", "x0": x0, "top": top})
+    rnd.shuffle(words)
+    return words
+
+
+def group_page_rows_scan(words: list[dict], page_index: int) -> list[plan.Row]:
+    """Reference: the original clustering that scans every row for every word."""
+    page_rows: list[plan.Row] = []
+    for word in sorted(words, key=lambda item: (float(item["top"]), float(item["x0"]))):
+        text = plan.norm_text(str(word.get("text", "")))
+        if not text:
+            continue
+        token = plan.Token(text=text, x0=float(word["x0"]), top=float(word["top"]))
+
+        matched = None
+        for row in page_rows:
+            if abs(row.top - token.top) <= 2:
+                matched = row
+                break
+
+        if matched is None:
+            matched = plan.Row(page_index=page_index, top=token.top, tokens=[])
+            page_rows.append(matched)
+
+        matched.tokens.append(token)
+        matched.top = (matched.top + token.top) / 2
+
+    for row in page_rows:
+        row.finish()
+    return page_rows
+
+
+def row_signature(rows: list[plan.Row]) -> list[tuple]:
+    return [
+        (row.page_index, row.top, row.text, tuple((t.text, t.x0, t.top) for t in row.tokens))
+        for row in rows
+    ]
+
+
+def best_of(repeat: int, func: Callable[[], object]) -> tuple[float, object]:
+    best = float("inf")
+    result: object = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def bench_rows(args: argparse.Namespace) -> int:
+    pages = [synthetic_page_words(args.words, seed=page) for page in range(args.pages)]
+
+    def run(grouper: Callable[[list[dict], int], list[plan.Row]]) -> list[plan.Row]:
+        rows: list[plan.Row] = []
+        for page_index, words in enumerate(pages):
+            rows.extend(grouper(words, page_index))
+        return rows
+
+    scan_time, scan_rows = best_of(args.repeat, lambda: run(group_page_rows_scan))
+    sweep_time, sweep_rows = best_of(args.repeat, lambda: run(plan.group_page_rows))
+    identical = row_signature(scan_rows) == row_signature(sweep_rows)
+
+    total_words = args.words * args.pages
+    print(f"pages={args.pages} words/page={args.words} rows={len(sweep_rows)}")
+    print(f"scan  : {scan_time * 1000:9.2f} ms ({total_words / scan_time:,.0f} words/s)")
+    print(f"sweep : {sweep_time * 1000:9.2f} ms ({total_words / sweep_time:,.0f} words/s)")
+    print(f"speedup: {scan_time / sweep_time:.1f}x  identical rows: {identical}")
+    return 0 if identical else 1
+
+
+# Layout of the synthetic table pages (PDF points, top-down like pdfplumber).
+PAGE_FIRST_TOP = 60.0
+PAGE_LAST_TOP = 780.0
+ROW_PITCH = 22.0
+LINE_PITCH = 7.0
+CODE_X = 40.0
+NAME_X = 120.0
+NAME_MAX_X = 300.0
+CORR_X = 520.0
+
+NAME_VOCABULARY = (
+    "Introducción Análisis Matemático Programación Sistemas Operativos Redes Bases de Datos "
+    "Ingeniería Software Gestión Proyectos Seguridad Información Algoritmos Estructuras "
+    "Física Química Álgebra Geometría Estadística Probabilidad Taller Seminario Avanzada"
+).split()
+
+
+def materia_year(materia: dict) -> int:
+    return (int(materia["cuatrimestre"]) + 1) // 2
+
+
+def render_plan_words(materias: list[dict]) -> tuple[plan.WordTable, int]:
+    """
+    Lay materias out the way plan PDFs do: one "Código / Asignatura /
+    Correlatividad" header per year, code column on the left, names wrapped
+    over continuation lines, correlativas (or "-") on the right. Returns the
+    word table and the number of pages used.
+    """
+    table = plan.WordTable()
+    by_year: dict[int, list[dict]] = {}
+    for materia in materias:
+        by_year.setdefault(materia_year(materia), []).append(materia)
+
+    page, top = 0, PAGE_FIRST_TOP
+    for year in range(1, max(by_year, default=0) + 1):
+        if top + 2 * ROW_PITCH > PAGE_LAST_TOP:
+            page, top = page + 1, PAGE_FIRST_TOP
+        table.extend_page(
+            page,
+            [
+                {"text": "Código", "x0": CODE_X, "top": top},
+                {"text": "Asignatura", "x0": NAME_X, "top": top},
+                {"text": "Correlatividad", "x0": CORR_X, "top": top},
+            ],
+        )
+        top += ROW_PITCH
+
+        year_materias = sorted(by_year.get(year, []), key=lambda m: (m["cuatrimestre"], int(m["id"])))
+        for materia in year_materias:
+            lines: list[list[dict]] = [[]]
+            x0 = NAME_X
+            for word in materia["nombre"].split():
+                if x0 > NAME_MAX_X and lines[-1]:
+                    lines.append([])
+                    x0 = NAME_X
+                lines[-1].append({"text": word, "x0": x0})
+                x0 += 4.5 * len(word) + 4
+
+            needed = ROW_PITCH + LINE_PITCH * (len(lines) - 1)
+            if top + needed > PAGE_LAST_TOP:
+                page, top = page + 1, PAGE_FIRST_TOP
+
+            words = [{"text": materia["id"], "x0": CODE_X, "top": top}]
+            for line_index, line in enumerate(lines):
+                words.extend({**word, "top": top + LINE_PITCH * line_index} for word in line)
+            correlativas = materia["correlativas"] or ["-"]
+            words.extend(
+                {"text": code, "x0": CORR_X + 25 * index, "top": top}
+                for index, code in enumerate(correlativas)
+            )
+            table.extend_page(page, words)
+            top += needed
+
+    return table, page + 1
+
+
+def plan_split_map(materias: list[dict]) -> dict[int, int]:
+    split: dict[int, int] = {}
+    for materia in materias:
+        year = materia_year(materia)
+        split.setdefault(year, 0)
+        if int(materia["cuatrimestre"]) % 2 == 1:
+            split[year] += 1
+    return split
+
+
+def web_view(materias: list[dict]) -> list[dict]:
+    return [
+        {
+            "id": item["id"],
+            "nombre": item["nombre"],
+            "cuatrimestre": item["cuatrimestre"],
+            "correlativas": item["correlativas"],
+        }
+        for item in materias
+    ]
+
+
+def synthetic_plan(count: int, seed: int, per_year: int = 10) -> list[dict]:
+    """`count` materias (up to 10,000, 4-digit codes) with earlier correlativas."""
+    if not 1 <= count <= 10_000:
+        raise SystemExit("El plan sintético admite entre 1 y 10000 materias.")
+    rnd = random.Random(seed)
+    first_id = 1 if count < 10_000 else 0
+    width = 2 if count < 100 else 4
+    materias: list[dict] = []
+    for index in range(count):
+        year, slot = divmod(index, per_year)
+        earlier = [item["id"] for item in materias[-30:]]
+        materias.append(
+            {
+                "id": str(first_id + index).zfill(width),
+                # Distinct words: clean_name folds names whose two halves repeat.
+                "nombre": " ".join(rnd.sample(NAME_VOCABULARY, k=rnd.randint(2, 9))),
+                "cuatrimestre": year * 2 + (1 if slot < per_year // 2 else 2),
+                "correlativas": rnd.sample(earlier, k=min(len(earlier), rnd.randint(0, 3))),
+            }
+        )
+    return materias
+
+
+def parse_rendered(table: plan.WordTable, split_map: dict[int, int]) -> tuple[list[dict], float, float]:
+    started = time.perf_counter()
+    rows = plan.group_rows(table)
+    rows.sort(key=lambda row: row.global_top)
+    grouped = time.perf_counter()
+    materias = plan.parse_courses(rows, split_map=split_map)
+    return materias, grouped - started, time.perf_counter() - grouped
+
+
+def write_results(path: Path | None, kind: str, results: list[dict]) -> None:
+    if path is None:
+        return
+    payload = {"benchmark": kind, "parser_version": plan.PARSER_VERSION, "results": results}
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def bench_suite(args: argparse.Namespace) -> int:
+    sizes = [int(chunk) for chunk in args.sizes.split(",") if chunk.strip()]
+    results: list[dict] = []
+    failures = 0
+    print(f"{'materias':>9} {'pages':>6} {'group ms':>10} {'parse ms':>10} {'pages/s':>10} {'materias/s':>11}  ok")
+    for size in sizes:
+        materias = synthetic_plan(size, seed=args.seed)
+        table, pages = render_plan_words(materias)
+        split_map = plan_split_map(materias)
+
+        best: tuple[float, float] | None = None
+        parsed: list[dict] = []
+        for _ in range(args.repeat):
+            parsed, group_s, parse_s = parse_rendered(table, split_map)
+            if best is None or group_s + parse_s < sum(best):
+                best = (group_s, parse_s)
+        group_s, parse_s = best or (0.0, 0.0)
+        total_s = group_s + parse_s
+        ok = web_view(parsed) == materias
+        failures += 0 if ok else 1
+
+        result = {
+            "materias": size,
+            "pages": pages,
+            "words": len(table),
+            "group_rows_s": round(group_s, 6),
+            "parse_courses_s": round(parse_s, 6),
+            "pages_per_s": round(pages / total_s, 1),
+            "materias_per_s": round(size / total_s, 1),
+            "ok": ok,
+        }
+        results.append(result)
+        print(
+            f"{size:>9} {pages:>6} {group_s * 1000:>10.2f} {parse_s * 1000:>10.2f} "
+            f"{result['pages_per_s']:>10,.0f} {result['materias_per_s']:>11,.0f}  {'yes' if ok else 'NO'}"
+        )
+
+    write_results(args.json, "suite", results)
+    return 1 if failures else 0
+
+
+def golden_full_text(metadata: dict) -> str:
+    lines = ["Carrera de grado /", str(metadata.get("carrera", ""))]
+    lines.extend(str(hito.get("nombre", "")) for hito in metadata.get("hitos", []))
+    return "\n".join(lines)
+
+
+def checked_in_plans(planes: Path) -> Iterator[tuple[str, list[dict], dict]]:
+    """(slug, materias, metadata) of each data/planes plan; metadata is {} without <slug>.json."""
+    for materias_path in sorted(planes.glob("*.materias.json")):
+        slug = materias_path.name[: -len(".materias.json")]
+        metadata_path = planes / f"{slug}.json"
+        materias = json.loads(materias_path.read_text(encoding="utf-8"))
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8")) if metadata_path.exists() else {}
+        yield slug, materias, metadata
+
+
+def bench_smoke(args: argparse.Namespace) -> int:
+    """
+    Smoke test, not a golden check: the word tables are rendered from the
+    checked-in JSON itself, so this only shows that the layout parser
+    reads back what render_plan_words lays out. Use golden for the PDFs.
+    """
+    results: list[dict] = []
+    failures = 0
+    for slug, golden, metadata in checked_in_plans(args.planes):
+        table, pages = render_plan_words(golden)
+        split_map = plan_split_map(golden)
+        parsed, group_s, parse_s = parse_rendered(table, split_map)
+        layout_ok = web_view(parsed) == golden
+        if metadata:
+            document = plan.DocumentExtraction(rows=plan.group_rows(table), full_text=golden_full_text(metadata))
+            document.rows.sort(key=lambda row: row.global_top)
+            rebuilt = plan.plan_from_document(document, split_map, fallback_name=slug)
+            layout_ok = layout_ok and rebuilt["carrera"] == metadata.get("carrera") and [
+                hito["nombre"] for hito in rebuilt["hitos"]
+            ] == [hito["nombre"] for hito in metadata.get("hitos", [])]
+
+        failures += 0 if layout_ok else 1
+        results.append(
+            {
+                "slug": slug,
+                "materias": len(golden),
+                "pages": pages,
+                "layout_ok": layout_ok,
+                "materias_per_s": round(len(golden) / (group_s + parse_s), 1),
+            }
+        )
+        print(
+            f"{slug}: {len(golden)} materias, layout {'ok' if layout_ok else 'DIFF'}, "
+            f"{results[-1]['materias_per_s']:,.0f} materias/s"
+        )
+
+    write_results(args.json, "smoke", results)
+    return 1 if failures else 0
+
+
+def bench_golden(args: argparse.Namespace) -> int:
+    results: list[dict] = []
+    failures = 0
+    split_map = plan.parse_split_map(args.split)
+    for slug, golden, metadata in checked_in_plans(args.planes):
+        source_name = PureWindowsPath(str(metadata.get("fuente_pdf", ""))).name
+        pdf_path = args.pdfs / source_name if source_name else None
+        if pdf_path is None or not pdf_path.exists():
+            print(f"{slug}: sin PDF{f' ({source_name})' if source_name else ''}")
+            continue
+
+        started = time.perf_counter()
+        extracted = plan.extract_plan(pdf_path, split_map=split_map)
+        elapsed = time.perf_counter() - started
+        pdf_ok = (
+            extracted["carrera"] == metadata.get("carrera")
+            and extracted["materias"] == metadata.get("materias")
+            and extracted["hitos"] == metadata.get("hitos")
+        )
+        failures += 0 if pdf_ok else 1
+        results.append(
+            {"slug": slug, "materias": len(golden), "pdf": str(pdf_path), "ok": pdf_ok, "seconds": round(elapsed, 6)}
+        )
+        print(f"{slug}: {len(golden)} materias, PDF {'ok' if pdf_ok else 'DIFF'}, {elapsed:.3f}s")
+
+    write_results(args.json, "golden", results)
+    if not results:
+        print(f"Ningún plan de {args.planes} tiene su PDF en {args.pdfs}: no se verificó nada.")
+        return 1
+    return 1 if failures else 0
+
+
+def golden_plans_by_pdf(planes: Path) -> dict[str, dict]:
+    golden: dict[str, dict] = {}
+    for metadata_path in sorted(planes.glob("*.json")):
+        if metadata_path.name.endswith(".materias.json") or metadata_path.name == "catalog.json":
+            continue
+        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        source_name = PureWindowsPath(str(metadata.get("fuente_pdf", ""))).name
+        if source_name:
+            golden[source_name] = {key: metadata.get(key) for key in ("carrera", "materias", "hitos")}
+    return golden
+
+
+def bench_backends(args: argparse.Namespace) -> int:
+    split_map = plan.parse_split_map(args.split)
+    golden = golden_plans_by_pdf(args.planes) if args.planes.exists() else {}
+    backends = [plan.DEFAULT_BACKEND] + sorted(set(plan.BACKENDS) - {plan.DEFAULT_BACKEND})
+    totals = {name: {"seconds": 0.0, "pages": 0, "ok": 0} for name in backends}
+    results: list[dict] = []
+    failures = 0
+
+    pdf_files = list(plan.iter_pdf_files(args.pdfs))
+    print(f"{'pdf':<40} {'backend':<11} {'s':>8} {'pages/s':>9}  resultado")
+    for pdf_path in pdf_files:
+        try:
+            with plan.load_pdfplumber().open(pdf_path) as pdf:
+                pages = len(pdf.pages)
+        except Exception:
+            pages = 0
+        expected = golden.get(pdf_path.name)
+        reference = "golden" if expected is not None else plan.DEFAULT_BACKEND
+        for name in backends:
+            try:
+                seconds, extracted = best_of(
+                    args.repeat,
+                    lambda: plan.extract_plan(
+                        pdf_path,
+                        split_map,
+                        extraction=plan.ExtractionOptions(backend=name, prefilter=not args.all_pages),
+                    ),
+                )
+            except Exception as exc:
+                seconds, extracted = 0.0, None
+                status = f"ERROR: {exc}"
+            if expected is None and name == plan.DEFAULT_BACKEND:
+                expected = extracted
+            if extracted is not None:
+                status = "igual" if extracted == expected else f"DIFF vs {reference}"
+            ok = extracted is not None and extracted == expected
+            failures += 0 if ok else 1
+            totals[name]["seconds"] += seconds
+            totals[name]["pages"] += pages
+            totals[name]["ok"] += int(ok)
+            pages_per_s = pages / seconds if seconds else 0.0
+            results.append(
+                {
+                    "pdf": str(pdf_path),
+                    "backend": name,
+                    "pages": pages,
+                    "seconds": round(seconds, 6),
+                    "pages_per_s": round(pages_per_s, 1),
+                    "reference": reference,
+                    "ok": ok,
+                }
+            )
+            print(f"{pdf_path.name[:40]:<40} {name:<11} {seconds:>8.3f} {pages_per_s:>9.1f}  {status}")
+
+    for name, total in totals.items():
+        pages_per_s = total["pages"] / total["seconds"] if total["seconds"] else 0.0
+        print(
+            f"[{name}] {total['seconds']:.3f}s, {pages_per_s:,.1f} pages/s, "
+            f"{total['ok']}/{len(pdf_files)} PDFs iguales"
+        )
+    write_results(args.json, "backends", results)
+    return 1 if failures else 0
+
+
+# Modules a cold start without PDFs must not import (see load_pdfplumber).
+STARTUP_FORBIDDEN = (
+    "pdfplumber",
+    "pdfminer",
+    "pypdf",
+    "PIL",
+    "http.server",
+    "multiprocessing",
+    "concurrent.futures",
+)
+
+
+def run_importtime(argv: list[str], cwd: Path) -> tuple[float, dict[str, float]]:
+    """Wall seconds of a fresh interpreter run, and cumulative import ms per module."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *argv], cwd=cwd, capture_output=True, text=True
+    )
+    seconds = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "falló")
+    imports: dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            imports[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue
+    return seconds, imports
+
+
+def bench_startup(args: argparse.Namespace) -> int:
+    tools_dir = Path(plan.__file__).resolve().parent
+    script = str(tools_dir / "pdf_to_plan_json.py")
+    with tempfile.TemporaryDirectory() as scratch:
+        output_dir = Path(scratch) / "planes"
+        if args.planes.is_dir():
+            shutil.copytree(args.planes, output_dir)
+        else:
+            output_dir.mkdir()
+        scenarios = [
+            ("import", ["-c", "import pdf_to_plan_json"]),
+            ("help", [script, "--help"]),
+            ("catalog-only", [script, "--output", str(output_dir), "--catalog-only", "--prune"]),
+        ]
+
+        results: list[dict] = []
+        failures = 0
+        print(f"{'escenario':<14} {'ms':>8} {'import ms':>10}  resultado")
+        for name, argv in scenarios:
+            best_wall = float("inf")
+            module_ms = float("inf")
+            forbidden: set[str] = set()
+            for _ in range(max(1, args.repeat)):
+                seconds, imports = run_importtime(argv, tools_dir)
+                best_wall = min(best_wall, seconds)
+                module_ms = min(module_ms, imports.get("pdf_to_plan_json", float("inf")))
+                forbidden.update(
+                    module
+                    for module in imports
+                    if any(module == root or module.startswith(f"{root}.") for root in STARTUP_FORBIDDEN)
+                )
+            problems: list[str] = []
+            if forbidden:
+                problems.append("importa " + ", ".join(sorted(forbidden)[:5]))
+            if name == "import" and module_ms > args.budget_ms:
+                problems.append(f"supera {args.budget_ms:g} ms")
+            failures += bool(problems)
+            module_text = f"{module_ms:>10.1f}" if module_ms != float("inf") else f"{'-':>10}"
+            print(f"{name:<14} {best_wall * 1000:>8.1f} {module_text}  {'; '.join(problems) or 'ok'}")
+            results.append(
+                {
+                    "scenario": name,
+                    "wall_ms": round(best_wall * 1000, 3),
+                    "import_ms": round(module_ms, 3) if module_ms != float("inf") else None,
+                    "forbidden": sorted(forbidden),
+                    "ok": not problems,
+                }
+            )
+
+    write_results(args.json, "startup", results)
+    return 1 if failures else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmarks offline de pdf_to_plan_json.py.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rows_parser = subparsers.add_parser("rows", help="Agrupado de palabras en filas.")
+    rows_parser.add_argument("--words", default=5000, type=int, help="Palabras por página.")
+    rows_parser.add_argument("--pages", default=3, type=int, help="Cantidad de páginas.")
+    rows_parser.add_argument("--repeat", default=3, type=int, help="Repeticiones (mejor tiempo).")
+    rows_parser.set_defaults(func=bench_rows)
+
+    suite_parser = subparsers.add_parser("suite", help="Planes sintéticos de 10 a 10000 materias.")
+    suite_parser.add_argument("--sizes", default="10,100,1000,10000", help="Cantidades de materias.")
+    suite_parser.add_argument("--seed", default=1, type=int, help="Semilla del generador.")
+    suite_parser.add_argument("--repeat", default=3, type=int, help="Repeticiones (mejor tiempo).")
+    suite_parser.add_argument("--json", type=Path, help="Guarda los resultados en JSON.")
+    suite_parser.set_defaults(func=bench_suite)
+
+    smoke_parser = subparsers.add_parser(
+        "smoke", help="Smoke test: relee data/planes/*.json dibujados como tablas (sin PDFs)."
+    )
+    smoke_parser.add_argument("--planes", default=Path("data/planes"), type=Path, help="Carpeta de planes.")
+    smoke_parser.add_argument("--json", type=Path, help="Guarda los resultados en JSON.")
+    smoke_parser.set_defaults(func=bench_smoke)
+
+    golden_parser = subparsers.add_parser("golden", help="Extrae los PDFs originales y compara con data/planes.")
+    golden_parser.add_argument("--planes", default=Path("data/planes"), type=Path, help="Carpeta de planes.")
+    golden_parser.add_argument("--pdfs", required=True, type=Path, help="Carpeta con los PDFs originales.")
+    golden_parser.add_argument("--split", default="", help="--split usado al generar los planes.")
+    golden_parser.add_argument("--json", type=Path, help="Guarda los resultados en JSON.")
+    golden_parser.set_defaults(func=bench_golden)
+
+    backends_parser = subparsers.add_parser("backends", help="Compara los backends de extracción.")
+    backends_parser.add_argument("--pdfs", required=True, type=Path, help="PDF o carpeta de PDFs.")
+    backends_parser.add_argument("--planes", default=Path("data/planes"), type=Path, help="Carpeta de planes.")
+    backends_parser.add_argument("--split", default="", help="--split usado al generar los planes.")
+    backends_parser.add_argument("--repeat", default=1, type=int, help="Repeticiones (mejor tiempo).")
+    backends_parser.add_argument("--all-pages", action="store_true", help="Sin prefiltro de páginas.")
+    backends_parser.add_argument("--json", type=Path, help="Guarda los resultados en JSON.")
+    backends_parser.set_defaults(func=bench_backends)
+
+    startup_parser = subparsers.add_parser("startup", help="Tiempo de arranque e imports en frío.")
+    startup_parser.add_argument("--planes", default=Path("data/planes"), type=Path, help="Carpeta de planes.")
+    startup_parser.add_argument("--budget-ms", default=150.0, type=float, help="Máximo para importar el módulo.")
+    startup_parser.add_argument("--repeat", default=5, type=int, help="Repeticiones (mejor tiempo).")
+    startup_parser.add_argument("--json", type=Path, help="Guarda los resultados en JSON.")
+    startup_parser.set_defaults(func=bench_startup)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,33 +8,81 @@ Outputs per PDF:
 
 Dependencies:
 - pdfplumber
-- pypdf (optional, used to improve title/career text extraction)
+- pypdf (optional, fallback text source when the career title is not found)
+
+Career name and titles are read from pdfplumber's page text, in the same
+pass as the course table. pypdf breaks words differently and is only read
+when that text has no career title; tests/test_checked_in_plans.py checks
+both against the checked-in plans when their PDFs are in data/pdfs/.
+
+As a library, parse_plan() reads a PDF from bytes, an mmap or a file-like
+object and returns a Plan without writing anything. With --store, plans
+are also kept in SQLite (PlanStore) and the JSON is exported from there.
 """
 
 from __future__ import annotations
 
 import argparse
+import base64
+import contextlib
+import cProfile
+import functools
+import hashlib
+import heapq
+import io
 import json
 import math
+import mmap
+import os
+import queue
 import re
+import signal
+import struct
 import sys
+import threading
+import time
+import tracemalloc
 import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, BinaryIO, Callable, ContextManager, Iterable, Iterator, NamedTuple
+from urllib.parse import parse_qs, urlsplit
 
-try:
-    import pdfplumber
-except ImportError as exc:  # pragma: no cover
-    raise SystemExit(
-        "Missing dependency 'pdfplumber'. Install with: python -m pip install pdfplumber"
-    ) from exc
+if TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
 
-try:
+    from pdfminer.layout import LTChar
+    from pdfminer.pdfpage import PDFPage
     from pypdf import PdfReader
-except Exception:  # pragma: no cover
-    PdfReader = None
+
+
+# The PDF stack (pdfplumber -> pdfminer, PIL; pypdf) is imported on first
+# use, so --help, --catalog-only, --prune-only and --from-words never pay
+# for it. Process pools and http.server are likewise imported where used.
+@functools.cache
+def load_pdfplumber():
+    try:
+        import pdfplumber
+    except ImportError as exc:  # pragma: no cover
+        raise SystemExit(
+            "Missing dependency 'pdfplumber'. Install with: python -m pip install pdfplumber"
+        ) from exc
+    return pdfplumber
+
+
+@functools.cache
+def load_pdf_reader() -> type[PdfReader] | None:
+    """pypdf's PdfReader, or None when pypdf is not installed."""
+    try:
+        from pypdf import PdfReader
+    except Exception:  # pragma: no cover
+        return None
+    return PdfReader
 
 
 # Supports both legacy 4-digit codes (e.g. 6001) and newer 2-digit codes (e.g. 01).
@@ -43,8 +91,7 @@ SPACE_RE = re.compile(r"\s+")
 MAX_CONTINUATION_DISTANCE = 15.0
 
 
-@dataclass
-class Token:
+class Token(NamedTuple):
     text: str
     x0: float
     top: float
@@ -52,18 +99,30 @@ class Token:
 
 @dataclass
 class Row:
+    # Slotted (no per-instance __dict__): plans produce one Row per table line.
+    __slots__ = ("page_index", "top", "tokens", "text")
+
     page_index: int
     top: float
-    tokens: list[Token] = field(default_factory=list)
+    tokens: list[Token]
+    # Joined once the row is complete (see finish()).
+    text: str
+
+    def __init__(self, page_index: int, top: float, tokens: list[Token]) -> None:
+        self.page_index = page_index
+        self.top = top
+        self.tokens = tokens
+        self.text = ""
 
     @property
     def global_top(self) -> float:
         # Big page stride to keep rows sortable across pages.
         return self.page_index * 10_000 + self.top
 
-    @property
-    def text(self) -> str:
-        return " ".join(token.text for token in sorted(self.tokens, key=lambda t: t.x0))
+    def finish(self) -> None:
+        """Order the tokens left to right and join their text."""
+        self.tokens.sort(key=lambda token: token.x0)
+        self.text = " ".join(token.text for token in self.tokens)
 
 
 @dataclass
@@ -75,6 +134,46 @@ class CourseBuilder:
     corr_parts: list[str] = field(default_factory=list)
 
 
+@dataclass
+class StageTimings:
+    """
+    Wall time, CPU time and tracemalloc peak per pipeline stage of one
+    document. Stages are never nested, so each one can reset the peak.
+    Repeated stages (e.g. one extract_words per page) are accumulated.
+    """
+
+    stages: dict[str, dict[str, float]] = field(default_factory=dict)
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            entry = self.stages.setdefault(
+                name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "peak_kib": 0.0}
+            )
+            entry["calls"] += 1
+            entry["wall_s"] += time.perf_counter() - wall_start
+            entry["cpu_s"] += time.process_time() - cpu_start
+            if tracing:
+                entry["peak_kib"] = max(entry["peak_kib"], tracemalloc.get_traced_memory()[1] / 1024)
+
+    def as_dict(self) -> dict[str, dict[str, float]]:
+        return {
+            name: {key: round(value, 6) for key, value in entry.items()}
+            for name, entry in self.stages.items()
+        }
+
+
+def timed(timings: StageTimings | None, name: str) -> ContextManager[None]:
+    return timings.stage(name) if timings is not None else contextlib.nullcontext()
+
+
 def norm_text(value: str) -> str:
     value = unicodedata.normalize("NFKC", value or "")
     value = value.replace("\u00ad", "")
@@ -109,6 +208,31 @@ def parse_split_map(raw: str | None) -> dict[int, int]:
     return result
 
 
+def parse_page_ranges(raw: str | None) -> frozenset[int] | None:
+    """Parse --pages ("1-3,7") into 0-based page indexes."""
+    if not raw:
+        return None
+    result: set[int] = set()
+    for chunk in raw.split(","):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        try:
+            first_raw, _, last_raw = chunk.partition("-")
+            first = int(first_raw.strip())
+            last = int(last_raw.strip()) if last_raw.strip() else first
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --pages format '{chunk}'. Expected entries like '3-5,8'.") from exc
+        if first < 1 or last < first:
+            raise SystemExit(f"Invalid --pages range '{chunk}'. Pages start at 1.")
+        result.update(range(first - 1, last))
+    return frozenset(result) if result else None
+
+
+def format_page_ranges(pages: frozenset[int] | None) -> str:
+    return ",".join(str(index + 1) for index in sorted(pages)) if pages else ""
+
+
 def iter_pdf_files(path: Path) -> Iterable[Path]:
     if path.is_file():
         if path.suffix.lower() == ".pdf":
@@ -117,40 +241,593 @@ def iter_pdf_files(path: Path) -> Iterable[Path]:
     yield from sorted(path.rglob("*.pdf"))
 
 
-def extract_rows(pdf_path: Path) -> list[Row]:
+def iter_word_sidecars(path: Path) -> Iterable[Path]:
+    if path.is_file():
+        if path.name.endswith(WORDS_SUFFIX):
+            yield path
+        return
+    yield from sorted(path.rglob(f"*{WORDS_SUFFIX}"))
+
+
+WORD_EXTRACTION_OPTIONS = {
+    "x_tolerance": 2,
+    "y_tolerance": 2,
+    "keep_blank_chars": False,
+    "use_text_flow": False,
+}
+
+
+class WordTable:
+    """
+    Struct-of-arrays store for raw word boxes: one typed array per column
+    (page, x0, top, text id) and each distinct word text stored once.
+    """
+
+    __slots__ = ("page", "x0", "top", "text_id", "texts", "_text_ids")
+
+    def __init__(self) -> None:
+        self.page = array("Q")
+        self.x0 = array("d")
+        self.top = array("d")
+        self.text_id = array("Q")
+        self.texts: list[str] = []
+        self._text_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.page)
+
+    def intern(self, text: str) -> int:
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = len(self.texts)
+            self._text_ids[text] = text_id
+            self.texts.append(text)
+        return text_id
+
+    def extend_page(self, page_index: int, words: Iterable[dict]) -> None:
+        for word in words:
+            self.page.append(page_index)
+            self.x0.append(float(word["x0"]))
+            self.top.append(float(word["top"]))
+            self.text_id.append(self.intern(str(word.get("text", ""))))
+
+
+@dataclass
+class DocumentExtraction:
+    rows: list[Row]
+    full_text: str
+    # Raw word boxes, only kept for --words-dir.
+    words: WordTable | None = None
+    # Per-page text behind full_text, when extracted page by page.
+    page_texts: list[str] | None = None
+
+    def iter_page_texts(self) -> Iterable[str]:
+        return self.page_texts if self.page_texts is not None else [self.full_text]
+
+
+def group_rows(table: WordTable) -> list[Row]:
+    """
+    Cluster the table's words into rows with a single sweep over words sorted
+    by (page, top, x0).
+
+    Only the most recent row can ever absorb the next word: its moving
+    average top never exceeds the current word's top, and once a newer row
+    exists every older row is more than 2pt above every remaining word.
+    Comparing against the last row therefore yields exactly the rows of a
+    scan over all rows, in O(n log n) per page instead of O(words x rows).
+    """
+    # Normalize each distinct text once instead of once per word.
+    normalized = [norm_text(text) for text in table.texts]
+    text_ids = table.text_id
+    # The trailing index keeps equal boxes in insertion order, like a stable sort.
+    boxes = sorted(zip(table.page, table.top, table.x0, range(len(table))))
+    return sweep_rows((page_index, top, x0, normalized[text_ids[index]]) for page_index, top, x0, index in boxes)
+
+
+def group_page_rows(words: Iterable[dict], page_index: int) -> list[Row]:
+    """group_rows for the words of one page, without building a WordTable."""
+    normalized: dict[str, str] = {}
+    boxes = []
+    for index, word in enumerate(words):
+        text = str(word.get("text", ""))
+        if text not in normalized:
+            normalized[text] = norm_text(text)
+        boxes.append((float(word["top"]), float(word["x0"]), index, normalized[text]))
+    # The index keeps equal boxes in insertion order, as in group_rows.
+    boxes.sort()
+    return sweep_rows((page_index, top, x0, text) for top, x0, _, text in boxes)
+
+
+def sweep_rows(boxes: Iterable[tuple[int, float, float, str]]) -> list[Row]:
+    """Rows of (page, top, x0, normalized text) boxes already in that order."""
     rows: list[Row] = []
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_index, page in enumerate(pdf.pages):
-            words = page.extract_words(
-                x_tolerance=2,
-                y_tolerance=2,
-                keep_blank_chars=False,
-                use_text_flow=False,
-            )
-            page_rows: list[Row] = []
+    current: Row | None = None
+    for page_index, top, x0, text in boxes:
+        if not text:
+            continue
+        token = Token(text=text, x0=x0, top=top)
 
-            for word in sorted(words, key=lambda item: (float(item["top"]), float(item["x0"]))):
-                text = norm_text(str(word.get("text", "")))
-                if not text:
-                    continue
-                token = Token(text=text, x0=float(word["x0"]), top=float(word["top"]))
+        if current is None or current.page_index != page_index or abs(current.top - top) > 2:
+            current = Row(page_index=page_index, top=top, tokens=[])
+            rows.append(current)
+
+        current.tokens.append(token)
+        current.top = (current.top + token.top) / 2
+
+    for row in rows:
+        row.finish()
+    return rows
+
+
+class BufferStream(io.RawIOBase):
+    """Read-only, seekable stream over a memoryview, with its own position."""
+
+    def __init__(self, view: memoryview) -> None:
+        super().__init__()
+        self._view = view
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = max(0, min(len(buffer), len(self._view) - self._pos))
+        buffer[:size] = self._view[self._pos : self._pos + size]
+        self._pos += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        self._pos = max(0, base + offset)
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+class PdfBuffer:
+    """
+    A PDF held in memory (bytes, bytearray, memoryview or mmap). open()
+    returns an independent stream over the same memory, so pypdf and the
+    backend can read it side by side without copying it or sharing a file
+    position. close() releases the memory (and the mmap, if owned).
+    """
+
+    def __init__(self, data, owned: mmap.mmap | None = None) -> None:
+        self.view = memoryview(data).cast("B")
+        self._owned = owned
+
+    def open(self) -> BufferStream:
+        return BufferStream(self.view)
+
+    def close(self) -> None:
+        self.view.release()
+        if self._owned is not None:
+            self._owned.close()
+
+
+def pdf_source(pdf: Path | PdfBuffer) -> Path | BinaryIO:
+    """What pdfplumber, pdfminer and pypdf open: the path, or a fresh stream over the buffer."""
+    return pdf.open() if isinstance(pdf, PdfBuffer) else pdf
+
+
+class PageContent(NamedTuple):
+    index: int
+    # Positioned words as pdfplumber's extract_words dicts (x0, top, text, ...).
+    words: list[dict]
+    text: str
+
+
+def pdfplumber_pages(
+    pdf_path: Path | PdfBuffer, timings: StageTimings | None = None, pages: frozenset[int] | None = None
+) -> Iterator[PageContent]:
+    """Words and text through pdfplumber's page objects (reference backend)."""
+    with timed(timings, "open"):
+        pdf = load_pdfplumber().open(pdf_source(pdf_path))
+        all_pages = pdf.pages
+    with pdf:
+        for page_index, page in enumerate(all_pages):
+            if pages is not None and page_index not in pages:
+                continue
+            with timed(timings, "extract_words"):
+                words = page.extract_words(**WORD_EXTRACTION_OPTIONS)
+            with timed(timings, "extract_text"):
+                text = page.extract_text() or ""
+            # Release the page's layout cache before moving on.
+            page.close()
+            yield PageContent(page_index, words, text)
+
+
+def _page_box(page: PDFPage) -> tuple[float, float, float]:
+    """(height, top offset, left offset) of the page, as pdfplumber computes them."""
+    x0, y0, x1, y1 = (float(value) for value in page.mediabox)
+    x0, x1 = sorted((x0, x1))
+    y0, y1 = sorted((y0, y1))
+    if (page.rotate or 0) % 360 in (90, 270):
+        x0, y0, x1, y1 = y0, x0, y1, x1
+    height = y1 - y0
+    return height, height - y1, x0
+
+
+def _iter_chars(items: Iterable) -> Iterator[LTChar]:
+    from pdfminer.layout import LTChar, LTContainer
+
+    for item in items:
+        if isinstance(item, LTContainer):
+            yield from _iter_chars(item)
+        elif isinstance(item, LTChar):
+            yield item
+
+
+def pdfminer_pages(
+    pdf_path: Path | PdfBuffer, timings: StageTimings | None = None, pages: frozenset[int] | None = None
+) -> Iterator[PageContent]:
+    """
+    Words and text straight from pdfminer's characters, with layout analysis
+    disabled. Builds only the char fields pdfplumber's word/text extraction
+    reads, skipping its per-object attribute resolution (most of the cost of
+    the pdfplumber backend); word and text grouping are pdfplumber's own.
+    """
+    load_pdfplumber()
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+    from pdfplumber.utils.text import extract_text as chars_to_text
+    from pdfplumber.utils.text import extract_words as chars_to_words
+
+    with timed(timings, "open"):
+        source = pdf_source(pdf_path)
+        handle = source if isinstance(source, BufferStream) else open(source, "rb")
+        resources = PDFResourceManager(caching=True)
+        device = PDFPageAggregator(resources, laparams=None)
+        interpreter = PDFPageInterpreter(resources, device)
+    doctop = 0.0
+    with handle:
+        for page_index, page in enumerate(PDFPage.get_pages(handle)):
+            if pages is not None and page_index not in pages:
+                # Still needed for doctop; the page content is never interpreted.
+                doctop += _page_box(page)[0]
+                continue
+            with timed(timings, "extract_words"):
+                interpreter.process_page(page)
+                height, top_offset, left_offset = _page_box(page)
+                chars = []
+                for char in _iter_chars(device.get_result()):
+                    top = height - char.y1 + top_offset
+                    chars.append(
+                        {
+                            "text": char.get_text(),
+                            "x0": char.x0 + left_offset,
+                            "x1": char.x1 + left_offset,
+                            "top": top,
+                            "doctop": doctop + top,
+                            "bottom": height - char.y0 + top_offset,
+                            "upright": char.upright,
+                        }
+                    )
+                words = chars_to_words(chars, **WORD_EXTRACTION_OPTIONS)
+            with timed(timings, "extract_text"):
+                text = chars_to_text(chars) or ""
+            doctop += height
+            yield PageContent(page_index, words, text)
+
+
+Backend = Callable[
+    ["Path | PdfBuffer", "StageTimings | None", "frozenset[int] | None"], Iterator[PageContent]
+]
+BACKENDS: dict[str, Backend] = {
+    "pdfplumber": pdfplumber_pages,
+    "pdfminer": pdfminer_pages,
+}
+DEFAULT_BACKEND = "pdfplumber"
+
+
+def count_pages(pdf_path: Path | PdfBuffer) -> int:
+    reader_class = load_pdf_reader()
+    if reader_class is not None:
+        try:
+            return len(reader_class(pdf_source(pdf_path)).pages)
+        except Exception:
+            pass
+    with load_pdfplumber().open(pdf_source(pdf_path)) as pdf:
+        return len(pdf.pages)
+
+
+def _extract_page_share(pdf_path: Path, backend: str, pages: frozenset[int]) -> list[PageContent]:
+    return list(BACKENDS[backend](pdf_path, None, pages))
+
+
+def backend_pages(
+    pdf_path: Path | PdfBuffer,
+    backend: str = DEFAULT_BACKEND,
+    pages: frozenset[int] | None = None,
+    page_jobs: int = 1,
+    timings: StageTimings | None = None,
+) -> Iterator[PageContent]:
+    """
+    The backend's pages, in page order. With page_jobs > 1 the pages are
+    split into page_jobs contiguous shares, each extracted by a worker
+    process that opens the PDF on its own; shares are yielded in order as
+    they finish, so callers see exactly the sequential result. Per-page
+    stage timings are then replaced by a single "extract_pages" stage.
+    In-memory PDFs are always read in this process.
+    """
+    if isinstance(pdf_path, PdfBuffer):
+        page_jobs = 1
+    if page_jobs > 1:
+        indexes = sorted(pages) if pages is not None else list(range(count_pages(pdf_path)))
+        page_jobs = min(page_jobs, len(indexes))
+    if page_jobs <= 1:
+        yield from BACKENDS[backend](pdf_path, timings, pages)
+        return
+
+    share_size = math.ceil(len(indexes) / page_jobs)
+    shares = [frozenset(indexes[start : start + share_size]) for start in range(0, len(indexes), share_size)]
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=len(shares)) as pool:
+        futures = [pool.submit(_extract_page_share, pdf_path, backend, share) for share in shares]
+        for future in futures:
+            with timed(timings, "extract_pages"):
+                contents = future.result()
+            yield from contents
+
+
+def open_text_reader(pdf_path: Path | PdfBuffer) -> PdfReader | None:
+    """pypdf reader for cheap per-page plain text (no word boxes); None if unavailable."""
+    reader_class = load_pdf_reader()
+    if reader_class is None:
+        return None
+    try:
+        return reader_class(pdf_source(pdf_path))
+    except Exception:
+        return None
+
+
+TABLE_ROW_RE = re.compile(r"^\s*\d{1,4}\b", re.MULTILINE)
+TABLE_CODE_RE = re.compile(r"\b\d{1,4}\b")
+
+
+def select_table_pages(page_texts: Iterable[str]) -> frozenset[int] | None:
+    """
+    Pages parse_courses can draw rows from: pages whose text carries the
+    table header words (has_header_marker's test, applied to the whole page
+    since pypdf's lines need not match our rows) and every page after the
+    first of them, except those clearly outside a table: pages without a
+    single code-like number. Rows before the first header are never parsed,
+    so the pages before it are skipped.
+
+    None (read every page) when no page has a header, or when no header
+    page has a line starting with a code: pypdf's text order then says
+    nothing reliable about this PDF's tables.
+    """
+    selected: set[int] = set()
+    in_table = False
+    code_lines = False
+    for index, text in enumerate(page_texts):
+        normalized = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii").lower()
+        if "codigo" in normalized and ("asignatura" in normalized or "correlatividad" in normalized):
+            in_table = True
+            selected.add(index)
+            code_lines = code_lines or TABLE_ROW_RE.search(normalized) is not None
+        elif in_table and TABLE_CODE_RE.search(normalized):
+            selected.add(index)
+    return frozenset(selected) if selected and code_lines else None
+
+
+class DocumentPage(NamedTuple):
+    index: int
+    # None for pages the prefilter kept away from the backend.
+    words: list[dict] | None
+    text: str
+
+
+def iter_document_pages(
+    pdf_path: Path | PdfBuffer,
+    timings: StageTimings | None = None,
+    backend: str = DEFAULT_BACKEND,
+    prefilter: bool = True,
+    pages: frozenset[int] | None = None,
+    page_jobs: int = 1,
+) -> Iterator[DocumentPage]:
+    """
+    Yield the document page by page, in order. Pages go through the chosen
+    backend (positioned words plus text); with prefilter a cheap pypdf text
+    pass first picks the course-table pages (select_table_pages) and only
+    those do, while the rest just carry their pypdf text. `pages` (0-based)
+    overrides that choice. Without a usable cheap pass every page is read.
+    page_jobs > 1 spreads the backend pages over processes (backend_pages).
+
+    The cheap-pass text of skipped pages is kept until it is yielded, so
+    no page is read twice; only text is held, never words.
+    """
+    reader: PdfReader | None = None
+    selected = pages
+    kept_texts: dict[int, str] = {}
+    if prefilter or pages is not None:
+        with timed(timings, "prefilter"):
+            reader = open_text_reader(pdf_path)
+            if reader is not None:
+                try:
+                    if selected is None:
+                        texts = (page.extract_text() or "" for page in reader.pages)
+                        selected = select_table_pages(_remember(texts, kept_texts))
+                    page_count = len(reader.pages)
+                except Exception:
+                    reader = None
+        if selected is None:
+            reader = None
+
+    def skipped_pages(stop: int) -> Iterator[DocumentPage]:
+        for index in range(next_index, stop):
+            text = kept_texts.pop(index, None)
+            if text is None:
+                text = reader.pages[index].extract_text() or ""
+            yield DocumentPage(index, None, text)
+
+    next_index = 0
+    for content in backend_pages(pdf_path, backend, selected, page_jobs, timings):
+        if reader is not None:
+            yield from skipped_pages(content.index)
+        kept_texts.pop(content.index, None)
+        yield DocumentPage(content.index, content.words, content.text)
+        next_index = content.index + 1
+    if reader is not None:
+        yield from skipped_pages(page_count)
+
+
+def _remember(texts: Iterable[str], store: dict[int, str]) -> Iterator[str]:
+    for index, text in enumerate(texts):
+        store[index] = text
+        yield text
+
+
+def extract_document(
+    pdf_path: Path | PdfBuffer,
+    keep_words: bool = False,
+    timings: StageTimings | None = None,
+    backend: str = DEFAULT_BACKEND,
+    prefilter: bool = True,
+    pages: frozenset[int] | None = None,
+    page_jobs: int = 1,
+) -> DocumentExtraction:
+    """
+    Whole-document extraction (see iter_document_pages): every row sorted
+    by global_top, the full text, and optionally the raw words for
+    --words-dir. extract_plan streams instead; this is kept for the word
+    sidecar and for callers that want all rows at once.
+    """
+    table = WordTable()
+    texts: list[str] = []
+    for page in iter_document_pages(pdf_path, timings, backend, prefilter, pages, page_jobs=page_jobs):
+        if page.words is not None:
+            table.extend_page(page.index, page.words)
+        texts.append(page.text)
+
+    with timed(timings, "group_rows"):
+        rows = group_rows(table)
+        rows.sort(key=lambda row: row.global_top)
+    return DocumentExtraction(
+        rows=rows, full_text="\n".join(texts), words=table if keep_words else None, page_texts=texts
+    )
 
-                matched = None
-                for row in page_rows:
-                    if abs(row.top - token.top) <= 2:
-                        matched = row
-                        break
 
-                if matched is None:
-                    matched = Row(page_index=page_index, top=token.top, tokens=[])
-                    page_rows.append(matched)
+@dataclass(frozen=True)
+class ExtractionOptions:
+    """How a PDF is read (--backend, --all-pages, --pages, --page-jobs)."""
+
+    backend: str = DEFAULT_BACKEND
+    prefilter: bool = True
+    pages: frozenset[int] | None = None
+    # Not part of cache_token: it never changes the extracted plan.
+    page_jobs: int = 1
+
+    def cache_token(self) -> str:
+        if self.pages is not None:
+            selection = f"pages={format_page_ranges(self.pages)}"
+        else:
+            selection = "prefilter" if self.prefilter else "all"
+        return f"{self.backend}:{selection}"
+
+
+# Word sidecar (<pdf stem>.words.bin), little-endian, 8-byte aligned columns:
+#   header   magic, word count, distinct texts, text chars, full text chars, source chars
+#   page     uint64[words]
+#   x0       float64[words]
+#   top      float64[words]
+#   text_id  uint64[words]
+#   text_end uint64[distinct texts]  (char offset where each distinct text ends)
+#   UTF-8 strings: distinct texts, full text, source PDF path
+WORDS_SUFFIX = ".words.bin"
+WORDS_MAGIC = b"PLWORDS2"
+WORDS_HEADER = struct.Struct("<8sQQQQQ")
+
+
+def _pack_column(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _unpack_column(view: memoryview, offset: int, typecode: str, count: int) -> array:
+    column = array(typecode)
+    column.frombytes(view[offset : offset + column.itemsize * count])
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def write_word_sidecar(path: Path, source: Path, document: DocumentExtraction) -> None:
+    table = document.words or WordTable()
+    text_ends = array("Q")
+    position = 0
+    for text in table.texts:
+        position += len(text)
+        text_ends.append(position)
+    texts = "".join(table.texts)
+    source_text = str(source)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as handle:
+        handle.write(
+            WORDS_HEADER.pack(
+                WORDS_MAGIC,
+                len(table),
+                len(table.texts),
+                len(texts),
+                len(document.full_text),
+                len(source_text),
+            )
+        )
+        for column in (table.page, table.x0, table.top, table.text_id, text_ends):
+            handle.write(_pack_column(column))
+        handle.write((texts + document.full_text + source_text).encode("utf-8"))
+
+
+def load_word_sidecar(path: Path) -> tuple[str, DocumentExtraction]:
+    """Read a .words.bin sidecar through mmap; return (source PDF path, document)."""
+    table = WordTable()
+    with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+        magic, count, text_count, text_chars, full_chars, source_chars = WORDS_HEADER.unpack_from(buffer)
+        if magic != WORDS_MAGIC:
+            raise ValueError(f"{path.name} no es un sidecar de palabras válido.")
+        view = memoryview(buffer)
+        try:
+            offset = WORDS_HEADER.size
+            table.page = _unpack_column(view, offset, "Q", count)
+            table.x0 = _unpack_column(view, offset + 8 * count, "d", count)
+            table.top = _unpack_column(view, offset + 16 * count, "d", count)
+            table.text_id = _unpack_column(view, offset + 24 * count, "Q", count)
+            text_ends = _unpack_column(view, offset + 32 * count, "Q", text_count)
+            strings = bytes(view[offset + 32 * count + 8 * text_count :]).decode("utf-8")
+        finally:
+            view.release()
+
+    start = 0
+    for end in text_ends:
+        table.intern(strings[start:end])
+        start = end
+    full_text = strings[text_chars : text_chars + full_chars]
+    source = strings[text_chars + full_chars : text_chars + full_chars + source_chars]
+
+    rows = group_rows(table)
+    rows.sort(key=lambda row: row.global_top)
+    return source, DocumentExtraction(rows=rows, full_text=full_text, words=table)
 
-                matched.tokens.append(token)
-                matched.top = (matched.top + token.top) / 2
 
-            for row in page_rows:
-                row.tokens.sort(key=lambda token: token.x0)
-            rows.extend(page_rows)
+def extract_rows(
+    pdf_path: Path | PdfBuffer,
+    backend: str = DEFAULT_BACKEND,
+    pages: frozenset[int] | None = None,
+    page_jobs: int = 1,
+) -> list[Row]:
+    rows: list[Row] = []
+    for content in backend_pages(pdf_path, backend, pages, page_jobs):
+        rows.extend(group_page_rows(content.words, content.index))
 
     rows.sort(key=lambda row: row.global_top)
     return rows
@@ -182,26 +859,58 @@ def correlativa_tokens(row: Row) -> list[str]:
     return [token.text for token in row.tokens if token.x0 >= 500]
 
 
-def nearest_anchor(anchor_rows: list[Row], current: Row) -> Row:
-    return min(
-        anchor_rows,
-        key=lambda anchor: (
-            abs(anchor.global_top - current.global_top),
-            0 if anchor.global_top >= current.global_top else 1,
-        ),
+@dataclass
+class RowColumns:
+    """Column classification of one row, computed once per parse."""
+
+    row: Row
+    code: str | None
+    names: list[str]
+    correlativas: list[str]
+
+
+def classify_row(row: Row) -> RowColumns:
+    return RowColumns(
+        row=row,
+        code=get_left_code(row),
+        names=name_tokens(row),
+        correlativas=correlativa_tokens(row),
     )
 
 
-def neighbor_anchors(anchor_rows: list[Row], current: Row) -> tuple[Row | None, Row | None]:
-    previous = None
-    following = None
-    for anchor in anchor_rows:
-        if anchor.global_top <= current.global_top:
-            previous = anchor
-            continue
-        following = anchor
-        break
-    return previous, following
+@dataclass
+class AnchorIndex:
+    """Anchor (code) rows of one block, sorted by global_top for bisect lookups."""
+
+    anchors: list[RowColumns]
+    tops: list[float]
+
+    @classmethod
+    def build(cls, anchors: list[RowColumns]) -> AnchorIndex:
+        return cls(anchors=anchors, tops=[anchor.row.global_top for anchor in anchors])
+
+    def neighbors(self, top: float) -> tuple[RowColumns | None, RowColumns | None]:
+        """Last anchor at or above `top` and first anchor below it."""
+        index = bisect_right(self.tops, top)
+        previous = self.anchors[index - 1] if index else None
+        following = self.anchors[index] if index < len(self.anchors) else None
+        return previous, following
+
+    def nearest(self, top: float) -> RowColumns:
+        """
+        Closest anchor; on a distance tie the anchor below wins. Among anchors
+        sharing the same top the first one wins, like a min() over all anchors.
+        """
+        index = bisect_right(self.tops, top)
+        following = self.anchors[index] if index < len(self.anchors) else None
+        if not index:
+            return following
+        previous = self.anchors[bisect_left(self.tops, self.tops[index - 1])]
+        if following is None:
+            return previous
+        if following.row.global_top - top <= top - previous.row.global_top:
+            return following
+        return previous
 
 
 def unique_in_order(items: Iterable[str]) -> list[str]:
@@ -235,175 +944,258 @@ def infer_first_sem_count(total: int) -> int:
     return math.ceil(total / 2)
 
 
-def extract_full_text(pdf_path: Path) -> str:
-    if PdfReader is not None:
+def iter_page_texts(pdf_path: Path | PdfBuffer) -> Iterator[str]:
+    """Plain text page by page (pypdf, else pdfplumber), read lazily."""
+    reader_class = load_pdf_reader()
+    if reader_class is not None:
         try:
-            reader = PdfReader(str(pdf_path))
-            return "\n".join(page.extract_text() or "" for page in reader.pages)
+            pages = reader_class(pdf_source(pdf_path)).pages
         except Exception:
-            pass
+            pages = None
+        if pages is not None:
+            for page in pages:
+                yield page.extract_text() or ""
+            return
 
-    with pdfplumber.open(pdf_path) as pdf:
-        return "\n".join(page.extract_text() or "" for page in pdf.pages)
+    with load_pdfplumber().open(pdf_source(pdf_path)) as pdf:
+        for page in pdf.pages:
+            yield page.extract_text() or ""
+            page.close()
 
 
-def extract_career_name(full_text: str, fallback: str) -> str:
-    text = unicodedata.normalize("NFKC", full_text or "")
-    # Keep line breaks to avoid swallowing extra paragraphs.
-    patterns = [
+def extract_full_text(pdf_path: Path | PdfBuffer) -> str:
+    return "\n".join(iter_page_texts(pdf_path))
+
+
+# Keep line breaks to avoid swallowing extra paragraphs. Ordered by priority.
+CAREER_PATTERNS = [
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
         r"Carrera de\s*(?:grado|pregrado)\s*/?\s*[\r\n]+\s*([^\n\r]+)",
         r"(Tecnicatura Universitaria en\s*[^\n\r]+)",
         r"(Licenciatura en\s*[^\n\r]+)",
         r"(Ingenier[íi]a en\s*[^\n\r]+)",
         r"Título de grado:\s*([^\n\r]+)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, flags=re.IGNORECASE)
-        if match:
-            return clean_name(match.group(1))
-    return fallback
+    )
+]
+INTERMEDIATE_TITLE_RE = re.compile(
+    r"(?:Anal[ií]sta(?:/a)? de Sistemas|T[eé]cnic[ao]/o Universitari[ao]/o en [^\n\r()]+)\s*\([^)]+\)",
+    flags=re.IGNORECASE,
+)
+FINAL_TITLE_PATTERNS = [
+    re.compile(pattern, flags=re.IGNORECASE)
+    for pattern in (
+        r"((?:Licenciada/o|Ingeniera/o)\s+en\s*[^\n\r()]+\(\d+\s*hs\))",
+        r"Título de grado:\s*([^\n\r]+)",
+    )
+]
 
 
-def extract_intermediate_title(full_text: str) -> str | None:
-    text = unicodedata.normalize("NFKC", full_text or "")
-    matches = re.findall(
-        r"(?:Anal[ií]sta(?:/a)? de Sistemas|T[eé]cnic[ao]/o Universitari[ao]/o en [^\n\r()]+)\s*\([^)]+\)",
-        text,
-        flags=re.IGNORECASE,
-    )
-    if matches:
-        # Prefer variants that include workload (hs), fallback to last match.
-        for candidate in reversed(matches):
+class PlanMetadata(NamedTuple):
+    carrera: str | None
+    titulo_intermedio: str | None
+    titulo_final: str | None
+
+
+class MetadataScanner:
+    """
+    Career name and titles from page texts fed in reading order. Each page
+    is normalized once and every pattern runs over it once, together with
+    the last line of the previous page so matches spanning a page break are
+    still found. Career and final title take the first match of the
+    highest-priority pattern, so once their top pattern has matched they
+    are not searched again.
+
+    The intermediate title cannot stop early: like the full-text search it
+    replaces, it is the last "(... hs)" variant (else the last match) of
+    the whole document. Stopping at the first match or table page would
+    change the title of any plan that mentions it again further on, so it
+    is tracked to the end: the scan saves the re-normalization and the
+    repeated career/final title searches, not the pass over every page.
+    """
+
+    def __init__(self) -> None:
+        self._career: list[str | None] = [None] * len(CAREER_PATTERNS)
+        self._final: list[str | None] = [None] * len(FINAL_TITLE_PATTERNS)
+        self._intermediate: str | None = None
+        self._intermediate_hs: str | None = None
+        self._tail = ""
+
+    def feed(self, page_text: str) -> None:
+        page = unicodedata.normalize("NFKC", page_text or "")
+        text = f"{self._tail}\n{page}" if self._tail else page
+        # Matches ending inside the tail were already seen with the previous page.
+        seen = len(self._tail) + 1 if self._tail else 0
+
+        for found, patterns in ((self._career, CAREER_PATTERNS), (self._final, FINAL_TITLE_PATTERNS)):
+            if found[0] is not None:
+                continue
+            for index, pattern in enumerate(patterns):
+                if found[index] is None:
+                    match = next((m for m in pattern.finditer(text) if m.end() > seen), None)
+                    if match:
+                        found[index] = match.group(1)
+
+        for match in INTERMEDIATE_TITLE_RE.finditer(text):
+            if match.end() <= seen:
+                continue
+            candidate = match.group(0)
+            self._intermediate = candidate
+            # Prefer variants that include workload (hs), fallback to last match.
             if "hs" in candidate.lower():
-                return clean_name(candidate)
-        return clean_name(matches[-1])
-    return None
+                self._intermediate_hs = candidate
+
+        stripped = page.rstrip()
+        self._tail = stripped[stripped.rfind("\n") + 1 :]
+
+    @property
+    def has_career(self) -> bool:
+        return any(value is not None for value in self._career)
+
+    def result(self, fallback_name: str = "") -> PlanMetadata:
+        career = next((value for value in self._career if value is not None), None)
+        final = next((value for value in self._final if value is not None), None)
+        intermediate = self._intermediate_hs or self._intermediate
+        return PlanMetadata(
+            carrera=clean_name(career) if career is not None else fallback_name,
+            titulo_intermedio=clean_name(intermediate) if intermediate is not None else None,
+            titulo_final=clean_name(final) if final is not None else None,
+        )
+
+
+def scan_metadata(page_texts: Iterable[str]) -> MetadataScanner:
+    scanner = MetadataScanner()
+    for page_text in page_texts:
+        scanner.feed(page_text)
+    return scanner
+
+
+def extract_career_name(full_text: str, fallback: str) -> str:
+    return scan_metadata([full_text]).result(fallback).carrera
+
+
+def extract_intermediate_title(full_text: str) -> str | None:
+    return scan_metadata([full_text]).result().titulo_intermedio
 
 
 def extract_final_title(full_text: str) -> str | None:
-    text = unicodedata.normalize("NFKC", full_text or "")
-    patterns = [
-        r"((?:Licenciada/o|Ingeniera/o)\s+en\s*[^\n\r()]+\(\d+\s*hs\))",
-        r"Título de grado:\s*([^\n\r]+)",
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text, flags=re.IGNORECASE)
-        if match:
-            return clean_name(match.group(1))
-    return None
+    return scan_metadata([full_text]).result().titulo_final
 
 
-def parse_courses(rows: list[Row], split_map: dict[int, int]) -> list[dict]:
-    header_indexes = [index for index, row in enumerate(rows) if has_header_marker(row)]
-    if not header_indexes:
+def iter_blocks(rows: Iterable[Row]) -> Iterator[tuple[int, list[Row]]]:
+    """
+    Split rows (in global_top order) into (year, rows) blocks, one per
+    header row; rows before the first header are dropped. Consumes the
+    rows lazily, holding a single block at a time.
+    """
+    year = 0
+    block: list[Row] = []
+    for row in rows:
+        if has_header_marker(row):
+            if year:
+                yield year, block
+            year += 1
+            block = []
+        elif year:
+            block.append(row)
+    if year:
+        yield year, block
+
+
+def parse_block(year: int, rows: list[Row], split_map: dict[int, int]) -> list[dict]:
+    """Materias of one year block, in anchor order, with raw correlativas."""
+    materias: list[dict] = []
+    block_columns = [classify_row(row) for row in rows]
+    anchor_rows = [columns for columns in block_columns if columns.code]
+    if not anchor_rows:
         return []
+    anchor_index = AnchorIndex.build(anchor_rows)
 
-    blocks: list[tuple[int, int, int]] = []
-    for block_num, start in enumerate(header_indexes, start=1):
-        end = header_indexes[block_num] if block_num < len(header_indexes) else len(rows)
-        blocks.append((block_num, start + 1, end))
+    builders: dict[str, CourseBuilder] = {}
 
-    result: list[dict] = []
+    for anchor in anchor_rows:
+        builder = builders.setdefault(
+            anchor.code, CourseBuilder(code=anchor.code, year=year, anchor_top=anchor.row.global_top)
+        )
+        builder.name_parts.extend(anchor.names)
+        builder.corr_parts.extend(anchor.correlativas)
 
-    for year, start, end in blocks:
-        block_rows = rows[start:end]
-        anchor_rows = [row for row in block_rows if get_left_code(row)]
-        if not anchor_rows:
+    for columns in block_columns:
+        if columns.code:
             continue
 
-        builders: dict[str, CourseBuilder] = {}
-        anchor_by_code: dict[str, Row] = {}
+        row_name_tokens = columns.names
+        row_corr_tokens = columns.correlativas
+        if not row_name_tokens and not row_corr_tokens:
+            continue
 
-        for anchor in anchor_rows:
-            code = get_left_code(anchor)
-            if not code:
-                continue
-            builder = builders.setdefault(
-                code, CourseBuilder(code=code, year=year, anchor_top=anchor.global_top)
-            )
-            builder.name_parts.extend(name_tokens(anchor))
-            builder.corr_parts.extend(correlativa_tokens(anchor))
-            anchor_by_code[code] = anchor
+        row_top = columns.row.global_top
+        anchor = anchor_index.nearest(row_top)
+        previous, following = anchor_index.neighbors(row_top)
+
+        # Disambiguate wrapped correlativas that can sit between two code rows.
+        # If distances are almost tied and previous already has correlativas while
+        # following has none in its own row, bias to the following anchor.
+        if row_corr_tokens and not row_name_tokens and previous and following:
+            dist_prev = abs(previous.row.global_top - row_top)
+            dist_next = abs(following.row.global_top - row_top)
+            prev_has_corr = bool(builders[previous.code].corr_parts)
+            next_has_corr_in_anchor_row = bool(following.correlativas)
+            if (
+                abs(dist_prev - dist_next) <= 1
+                and any("-" in token for token in row_corr_tokens)
+                and prev_has_corr
+                and not next_has_corr_in_anchor_row
+            ):
+                anchor = following
+
+        if abs(anchor.row.global_top - row_top) > MAX_CONTINUATION_DISTANCE:
+            continue
 
-        for row in block_rows:
-            if get_left_code(row):
-                continue
+        builders[anchor.code].name_parts.extend(row_name_tokens)
+        builders[anchor.code].corr_parts.extend(row_corr_tokens)
 
-            row_name_tokens = name_tokens(row)
-            row_corr_tokens = correlativa_tokens(row)
-            if not row_name_tokens and not row_corr_tokens:
-                continue
+    ordered_codes = sorted(
+        builders.keys(),
+        key=lambda code: builders[code].anchor_top,
+    )
+    first_sem_count = split_map.get(year, infer_first_sem_count(len(ordered_codes)))
 
-            anchor = nearest_anchor(anchor_rows, row)
-            previous, following = neighbor_anchors(anchor_rows, row)
-
-            # Disambiguate wrapped correlativas that can sit between two code rows.
-            # If distances are almost tied and previous already has correlativas while
-            # following has none in its own row, bias to the following anchor.
-            if row_corr_tokens and not row_name_tokens and previous and following:
-                prev_code = get_left_code(previous)
-                next_code = get_left_code(following)
-                if prev_code and next_code:
-                    dist_prev = abs(previous.global_top - row.global_top)
-                    dist_next = abs(following.global_top - row.global_top)
-                    prev_has_corr = bool(builders[prev_code].corr_parts)
-                    next_has_corr_in_anchor_row = bool(correlativa_tokens(following))
-                    if (
-                        abs(dist_prev - dist_next) <= 1
-                        and any("-" in token for token in row_corr_tokens)
-                        and prev_has_corr
-                        and not next_has_corr_in_anchor_row
-                    ):
-                        anchor = following
-
-            if abs(anchor.global_top - row.global_top) > MAX_CONTINUATION_DISTANCE:
-                continue
-            anchor_code = get_left_code(anchor)
-            if not anchor_code:
-                continue
+    for index, code in enumerate(ordered_codes):
+        builder = builders[code]
+        sem_in_year = 1 if index < first_sem_count else 2
+        cuatrimestre = (year - 1) * 2 + sem_in_year
 
-            builders[anchor_code].name_parts.extend(row_name_tokens)
-            builders[anchor_code].corr_parts.extend(row_corr_tokens)
+        materia_name = clean_name(" ".join(builder.name_parts))
+        corr_raw = " ".join(builder.corr_parts)
+        correlativas = unique_in_order(CODE_RE.findall(corr_raw))
+        if corr_raw.strip() == "-":
+            correlativas = []
 
-        ordered_codes = sorted(
-            builders.keys(),
-            key=lambda code: builders[code].anchor_top,
+        materias.append(
+            {
+                "id": code,
+                "nombre": materia_name,
+                "cuatrimestre": cuatrimestre,
+                "anio": year,
+                "correlativas": correlativas,
+            }
         )
-        first_sem_count = split_map.get(year, infer_first_sem_count(len(ordered_codes)))
-
-        for index, code in enumerate(ordered_codes):
-            builder = builders[code]
-            sem_in_year = 1 if index < first_sem_count else 2
-            cuatrimestre = (year - 1) * 2 + sem_in_year
 
-            materia_name = clean_name(" ".join(builder.name_parts))
-            corr_raw = " ".join(builder.corr_parts)
-            correlativas = unique_in_order(CODE_RE.findall(corr_raw))
-            if corr_raw.strip() == "-":
-                correlativas = []
+    return materias
 
-            result.append(
-                {
-                    "id": code,
-                    "nombre": materia_name,
-                    "cuatrimestre": cuatrimestre,
-                    "anio": year,
-                    "correlativas": correlativas,
-                }
-            )
-
-    result.sort(key=lambda materia: int(materia["id"]))
 
+def normalize_correlativas(materias: list[dict]) -> None:
     # Normalize correlativa IDs against extracted subject IDs to avoid
     # impossible locks due to OCR differences like "6" vs "06".
-    id_set = {item["id"] for item in result}
+    id_set = {item["id"] for item in materias}
     numeric_to_id: dict[str, str] = {}
     for code in sorted(id_set, key=lambda value: (len(value), value)):
         if code.isdigit():
             numeric_to_id.setdefault(str(int(code)), code)
     pad_lengths = sorted({len(code) for code in id_set if code.isdigit()})
 
-    for materia in result:
+    for materia in materias:
         normalized_corr: list[str] = []
         for correlativa in materia["correlativas"]:
             candidate = correlativa
@@ -425,130 +1217,1675 @@ def parse_courses(rows: list[Row], split_map: dict[int, int]) -> list[dict]:
 
         materia["correlativas"] = normalized_corr
 
-    return result
 
+def parse_courses(
+    rows: Iterable[Row], split_map: dict[int, int], timings: StageTimings | None = None
+) -> list[dict]:
+    """
+    Materias from rows in global_top order. `rows` may be a generator: each
+    year block is parsed as soon as the next header (or the end) arrives, so
+    only one block of rows is alive at a time.
+    """
+    result: list[dict] = []
+    for year, block in iter_blocks(rows):
+        with timed(timings, "parse_courses"):
+            result.extend(parse_block(year, block, split_map))
 
-def process_pdf(pdf_path: Path, output_dir: Path, split_map: dict[int, int], verbose: bool) -> tuple[Path, Path]:
-    rows = extract_rows(pdf_path)
-    full_text = extract_full_text(pdf_path)
+    with timed(timings, "parse_courses"):
+        result.sort(key=lambda materia: int(materia["id"]))
+        normalize_correlativas(result)
+    return result
 
-    career_name = extract_career_name(full_text, fallback=pdf_path.stem)
-    intermediate_title = extract_intermediate_title(full_text)
-    final_title = extract_final_title(full_text)
-    materias = parse_courses(rows, split_map=split_map)
 
-    if not materias:
-        raise RuntimeError("No se pudieron extraer materias desde el PDF.")
+# Bump whenever a parser change can alter the extracted plan: it is part of
+# every cache key, so old cache entries simply stop matching.
+PARSER_VERSION = "2"
 
-    slug = slugify(career_name)
-    metadata_path = output_dir / f"{slug}.json"
-    materias_path = output_dir / f"{slug}.materias.json"
+_sha256_memo: dict[tuple[str, int, int], str] = {}
 
-    payload = {
-        "carrera": career_name,
-        "fuente_pdf": str(pdf_path),
-        "generado_en_utc": datetime.now(timezone.utc).isoformat(),
-        "materias": materias,
-        "hitos": [],
-    }
 
-    if intermediate_title:
-        payload["hitos"].append(
-            {
-                "tipo": "titulo_intermedio",
-                "nombre": intermediate_title,
-                "anio_estimado": 3,
-                "criterio": {
-                    "tipo": "cuatrimestre_max",
-                    "valor": 6,
-                },
-            }
-        )
+def write_bytes_atomic(path: Path, data: bytes) -> None:
+    """Write-then-rename, so readers never see a half-written file."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
 
-    payload["hitos"].append(
-        {
-            "tipo": "titulo_final",
-            "nombre": final_title or "Plan completo",
-            "criterio": {
-                "tipo": "plan_completo",
-            },
-        }
-    )
 
-    output_dir.mkdir(parents=True, exist_ok=True)
-    metadata_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+def write_text_atomic(path: Path, text: str) -> None:
+    write_bytes_atomic(path, text.encode("utf-8"))
 
-    web_payload = [
-        {
-            "id": item["id"],
-            "nombre": item["nombre"],
-            "cuatrimestre": item["cuatrimestre"],
-            "correlativas": item["correlativas"],
-        }
-        for item in materias
-    ]
-    materias_path.write_text(json.dumps(web_payload, ensure_ascii=False, indent=2), encoding="utf-8")
 
-    if verbose:
-        print(f"[OK] {pdf_path.name} -> {materias_path.name} ({len(web_payload)} materias)")
+def write_bytes_if_changed(path: Path, data: bytes) -> bool:
+    """Atomically write data unless path already holds exactly those bytes; True if written."""
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    write_bytes_atomic(path, data)
+    return True
 
-    return metadata_path, materias_path
 
+def write_text_if_changed(path: Path, text: str) -> bool:
+    return write_bytes_if_changed(path, text.encode("utf-8"))
 
-def write_catalog(output_dir: Path) -> Path:
-    output_dir.mkdir(parents=True, exist_ok=True)
 
-    selected_by_key: dict[str, dict] = {}
-    for metadata_path in sorted(output_dir.glob("*.json")):
-        if metadata_path.name.endswith(".materias.json"):
-            continue
-        if metadata_path.name == "catalog.json":
-            continue
+def keep_timestamp(path: Path, payload: dict, key: str = "generado_en_utc") -> None:
+    """
+    Reuse the timestamp of the JSON already at path when the rest of
+    payload is unchanged, so regenerating identical content yields
+    identical bytes (and write_*_if_changed skips the file).
+    """
+    try:
+        previous = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return
+    if not isinstance(previous, dict) or key not in previous:
+        return
+    if {k: v for k, v in previous.items() if k != key} == {k: v for k, v in payload.items() if k != key}:
+        payload[key] = previous[key]
 
-        slug = metadata_path.stem
-        materias_path = output_dir / f"{slug}.materias.json"
-        if not materias_path.exists():
-            continue
 
-        try:
-            payload = json.loads(metadata_path.read_text(encoding="utf-8"))
-        except Exception:
-            continue
+def file_sha256(path: Path) -> str:
+    stat = path.stat()
+    memo_key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    digest = _sha256_memo.get(memo_key)
+    if digest is None:
+        hasher = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 20), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        _sha256_memo[memo_key] = digest
+    return digest
 
-        carrera = clean_name(str(payload.get("carrera", slug)))
-        source_key = clean_name(str(payload.get("fuente_pdf", ""))).lower() or slug
-        generated_at = str(payload.get("generado_en_utc", ""))
-        candidate = {
-            "slug": slug,
-            "carrera": carrera,
-            "materias": materias_path.name,
-            "metadata": metadata_path.name,
-            "_generated": generated_at,
-        }
 
-        current = selected_by_key.get(source_key)
-        if current is None or candidate["_generated"] > current["_generated"]:
-            selected_by_key[source_key] = candidate
+def format_split_map(split_map: dict[int, int]) -> str:
+    return ",".join(f"{year}:{count}" for year, count in sorted(split_map.items()))
 
-    entries = []
-    for item in selected_by_key.values():
-        entries.append(
-            {
-                "slug": item["slug"],
-                "carrera": item["carrera"],
-                "materias": item["materias"],
-                "metadata": item["metadata"],
-            }
+
+@dataclass
+class PlanCache:
+    """
+    Persistent cache of extracted plans, one JSON entry per
+    (PDF content hash, PDF name, PARSER_VERSION, --split, extraction
+    options) key. The name is part of the key because a PDF without a
+    career title is named after its file.
+    With read=False (--rebuild) entries are refreshed but never reused.
+    """
+
+    directory: Path
+    read: bool = True
+    extraction: ExtractionOptions = field(default_factory=ExtractionOptions)
+
+    def key_for(self, pdf_path: Path, split_map: dict[int, int]) -> str:
+        raw = "\0".join(
+            (
+                PARSER_VERSION,
+                file_sha256(pdf_path),
+                pdf_path.stem,
+                format_split_map(split_map),
+                self.extraction.cache_token(),
+            )
+        )
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, pdf_path: Path, split_map: dict[int, int]) -> dict | None:
+        if not self.read:
+            return None
+        try:
+            entry = json.loads(self.entry_path(self.key_for(pdf_path, split_map)).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        plan = entry.get("plan") if isinstance(entry, dict) else None
+        return plan if isinstance(plan, dict) else None
+
+    def put(self, pdf_path: Path, split_map: dict[int, int], plan: dict) -> None:
+        key = self.key_for(pdf_path, split_map)
+        entry = {
+            "source": str(pdf_path.resolve()),
+            "pdf_sha256": file_sha256(pdf_path),
+            "parser_version": PARSER_VERSION,
+            "split": format_split_map(split_map),
+            "extraction": self.extraction.cache_token(),
+            "plan": plan,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_text_atomic(self.entry_path(key), json.dumps(entry, ensure_ascii=False))
+
+    def evict(self, pdf_files: list[Path], split_map: dict[int, int]) -> list[Path]:
+        """
+        Drop entries whose source PDF no longer exists, and entries for the
+        PDFs of this run that no longer match their current key (content,
+        name, parser version or --split changed).
+        """
+        if not self.directory.is_dir():
+            return []
+        live_keys: dict[str, str] = {}
+        for pdf_path in pdf_files:
+            try:
+                live_keys[str(pdf_path.resolve())] = self.key_for(pdf_path, split_map)
+            except OSError:
+                continue
+
+        in_use = set(live_keys.values())
+        removed: list[Path] = []
+        for entry_path in sorted(self.directory.glob("*.json")):
+            if entry_path.stem in in_use:
+                continue
+            try:
+                entry = json.loads(entry_path.read_text(encoding="utf-8"))
+                source = str(entry["source"])
+            except (OSError, ValueError, KeyError, TypeError):
+                source = ""
+            if source and source not in live_keys and Path(source).exists():
+                continue
+            entry_path.unlink(missing_ok=True)
+            removed.append(entry_path)
+        return removed
+
+
+def extract_plan(
+    pdf_path: Path,
+    split_map: dict[int, int],
+    words_path: Path | None = None,
+    timings: StageTimings | None = None,
+    extraction: ExtractionOptions | None = None,
+) -> dict:
+    """
+    Parse one PDF into {"carrera", "materias", "hitos"} without writing
+    anything but the optional word sidecar at words_path.
+
+    Without a sidecar the PDF is streamed: each page's rows are grouped,
+    handed to parse_courses and dropped, and skipped pages contribute only
+    the text the prefilter already read, so peak memory does not grow with
+    the number of table pages.
+    """
+    extraction = extraction or ExtractionOptions()
+    if words_path is not None:
+        return _extract_plan_with_words(pdf_path, split_map, words_path, timings, extraction)
+    return stream_plan(pdf_path, split_map, pdf_path.stem, timings, extraction)
+
+
+def stream_plan(
+    pdf_path: Path | PdfBuffer,
+    split_map: dict[int, int],
+    fallback_name: str,
+    timings: StageTimings | None = None,
+    extraction: ExtractionOptions | None = None,
+) -> dict:
+    extraction = extraction or ExtractionOptions()
+    metadata = MetadataScanner()
+    pages = iter_document_pages(
+        pdf_path,
+        timings,
+        backend=extraction.backend,
+        prefilter=extraction.prefilter,
+        pages=extraction.pages,
+        page_jobs=extraction.page_jobs,
+    )
+    materias = parse_courses(iter_page_rows(pages, metadata, timings), split_map, timings)
+    if not metadata.has_career and load_pdf_reader() is not None:
+        # Rare: the backend lost the title line. Retry once with pypdf's text.
+        with timed(timings, "extract_full_text"):
+            metadata = scan_metadata(iter_page_texts(pdf_path))
+    return assemble_plan(materias, metadata.result(fallback_name))
+
+
+def iter_page_rows(
+    pages: Iterable[DocumentPage], metadata: MetadataScanner, timings: StageTimings | None = None
+) -> Iterator[Row]:
+    """Rows of each page in global_top order, feeding the page text to `metadata` on the way."""
+    for page in pages:
+        with timed(timings, "metadata"):
+            metadata.feed(page.text)
+        if page.words is None:
+            continue
+        with timed(timings, "group_rows"):
+            rows = group_page_rows(page.words, page.index)
+            rows.sort(key=lambda row: row.global_top)
+        yield from rows
+
+
+def _extract_plan_with_words(
+    pdf_path: Path,
+    split_map: dict[int, int],
+    words_path: Path,
+    timings: StageTimings | None,
+    extraction: ExtractionOptions,
+) -> dict:
+    document = extract_document(
+        pdf_path,
+        keep_words=True,
+        timings=timings,
+        backend=extraction.backend,
+        prefilter=extraction.prefilter,
+        pages=extraction.pages,
+        page_jobs=extraction.page_jobs,
+    )
+    with timed(timings, "metadata"):
+        metadata = scan_metadata(document.iter_page_texts())
+    if not metadata.has_career and load_pdf_reader() is not None:
+        # The sidecar keeps the whole text for --from-words.
+        with timed(timings, "extract_full_text"):
+            document.full_text = extract_full_text(pdf_path)
+            document.page_texts = None
+            metadata = scan_metadata([document.full_text])
+    with timed(timings, "write_words"):
+        write_word_sidecar(words_path, source=pdf_path, document=document)
+    return plan_from_document(
+        document, split_map, fallback_name=pdf_path.stem, timings=timings, metadata=metadata
+    )
+
+
+def plan_from_document(
+    document: DocumentExtraction,
+    split_map: dict[int, int],
+    fallback_name: str,
+    timings: StageTimings | None = None,
+    metadata: MetadataScanner | None = None,
+) -> dict:
+    if metadata is None:
+        with timed(timings, "metadata"):
+            metadata = scan_metadata(document.iter_page_texts())
+    materias = parse_courses(document.rows, split_map=split_map, timings=timings)
+    return assemble_plan(materias, metadata.result(fallback_name))
+
+
+def assemble_plan(materias: list[dict], metadata: PlanMetadata) -> dict:
+    career_name, intermediate_title, final_title = metadata
+    if not materias:
+        raise RuntimeError("No se pudieron extraer materias desde el PDF.")
+
+    hitos: list[dict] = []
+    if intermediate_title:
+        hitos.append(
+            {
+                "tipo": "titulo_intermedio",
+                "nombre": intermediate_title,
+                "anio_estimado": 3,
+                "criterio": {
+                    "tipo": "cuatrimestre_max",
+                    "valor": 6,
+                },
+            }
+        )
+
+    hitos.append(
+        {
+            "tipo": "titulo_final",
+            "nombre": final_title or "Plan completo",
+            "criterio": {
+                "tipo": "plan_completo",
+            },
+        }
+    )
+
+    return {"carrera": career_name, "materias": materias, "hitos": hitos}
+
+
+class Materia(NamedTuple):
+    id: str
+    nombre: str
+    cuatrimestre: int
+    anio: int
+    correlativas: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class Plan:
+    """Typed view of an extracted plan; as_dict() is the dict extract_plan returns."""
+
+    carrera: str
+    materias: tuple[Materia, ...]
+    hitos: tuple[dict, ...]
+
+    @classmethod
+    def from_dict(cls, plan: dict) -> Plan:
+        return cls(
+            carrera=plan["carrera"],
+            materias=tuple(
+                Materia(
+                    id=materia["id"],
+                    nombre=materia["nombre"],
+                    cuatrimestre=materia["cuatrimestre"],
+                    anio=materia["anio"],
+                    correlativas=tuple(materia["correlativas"]),
+                )
+                for materia in plan["materias"]
+            ),
+            hitos=tuple(plan["hitos"]),
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "carrera": self.carrera,
+            "materias": [
+                {**materia._asdict(), "correlativas": list(materia.correlativas)} for materia in self.materias
+            ],
+            "hitos": [dict(hito) for hito in self.hitos],
+        }
+
+
+def as_pdf_buffer(source) -> PdfBuffer:
+    """
+    Wrap bytes, bytearray, memoryview, mmap or a binary file-like object.
+    Buffers and BytesIO are used in place; real files are memory-mapped
+    read-only; any other stream is read once into memory.
+    """
+    if isinstance(source, PdfBuffer):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return PdfBuffer(source)
+    if isinstance(source, io.BytesIO):
+        return PdfBuffer(source.getbuffer())
+    try:
+        fileno = source.fileno()
+    except (AttributeError, OSError, ValueError):
+        fileno = None
+    if fileno is not None:
+        try:
+            mapping = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass
+        else:
+            return PdfBuffer(mapping, owned=mapping)
+    if hasattr(source, "read"):
+        return PdfBuffer(source.read())
+    raise TypeError(f"Fuente de PDF no soportada: {type(source).__name__}")
+
+
+def parse_plan(
+    source,
+    split_map: dict[int, int] | None = None,
+    extraction: ExtractionOptions | None = None,
+    fallback_name: str = "plan-estudios",
+) -> Plan:
+    """
+    Parse a PDF held in memory (see as_pdf_buffer) into a Plan, without
+    touching the filesystem or the cache. fallback_name is the career
+    name used when none is found in the text. Raises RuntimeError when
+    no materias can be extracted.
+    """
+    buffer = as_pdf_buffer(source)
+    try:
+        return Plan.from_dict(stream_plan(buffer, split_map or {}, fallback_name, extraction=extraction))
+    finally:
+        if buffer is not source:
+            buffer.close()
+
+
+GRAPH_VERSION = 1
+
+
+def encode_bitset(bits: int, size: int) -> str:
+    """Little-endian bitset (bit i = position i), trimmed to `size` bits, as base64."""
+    return base64.b64encode(bits.to_bytes((size + 7) // 8, "little")).decode("ascii")
+
+
+def build_dependency_graph(materias: list[dict]) -> dict | None:
+    """
+    Precompute the correlativas graph for the web client:
+    - orden: ids in topological order (ties by cuatrimestre, then id)
+    - dependientes: reverse adjacency, as positions in `orden`
+    - profundidad: longest prerequisite chain below each materia
+    - camino_critico: materias in the longest chain of the plan
+    - prerrequisitos: transitive prerequisites as base64 bitsets over
+      positions in `orden` (only earlier positions can be set)
+    All lists are indexed by position in `orden`. Returns None if the
+    correlativas have a cycle.
+    """
+    by_id = {item["id"]: item for item in materias}
+    prerequisites = {
+        item["id"]: [cid for cid in dict.fromkeys(item["correlativas"]) if cid in by_id and cid != item["id"]]
+        for item in materias
+    }
+    dependents: dict[str, list[str]] = {materia_id: [] for materia_id in by_id}
+    pending = {materia_id: len(required) for materia_id, required in prerequisites.items()}
+    for materia_id, required in prerequisites.items():
+        for cid in required:
+            dependents[cid].append(materia_id)
+
+    ready = [(by_id[materia_id]["cuatrimestre"], materia_id) for materia_id, count in pending.items() if count == 0]
+    heapq.heapify(ready)
+    order: list[str] = []
+    while ready:
+        _, materia_id = heapq.heappop(ready)
+        order.append(materia_id)
+        for dependent_id in dependents[materia_id]:
+            pending[dependent_id] -= 1
+            if pending[dependent_id] == 0:
+                heapq.heappush(ready, (by_id[dependent_id]["cuatrimestre"], dependent_id))
+    if len(order) != len(by_id):
+        return None
+
+    position = {materia_id: index for index, materia_id in enumerate(order)}
+    depth: list[int] = []
+    closure: list[int] = []
+    for materia_id in order:
+        bits = 0
+        level = 0
+        for cid in prerequisites[materia_id]:
+            index = position[cid]
+            bits |= closure[index] | (1 << index)
+            level = max(level, depth[index] + 1)
+        depth.append(level)
+        closure.append(bits)
+
+    return {
+        "version": GRAPH_VERSION,
+        "orden": order,
+        "dependientes": [sorted(position[dep] for dep in dependents[materia_id]) for materia_id in order],
+        "profundidad": depth,
+        "camino_critico": max(depth, default=-1) + 1,
+        "prerrequisitos": [encode_bitset(bits, index) for index, bits in enumerate(closure)],
+    }
+
+
+class PlanOutputs(NamedTuple):
+    metadata_path: Path
+    materias_path: Path
+    # Catalog manifest record for this plan (see CatalogManifest).
+    record: dict
+    # Files whose bytes actually changed (unchanged ones are not rewritten).
+    changed: tuple[Path, ...] = ()
+
+
+class PlanPayloads(NamedTuple):
+    slug: str
+    # <slug>.json
+    metadata: dict
+    # <slug>.materias.json
+    materias: list[dict]
+
+
+def plan_payloads(plan: dict, source: str, generated_at: str | None = None) -> PlanPayloads:
+    career_name = plan["carrera"]
+    materias = plan["materias"]
+
+    payload = {
+        "carrera": career_name,
+        "fuente_pdf": source,
+        "generado_en_utc": generated_at or datetime.now(timezone.utc).isoformat(),
+        "materias": materias,
+        "hitos": plan["hitos"],
+    }
+    graph = build_dependency_graph(materias)
+    if graph is not None:
+        payload["grafo"] = graph
+
+    return PlanPayloads(slugify(career_name), payload, web_materias(materias))
+
+
+def web_materias(materias: list[dict]) -> list[dict]:
+    """The fields of each materia that <slug>.materias.json carries."""
+    return [
+        {
+            "id": item["id"],
+            "nombre": item["nombre"],
+            "cuatrimestre": item["cuatrimestre"],
+            "correlativas": item["correlativas"],
+        }
+        for item in materias
+    ]
+
+
+def write_plan_outputs(
+    plan: dict, source: str, output_dir: Path, generated_at: str | None = None
+) -> PlanOutputs:
+    slug, payload, web_payload = plan_payloads(plan, source, generated_at)
+    metadata_path = output_dir / f"{slug}.json"
+    materias_path = output_dir / f"{slug}.materias.json"
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    keep_timestamp(metadata_path, payload)
+    changed = tuple(
+        path
+        for path, content in ((metadata_path, payload), (materias_path, web_payload))
+        if write_text_if_changed(path, json.dumps(content, ensure_ascii=False, indent=2))
+    )
+    record = manifest_record(slug, payload, datetime.now(timezone.utc).isoformat())
+    return PlanOutputs(metadata_path, materias_path, record, changed)
+
+
+STORE_VERSION = 1
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS carreras (
+    slug TEXT PRIMARY KEY,
+    carrera TEXT NOT NULL,
+    fuente_pdf TEXT NOT NULL,
+    generado_en_utc TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS carreras_fuente ON carreras (fuente_pdf);
+CREATE TABLE IF NOT EXISTS materias (
+    slug TEXT NOT NULL,
+    id TEXT NOT NULL,
+    orden INTEGER NOT NULL,
+    nombre TEXT NOT NULL,
+    clave TEXT NOT NULL,
+    cuatrimestre INTEGER NOT NULL,
+    anio INTEGER NOT NULL,
+    PRIMARY KEY (slug, id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS materias_clave ON materias (clave);
+CREATE TABLE IF NOT EXISTS correlativas (
+    slug TEXT NOT NULL,
+    materia_id TEXT NOT NULL,
+    orden INTEGER NOT NULL,
+    requiere_id TEXT NOT NULL,
+    PRIMARY KEY (slug, materia_id, orden)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS correlativas_requiere ON correlativas (slug, requiere_id);
+CREATE TABLE IF NOT EXISTS hitos (
+    slug TEXT NOT NULL,
+    orden INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    nombre TEXT NOT NULL,
+    datos TEXT NOT NULL,
+    PRIMARY KEY (slug, orden)
+) WITHOUT ROWID;
+"""
+
+
+class PlanStore:
+    """
+    Optional SQLite store of extracted plans (--store): carreras, materias,
+    correlativas and hitos, indexed by id, folded materia name (`clave`,
+    the slugify form) and required materia. process_pdf writes each plan
+    in one transaction; export_store then writes the web JSON for every
+    stored plan in bulk, so cross-career questions (shared materias,
+    dependents) are SQL queries instead of a scan of every <slug>.json.
+    """
+
+    def __init__(self, path: Path) -> None:
+        import sqlite3
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        # Autocommit mode: transactions are explicit (see transaction()).
+        self.conn = sqlite3.connect(path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version == 0:
+            self.conn.executescript(STORE_SCHEMA)
+            self.conn.execute(f"PRAGMA user_version = {STORE_VERSION}")
+        elif version != STORE_VERSION:
+            self.conn.close()
+            raise RuntimeError(f"{path}: versión de store {version} no soportada (se esperaba {STORE_VERSION}).")
+
+    def __enter__(self) -> PlanStore:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    @contextlib.contextmanager
+    def transaction(self) -> Iterator[None]:
+        # IMMEDIATE takes the write lock up front, so concurrent --jobs
+        # workers queue on it instead of failing to upgrade a read lock.
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def _delete(self, slug: str) -> None:
+        for table in ("carreras", "materias", "correlativas", "hitos"):
+            self.conn.execute(f"DELETE FROM {table} WHERE slug = ?", (slug,))
+
+    def put_plan(self, plan: dict, source: str) -> dict:
+        """
+        Replace the plan's career in one transaction, together with any other
+        career extracted from the same PDF (it was renamed); return the
+        plan's manifest record.
+        """
+        slug = slugify(plan["carrera"])
+        materias = plan["materias"]
+        with self.transaction():
+            row = self.conn.execute(
+                "SELECT fuente_pdf, generado_en_utc FROM carreras WHERE slug = ?", (slug,)
+            ).fetchone()
+            # An unchanged plan keeps its timestamp (see keep_timestamp).
+            if row is not None and row[0] == source and self.plan(slug) == plan:
+                generated = row[1]
+            else:
+                generated = datetime.now(timezone.utc).isoformat()
+
+            stale = self.conn.execute("SELECT slug FROM carreras WHERE fuente_pdf = ? AND slug != ?", (source, slug))
+            for (stale_slug,) in stale.fetchall():
+                self._delete(stale_slug)
+            self._delete(slug)
+            self.conn.execute(
+                "INSERT INTO carreras VALUES (?, ?, ?, ?)", (slug, plan["carrera"], source, generated)
+            )
+            self.conn.executemany(
+                "INSERT INTO materias VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (slug, m["id"], index, m["nombre"], slugify(m["nombre"]), m["cuatrimestre"], m["anio"])
+                    for index, m in enumerate(materias)
+                ),
+            )
+            self.conn.executemany(
+                "INSERT INTO correlativas VALUES (?, ?, ?, ?)",
+                (
+                    (slug, m["id"], index, required)
+                    for m in materias
+                    for index, required in enumerate(m["correlativas"])
+                ),
+            )
+            self.conn.executemany(
+                "INSERT INTO hitos VALUES (?, ?, ?, ?, ?)",
+                (
+                    (slug, index, str(hito.get("tipo", "")), str(hito.get("nombre", "")), minify_json(hito))
+                    for index, hito in enumerate(plan["hitos"])
+                ),
+            )
+        return manifest_record(
+            slug,
+            {"carrera": plan["carrera"], "fuente_pdf": source, "generado_en_utc": generated, "materias": materias},
+            datetime.now(timezone.utc).isoformat(),
+        )
+
+    def remove_source(self, source: str) -> list[str]:
+        """Drop the careers extracted from `source`; return their slugs."""
+        with self.transaction():
+            rows = self.conn.execute("SELECT slug FROM carreras WHERE fuente_pdf = ? ORDER BY slug", (source,))
+            slugs = [slug for (slug,) in rows]
+            for slug in slugs:
+                self._delete(slug)
+        return slugs
+
+    def plans(self, slug: str | None = None) -> Iterator[tuple[str, str, str, dict]]:
+        """
+        Yield (slug, fuente_pdf, generado_en_utc, plan) for one or every
+        stored career, with plan shaped like extract_plan's result. Each
+        table is read with a single ordered query.
+        """
+        where, params = ("WHERE slug = ?", (slug,)) if slug is not None else ("", ())
+        correlativas: dict[tuple[str, str], list[str]] = {}
+        for key_slug, materia_id, required in self.conn.execute(
+            f"SELECT slug, materia_id, requiere_id FROM correlativas {where} ORDER BY slug, materia_id, orden", params
+        ):
+            correlativas.setdefault((key_slug, materia_id), []).append(required)
+        materias: dict[str, list[dict]] = {}
+        for key_slug, materia_id, nombre, cuatrimestre, anio in self.conn.execute(
+            f"SELECT slug, id, nombre, cuatrimestre, anio FROM materias {where} ORDER BY slug, orden", params
+        ):
+            materias.setdefault(key_slug, []).append(
+                {
+                    "id": materia_id,
+                    "nombre": nombre,
+                    "cuatrimestre": cuatrimestre,
+                    "anio": anio,
+                    "correlativas": correlativas.get((key_slug, materia_id), []),
+                }
+            )
+        hitos: dict[str, list[dict]] = {}
+        for key_slug, datos in self.conn.execute(f"SELECT slug, datos FROM hitos {where} ORDER BY slug, orden", params):
+            hitos.setdefault(key_slug, []).append(json.loads(datos))
+
+        for key_slug, carrera, source, generated in self.conn.execute(
+            f"SELECT slug, carrera, fuente_pdf, generado_en_utc FROM carreras {where} ORDER BY slug", params
+        ):
+            plan = {"carrera": carrera, "materias": materias.get(key_slug, []), "hitos": hitos.get(key_slug, [])}
+            yield key_slug, source, generated, plan
+
+    def plan(self, slug: str) -> dict | None:
+        return next((plan for _, _, _, plan in self.plans(slug)), None)
+
+    def careers_with_materia(self, nombre: str) -> list[tuple[str, str, str]]:
+        """(slug, id, nombre) of every career's materia whose folded name matches `nombre`."""
+        return self.conn.execute(
+            "SELECT slug, id, nombre FROM materias WHERE clave = ? ORDER BY slug, orden", (slugify(nombre),)
+        ).fetchall()
+
+    def dependents(self, slug: str, materia_id: str) -> list[str]:
+        """Ids of the materias that require materia_id, directly or transitively."""
+        rows = self.conn.execute(
+            """
+            WITH RECURSIVE dependientes(id) AS (
+                SELECT materia_id FROM correlativas WHERE slug = :slug AND requiere_id = :id
+                UNION
+                SELECT c.materia_id FROM correlativas c
+                JOIN dependientes d ON c.slug = :slug AND c.requiere_id = d.id
+            )
+            SELECT m.id FROM materias m JOIN dependientes d ON m.slug = :slug AND m.id = d.id
+            ORDER BY m.orden
+            """,
+            {"slug": slug, "id": materia_id},
+        )
+        return [materia_id for (materia_id,) in rows]
+
+
+def export_store(store: PlanStore, output_dir: Path, changed: list[Path] | None = None) -> list[dict]:
+    """
+    Write <slug>.json / <slug>.materias.json for every stored plan and
+    return their manifest records. As with write_plan_outputs, files whose
+    bytes did not change are left alone; the others go to `changed`.
+    """
+    changed = changed if changed is not None else []
+    records: list[dict] = []
+    for _, source, generated, plan in store.plans():
+        outputs = write_plan_outputs(plan, source, output_dir, generated_at=generated)
+        changed.extend(outputs.changed)
+        records.append(outputs.record)
+    return records
+
+
+def process_pdf(
+    pdf_path: Path,
+    output_dir: Path,
+    split_map: dict[int, int],
+    verbose: bool,
+    cache: PlanCache | None = None,
+    words_dir: Path | None = None,
+    timings: StageTimings | None = None,
+    extraction: ExtractionOptions | None = None,
+    store: Path | None = None,
+) -> PlanOutputs:
+    words_path = words_dir / f"{pdf_path.stem}{WORDS_SUFFIX}" if words_dir is not None else None
+    plan = None
+    if cache is not None and (words_path is None or words_path.exists()):
+        with timed(timings, "cache"):
+            plan = cache.get(pdf_path, split_map)
+    from_cache = plan is not None
+    if plan is None:
+        plan = extract_plan(pdf_path, split_map, words_path=words_path, timings=timings, extraction=extraction)
+        if cache is not None:
+            with timed(timings, "cache"):
+                cache.put(pdf_path, split_map, plan)
+
+    if store is not None:
+        with timed(timings, "write_store"):
+            outputs = store_plan(plan, str(pdf_path), output_dir, store)
+    else:
+        with timed(timings, "write_json"):
+            outputs = write_plan_outputs(plan, str(pdf_path), output_dir)
+
+    if verbose:
+        source = ", cache" if from_cache else ""
+        print(f"[OK] {pdf_path.name} -> {outputs.materias_path.name} ({len(plan['materias'])} materias{source})")
+
+    return outputs
+
+
+def store_plan(plan: dict, source: str, output_dir: Path, store: Path) -> PlanOutputs:
+    """--store: insert the plan; its JSON is written later by export_store."""
+    with PlanStore(store) as plan_store:
+        record = plan_store.put_plan(plan, source)
+    slug = record["slug"]
+    return PlanOutputs(output_dir / f"{slug}.json", output_dir / f"{slug}.materias.json", record)
+
+
+def process_word_sidecar(
+    sidecar_path: Path,
+    output_dir: Path,
+    split_map: dict[int, int],
+    verbose: bool,
+    store: Path | None = None,
+) -> PlanOutputs:
+    """Re-run parse_courses and the output stage from a .words.bin sidecar (no PDF access)."""
+    source, document = load_word_sidecar(sidecar_path)
+    plan = plan_from_document(document, split_map, fallback_name=Path(source).stem)
+    if store is not None:
+        outputs = store_plan(plan, source, output_dir, store)
+    else:
+        outputs = write_plan_outputs(plan, source, output_dir)
+
+    if verbose:
+        print(f"[OK] {sidecar_path.name} -> {outputs.materias_path.name} ({len(plan['materias'])} materias)")
+
+    return outputs
+
+
+@dataclass
+class BatchOptions:
+    """Per-run settings shared by every PDF of a batch (picklable for pool workers)."""
+
+    output_dir: Path
+    split_map: dict[int, int]
+    verbose: bool = False
+    cache: PlanCache | None = None
+    words_dir: Path | None = None
+    timings: bool = False
+    profile_dir: Path | None = None
+    extraction: ExtractionOptions = field(default_factory=ExtractionOptions)
+    # SQLite store (--store): plans go there and JSON is exported afterwards.
+    store: Path | None = None
+
+
+@dataclass
+class PdfResult:
+    error: str | None = None
+    # Timing report (only with BatchOptions.timings).
+    report: dict | None = None
+    # Catalog manifest record of the written plan (None on error).
+    record: dict | None = None
+    # Output files rewritten because their content changed.
+    changed: tuple[Path, ...] = ()
+
+
+@dataclass
+class BatchResult:
+    failures: int = 0
+    reports: list[dict] = field(default_factory=list)
+    records: list[dict] = field(default_factory=list)
+    changed: list[Path] = field(default_factory=list)
+
+    def add(self, pdf_path: Path, result: PdfResult) -> None:
+        if result.error is not None:
+            self.failures += 1
+            print(f"[ERROR] {pdf_path}: {result.error}", file=sys.stderr)
+        if result.report is not None:
+            self.reports.append(result.report)
+        if result.record is not None:
+            self.records.append(result.record)
+        self.changed.extend(result.changed)
+
+
+def run_pdf(pdf_path: Path, options: BatchOptions) -> PdfResult:
+    """Run process_pdf for one PDF under the requested instrumentation."""
+    timings = StageTimings() if options.timings else None
+    if timings is not None and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    profiler = cProfile.Profile() if options.profile_dir is not None else None
+
+    result = PdfResult()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    try:
+        outputs = process_pdf(
+            pdf_path,
+            output_dir=options.output_dir,
+            split_map=options.split_map,
+            verbose=options.verbose,
+            cache=options.cache,
+            words_dir=options.words_dir,
+            extraction=options.extraction,
+            timings=timings,
+            store=options.store,
+        )
+        result.record = outputs.record
+        result.changed = outputs.changed
+    except Exception as exc:
+        result.error = str(exc) or exc.__class__.__name__
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    wall_s = time.perf_counter() - wall_start
+    cpu_s = time.process_time() - cpu_start
+
+    if profiler is not None:
+        options.profile_dir.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(options.profile_dir / f"{pdf_path.stem}.prof"))
+
+    if timings is None:
+        return result
+    stages = timings.as_dict()
+    result.report = {
+        "pdf": str(pdf_path),
+        "ok": result.error is None,
+        "wall_s": round(wall_s, 6),
+        "cpu_s": round(cpu_s, 6),
+        "peak_kib": max((stage["peak_kib"] for stage in stages.values()), default=0.0),
+        "stages": stages,
+    }
+    return result
+
+
+def _process_pdf_job(pdf_path: Path, options: BatchOptions) -> tuple[str, PdfResult]:
+    """Pool worker: run one PDF and return (captured stdout, result)."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        result = run_pdf(pdf_path, options)
+    return buffer.getvalue(), result
+
+
+def process_batch(
+    pdf_files: list[Path],
+    options: BatchOptions,
+    jobs: int = 1,
+    pool: ProcessPoolExecutor | None = None,
+) -> BatchResult:
+    """
+    Process every PDF and collect failures, timing reports and catalog
+    records. With jobs > 1 PDFs are spread over a process pool (`pool` if
+    given, so long-running callers can keep warm workers); output, errors
+    and results are still reported in input order.
+    """
+    batch = BatchResult()
+    if jobs <= 1 or len(pdf_files) <= 1:
+        for pdf_path in pdf_files:
+            batch.add(pdf_path, run_pdf(pdf_path, options))
+        return batch
+
+    options.output_dir.mkdir(parents=True, exist_ok=True)
+    own_pool = pool is None
+    if own_pool:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=min(jobs, len(pdf_files)))
+    try:
+        futures = [pool.submit(_process_pdf_job, pdf_path, options) for pdf_path in pdf_files]
+        for pdf_path, future in zip(pdf_files, futures):
+            try:
+                captured, result = future.result()
+            except Exception as exc:  # worker crashed (e.g. BrokenProcessPool)
+                captured, result = "", PdfResult(error=str(exc) or exc.__class__.__name__)
+            if captured:
+                print(captured, end="")
+            batch.add(pdf_path, result)
+    finally:
+        if own_pool:
+            pool.shutdown()
+    return batch
+
+
+def write_timings_report(path: Path, documents: list[dict], batch: StageTimings | None) -> None:
+    payload = {
+        "generado_en_utc": datetime.now(timezone.utc).isoformat(),
+        "documents": sorted(documents, key=lambda item: item["wall_s"], reverse=True),
+        "batch": batch.as_dict() if batch is not None else {},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+MANIFEST_NAME = ".catalog-manifest"
+MANIFEST_VERSION = 4
+
+
+def manifest_record(slug: str, payload: dict, produced_at: str | None = None) -> dict:
+    """
+    produced_at is when this run wrote (or confirmed) the plan. Unlike
+    generado_en_utc, which keep_timestamp pins while the content is the
+    same, it always moves, so it decides which plan of a PDF is current.
+    "version" is the plan_version of the plan's <slug>.materias.json and
+    "version_metadata" the metadata_version of its <slug>.json.
+    """
+    generated = str(payload.get("generado_en_utc", ""))
+    record = {
+        "slug": slug,
+        "carrera": str(payload.get("carrera", slug)),
+        "fuente_pdf": str(payload.get("fuente_pdf", "")),
+        "generado_en_utc": generated,
+        "producido_en_utc": produced_at or generated,
+    }
+    try:
+        record["version"] = plan_version(web_materias(payload["materias"]))
+    except (KeyError, TypeError):
+        pass
+    record["version_metadata"] = metadata_version(payload)
+    return record
+
+
+class CatalogManifest:
+    """
+    Index of the plans in output_dir (slug -> carrera, fuente_pdf,
+    generado_en_utc, producido_en_utc, version, version_metadata), persisted as output_dir/.catalog-manifest. It is
+    updated from process_pdf results so catalog.json can be rebuilt without
+    re-reading every <slug>.json; only a missing or corrupt manifest
+    triggers a full rescan. Delete it to force one.
+    """
+
+    def __init__(
+        self, output_dir: Path, records: dict[str, dict] | None = None, state: dict[str, dict] | None = None
+    ) -> None:
+        self.output_dir = output_dir
+        self.records: dict[str, dict] = records or {}
+        # Bookkeeping of the files derived from the plans (e.g. "versiones",
+        # see write_plan_versions). A rescan starts it empty.
+        self.state: dict[str, dict] = state or {}
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / MANIFEST_NAME
+
+    @classmethod
+    def load(cls, output_dir: Path) -> CatalogManifest | None:
+        try:
+            payload = json.loads((output_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+            if payload.get("version") != MANIFEST_VERSION:
+                return None
+            records = payload["planes"]
+            if not isinstance(records, dict) or not all(isinstance(item, dict) for item in records.values()):
+                return None
+            state = payload.get("estado", {})
+            if not isinstance(state, dict) or not all(isinstance(item, dict) for item in state.values()):
+                state = {}
+        except (OSError, ValueError, KeyError, AttributeError):
+            return None
+        return cls(output_dir, records, state)
+
+    @classmethod
+    def rescan(cls, output_dir: Path) -> CatalogManifest:
+        manifest = cls(output_dir)
+        for metadata_path in sorted(output_dir.glob("*.json")):
+            if metadata_path.name.endswith(".materias.json"):
+                continue
+            if metadata_path.name == "catalog.json":
+                continue
+            try:
+                payload = json.loads(metadata_path.read_text(encoding="utf-8"))
+            except Exception:
+                continue
+            if isinstance(payload, dict):
+                # Without a manifest the file's mtime is the best guess of
+                # when it was last produced.
+                mtime = datetime.fromtimestamp(metadata_path.stat().st_mtime, timezone.utc).isoformat()
+                produced = max(mtime, str(payload.get("generado_en_utc", "")))
+                manifest.update(manifest_record(metadata_path.stem, payload, produced))
+        return manifest
+
+    @classmethod
+    def open(cls, output_dir: Path) -> CatalogManifest:
+        return cls.load(output_dir) or cls.rescan(output_dir)
+
+    def update(self, record: dict) -> None:
+        self.records[record["slug"]] = record
+
+    def slugs_for_source(self, source: str) -> list[str]:
+        return [slug for slug, record in sorted(self.records.items()) if record.get("fuente_pdf") == source]
+
+    def drop_missing(self) -> None:
+        for slug in list(self.records):
+            metadata_path = self.output_dir / f"{slug}.json"
+            materias_path = self.output_dir / f"{slug}.materias.json"
+            if not (metadata_path.exists() and materias_path.exists()):
+                del self.records[slug]
+
+    def save(self) -> None:
+        payload = {
+            "version": MANIFEST_VERSION,
+            "planes": dict(sorted(self.records.items())),
+            "estado": dict(sorted(self.state.items())),
+        }
+        write_text_if_changed(self.path, json.dumps(payload, ensure_ascii=False, indent=2))
+
+    def catalog_entries(self) -> list[dict]:
+        # One entry per source PDF: the most recently produced plan wins.
+        selected_by_key: dict[str, dict] = {}
+        for slug, record in sorted(self.records.items()):
+            source_key = clean_name(record.get("fuente_pdf", "")).lower() or slug
+            candidate = {
+                "slug": slug,
+                "carrera": clean_name(record.get("carrera", slug)),
+                "materias": f"{slug}.materias.json",
+                "metadata": f"{slug}.json",
+                "_produced": record.get("producido_en_utc") or record.get("generado_en_utc", ""),
+            }
+            for key in ("version", "version_metadata"):
+                if record.get(key):
+                    candidate[key] = str(record[key])
+            current = selected_by_key.get(source_key)
+            if current is None or candidate["_produced"] > current["_produced"]:
+                selected_by_key[source_key] = candidate
+
+        entries = [
+            {key: value for key, value in item.items() if not key.startswith("_")}
+            for item in selected_by_key.values()
+        ]
+        entries.sort(key=lambda item: item["carrera"].lower())
+        return entries
+
+
+PUBLISH_DIR = "hashed"
+PUBLISH_HASH_LENGTH = 12
+
+
+def minify_json(payload: object) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def publish_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:PUBLISH_HASH_LENGTH]
+
+
+def publish_json(
+    source_path: Path,
+    publish_dir: Path,
+    keep: set[str],
+    changed: list[Path] | None = None,
+    digest: str | None = None,
+) -> str:
+    """
+    Write a minified copy of source_path as <stem>.<hash>.json and return
+    its name. Existing files are reused: the name already identifies the
+    content. With a known `digest` (from the catalog manifest) source_path
+    is only read when that copy is missing.
+    """
+    stem = source_path.name[: -len(".json")]
+    if digest is not None and (publish_dir / f"{stem}.{digest}.json").exists():
+        keep.add(f"{stem}.{digest}.json")
+        return f"{stem}.{digest}.json"
+
+    text = minify_json(json.loads(source_path.read_text(encoding="utf-8")))
+    hashed_path = publish_dir / f"{stem}.{publish_digest(text)}.json"
+    if not hashed_path.exists():
+        write_text_atomic(hashed_path, text)
+        changed.append(hashed_path)
+    keep.add(hashed_path.name)
+    return hashed_path.name
+
+
+def publish_catalog_entries(
+    output_dir: Path, entries: list[dict], changed: list[Path] | None = None, digests: dict[str, str] | None = None
+) -> list[dict]:
+    """
+    Publish the materias/metadata of every catalog entry under
+    output_dir/hashed/ and return entries pointing at the hashed names.
+    `digests` maps file names to their known publish_digest.
+    Hashed files no longer referenced are removed.
+    """
+    digests = digests or {}
+    changed = changed if changed is not None else []
+    publish_dir = output_dir / PUBLISH_DIR
+    publish_dir.mkdir(parents=True, exist_ok=True)
+
+    keep: set[str] = set()
+    published: list[dict] = []
+    for entry in entries:
+        item = dict(entry)
+        for key in ("materias", "metadata"):
+            name = publish_json(output_dir / entry[key], publish_dir, keep, changed, digests.get(entry[key]))
+            item[key] = f"{PUBLISH_DIR}/{name}"
+        published.append(item)
+
+    changed.extend(remove_unkept(publish_dir, keep))
+    return published
+
+
+def remove_sidecars(directory: Path) -> list[Path]:
+    """
+    Remove the .gz/.br copies that --publish used to write next to the
+    JSON files; return them. Static hosts compress on the fly, and the
+    header rules could not serve the sidecars with a Content-Encoding.
+    """
+    removed: list[Path] = []
+    for suffix in (".gz", ".br"):
+        for path in sorted(directory.glob(f"*.json{suffix}")):
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+def remove_unkept(directory: Path, keep: set[str]) -> list[Path]:
+    """Remove the files of directory not named in keep; return them."""
+    removed: list[Path] = []
+    if not directory.is_dir():
+        return removed
+    for path in sorted(directory.iterdir()):
+        if path.is_file() and path.name not in keep:
+            path.unlink()
+            removed.append(path)
+    return removed
+
+
+SEARCH_DIR = "busqueda"
+SEARCH_VERSION = 1
+SEARCH_PREFIX_LENGTH = 2
+SEARCH_STOPWORDS = frozenset({"al", "con", "de", "del", "el", "en", "la", "las", "los", "para", "por", "un", "una"})
+
+
+def search_tokens(value: str) -> list[str]:
+    """Accent-folded, lowercase words of value (same folding as slugify)."""
+    words = slugify(value).split("-") if norm_text(value) else []
+    return [word for word in dict.fromkeys(words) if len(word) >= SEARCH_PREFIX_LENGTH and word not in SEARCH_STOPWORDS]
+
+
+def career_search_docs(output_dir: Path, entry: dict) -> list[list]:
+    """Search docs ([slug, materia id or None, name]) of one catalog entry."""
+    slug = entry["slug"]
+    docs: list[list] = [[slug, None, entry["carrera"]]]
+    try:
+        materias = json.loads((output_dir / entry["materias"]).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return docs
+    for materia in materias if isinstance(materias, list) else []:
+        if isinstance(materia, dict) and materia.get("id") and materia.get("nombre"):
+            docs.append([slug, str(materia["id"]), str(materia["nombre"])])
+    return docs
+
+
+def search_prefixes(docs: list[list]) -> dict[str, list[list]]:
+    """Group docs by the prefixes of their tokens (a doc may land in several)."""
+    grouped: dict[str, list[list]] = {}
+    for doc in docs:
+        for key in dict.fromkeys(token[:SEARCH_PREFIX_LENGTH] for token in search_tokens(doc[2])):
+            grouped.setdefault(key, []).append(doc)
+    return grouped
+
+
+def search_shard(key: str, docs: list[list]) -> dict:
+    tokens: dict[str, list[int]] = {}
+    for doc_index, (_, _, name) in enumerate(docs):
+        for token in search_tokens(name):
+            if token[:SEARCH_PREFIX_LENGTH] == key:
+                tokens.setdefault(token, []).append(doc_index)
+    return {"version": SEARCH_VERSION, "tokens": dict(sorted(tokens.items())), "docs": docs}
+
+
+def build_search_shards(output_dir: Path, entries: list[dict]) -> dict[str, dict]:
+    """
+    Group the tokens of every career and materia name by their first
+    SEARCH_PREFIX_LENGTH characters. Each shard carries its own doc table
+    ([slug, materia id or None, name], ordered by slug) so one fetch
+    answers a query.
+    """
+    docs = [
+        doc for entry in sorted(entries, key=lambda item: item["slug"]) for doc in career_search_docs(output_dir, entry)
+    ]
+    return {key: search_shard(key, grouped) for key, grouped in sorted(search_prefixes(docs).items())}
+
+
+def write_search_index(
+    output_dir: Path,
+    entries: list[dict],
+    changed: list[Path] | None = None,
+    state: dict | None = None,
+) -> dict:
+    """
+    Write the search shards to output_dir/busqueda/<prefix>.json and return
+    the descriptor stored in catalog.json. The catalog only grows by this
+    fixed-size descriptor; the client fetches the one shard a query needs.
+    Shards no longer produced are removed.
+
+    `state` (kept in the catalog manifest) records the version and prefixes
+    of each indexed career and is updated in place. With it, only the
+    shards of careers whose version or name changed are rebuilt; an empty
+    state rebuilds the whole index.
+    """
+    changed = changed if changed is not None else []
+    state = state if state is not None else {}
+    search_dir = output_dir / SEARCH_DIR
+    search_dir.mkdir(parents=True, exist_ok=True)
+    changed.extend(remove_sidecars(search_dir))
+    descriptor = {"version": SEARCH_VERSION, "ruta": f"{SEARCH_DIR}/", "prefijo": SEARCH_PREFIX_LENGTH}
+
+    def write_shard(key: str, shard: dict, keep: set[str]) -> None:
+        shard_path = search_dir / f"{key}.json"
+        keep.add(shard_path.name)
+        if write_text_if_changed(shard_path, minify_json(shard)):
+            changed.append(shard_path)
+
+    def remove_stale(paths: Iterable[Path], keep: set[str]) -> None:
+        for path in sorted(paths):
+            if path.is_file() and path.name not in keep:
+                path.unlink()
+                changed.append(path)
+
+    def indexed_as(entry: dict) -> str:
+        return f"{entry.get('version', '')}:{entry['carrera']}"
+
+    careers = state.get("carreras")
+    current = {entry["slug"]: entry for entry in entries}
+    if isinstance(careers, dict):
+        stale = {
+            slug
+            for slug, known in careers.items()
+            if not isinstance(known, dict) or slug not in current or known.get("clave") != indexed_as(current[slug])
+        }
+        stale.update(slug for slug, entry in current.items() if slug not in careers or not entry.get("version"))
+        touched: set[str] = set()
+        for slug in stale:
+            known = careers.pop(slug, None)
+            if isinstance(known, dict):
+                touched.update(str(key) for key in known.get("prefijos", ()))
+        added: dict[str, list[list]] = {}
+        for slug in sorted(stale & set(current)):
+            grouped = search_prefixes(career_search_docs(output_dir, current[slug]))
+            careers[slug] = {"clave": indexed_as(current[slug]), "prefijos": sorted(grouped)}
+            for key, docs in grouped.items():
+                added.setdefault(key, []).extend(docs)
+        touched.update(added)
+
+        shards: dict[str, dict | None] = {}
+        complete = True
+        for key in sorted(touched):
+            try:
+                shard = json.loads((search_dir / f"{key}.json").read_text(encoding="utf-8"))
+                kept = [doc for doc in shard["docs"] if doc[0] not in stale]
+            except (OSError, ValueError, KeyError, TypeError, IndexError):
+                # Only a shard no unchanged career uses may be missing.
+                if any(key in known["prefijos"] for slug, known in careers.items() if slug not in stale):
+                    complete = False
+                    break
+                kept = []
+            docs = sorted([*kept, *added.get(key, ())], key=lambda doc: doc[0])
+            shards[key] = search_shard(key, docs) if docs else None
+        if complete:
+            keep: set[str] = set()
+            for key, shard in shards.items():
+                if shard is not None:
+                    write_shard(key, shard, keep)
+            remove_stale((path for key in touched for path in search_dir.glob(f"{key}.json*")), keep)
+            return descriptor
+
+    keep = set()
+    careers = {}
+    for key, shard in build_search_shards(output_dir, entries).items():
+        write_shard(key, shard, keep)
+        for slug in dict.fromkeys(doc[0] for doc in shard["docs"]):
+            careers.setdefault(slug, {"clave": indexed_as(current[slug]), "prefijos": []})["prefijos"].append(key)
+    for slug, entry in current.items():
+        careers.setdefault(slug, {"clave": indexed_as(entry), "prefijos": []})
+    state.clear()
+    state.update({"carreras": dict(sorted(careers.items()))})
+    remove_stale(search_dir.iterdir(), keep)
+    return descriptor
+
+
+VERSIONS_DIR = "versiones"
+DELTAS_DIR = "deltas"
+DELTA_VERSION = 1
+# Previous versions per career that still get a delta to the current one.
+DELTA_HISTORY = 8
+
+
+def plan_version(materias: list[dict]) -> str:
+    """Content id of a <slug>.materias.json payload (its publish_digest)."""
+    return publish_digest(minify_json(materias))
+
+
+# <slug>.json fields the web app takes from <slug>.materias.json (and the
+# graph it can rebuild from them) or does not use.
+METADATA_VERSION_SKIP = ("materias", "grafo", "generado_en_utc")
+
+
+def metadata_version(payload: dict) -> str:
+    """
+    Content id of the rest of a <slug>.json payload. The web app keeps
+    those fields and only downloads <slug>.json again when it changes.
+    """
+    kept = {key: value for key, value in payload.items() if key not in METADATA_VERSION_SKIP}
+    return publish_digest(minify_json(kept))
+
+
+def apply_plan_delta(materias: list[dict], delta: dict) -> list[dict]:
+    """Mirror of applyPlanDelta in assets/js/core.js."""
+    ids = delta.get("ids", {})
+    removed = set(delta.get("eliminadas", ()))
+    names = delta.get("nombres", {})
+    semesters = delta.get("cuatrimestres", {})
+    requirements = delta.get("correlativas", {})
+
+    result: list[dict] = []
+    for materia in materias:
+        if materia["id"] in removed:
+            continue
+        materia_id = ids.get(materia["id"], materia["id"])
+        result.append(
+            {
+                "id": materia_id,
+                "nombre": names.get(materia_id, materia["nombre"]),
+                "cuatrimestre": semesters.get(materia_id, materia["cuatrimestre"]),
+                "correlativas": requirements.get(
+                    materia_id, [ids.get(required, required) for required in materia["correlativas"]]
+                ),
+            }
         )
+    result.extend(dict(materia) for materia in delta.get("agregadas", ()))
+    if "orden" in delta:
+        position = {materia_id: index for index, materia_id in enumerate(delta["orden"])}
+        result.sort(key=lambda materia: position.get(materia["id"], len(position)))
+    return result
 
-    entries.sort(key=lambda item: item["carrera"].lower())
 
+def plan_delta(old: list[dict], new: list[dict]) -> dict | None:
+    """
+    Compact changes from `old` to `new` materias: renumbered ids (same
+    folded name), removed and added materias, renames, cuatrimestre moves
+    and correlativas changes; "orden" only when the order moved too.
+    Returns None when apply_plan_delta cannot reproduce `new` exactly
+    (e.g. extra keys); clients then download the full plan.
+    """
+    old_by_id = {materia["id"]: materia for materia in old}
+    new_by_id = {materia["id"]: materia for materia in new}
+    if len(old_by_id) != len(old) or len(new_by_id) != len(new):
+        return None
+    removed = [materia_id for materia_id in old_by_id if materia_id not in new_by_id]
+    added = [materia_id for materia_id in new_by_id if materia_id not in old_by_id]
+
+    # A materia whose code changed but whose name did not keeps its progress.
+    ids: dict[str, str] = {}
+    added_by_name: dict[str, list[str]] = {}
+    for materia_id in added:
+        added_by_name.setdefault(slugify(new_by_id[materia_id]["nombre"]), []).append(materia_id)
+    removed_names = [slugify(old_by_id[materia_id]["nombre"]) for materia_id in removed]
+    for materia_id, name in zip(removed, removed_names):
+        candidates = added_by_name.get(name, [])
+        if len(candidates) == 1 and removed_names.count(name) == 1:
+            ids[materia_id] = candidates[0]
+    removed = [materia_id for materia_id in removed if materia_id not in ids]
+    renumbered = set(ids.values())
+    added = [materia_id for materia_id in added if materia_id not in renumbered]
+    # (old id, new id) of every materia present in both versions.
+    kept = [(old_id, ids.get(old_id, old_id)) for old_id in old_by_id if ids.get(old_id, old_id) in new_by_id]
+
+    delta: dict = {}
+    if ids:
+        delta["ids"] = ids
+    if removed:
+        delta["eliminadas"] = removed
+    if added:
+        delta["agregadas"] = [new_by_id[materia_id] for materia_id in added]
+    for key, field_name in (("nombres", "nombre"), ("cuatrimestres", "cuatrimestre")):
+        changes = {
+            new_id: new_by_id[new_id][field_name]
+            for old_id, new_id in kept
+            if old_by_id[old_id][field_name] != new_by_id[new_id][field_name]
+        }
+        if changes:
+            delta[key] = changes
+    requirements = {
+        new_id: new_by_id[new_id]["correlativas"]
+        for old_id, new_id in kept
+        if [ids.get(required, required) for required in old_by_id[old_id]["correlativas"]]
+        != new_by_id[new_id]["correlativas"]
+    }
+    if requirements:
+        delta["correlativas"] = requirements
+
+    if [materia["id"] for materia in apply_plan_delta(old, delta)] != [materia["id"] for materia in new]:
+        delta["orden"] = [materia["id"] for materia in new]
+    return delta if apply_plan_delta(old, delta) == new else None
+
+
+def write_plan_versions(
+    output_dir: Path, entries: list[dict], changed: list[Path] | None = None, state: dict | None = None
+) -> list[dict]:
+    """
+    Keep the last DELTA_HISTORY + 1 versions of each career's materias
+    under output_dir/versiones/ (<slug>.json lists them, oldest first) and
+    write one delta per previous version to the current one as
+    deltas/<slug>.<from>.<to>.json. Returns the entries with "version"
+    and "deltas" ({from: path}) added, which is all catalog.json carries.
+    Snapshots and deltas no longer needed are removed.
+
+    `state` (slug -> {"versiones", "deltas"}, kept in the catalog manifest)
+    is updated in place. Careers whose version matches it are not touched
+    on disk; an empty state rebuilds everything from the files.
+    """
+    changed = changed if changed is not None else []
+    state = state if state is not None else {}
+    versions_dir = output_dir / VERSIONS_DIR
+    deltas_dir = output_dir / DELTAS_DIR
+    versions_dir.mkdir(parents=True, exist_ok=True)
+    deltas_dir.mkdir(parents=True, exist_ok=True)
+
+    full = not state
+    touched: set[str] = set(state) - {entry["slug"] for entry in entries}
+    for slug in touched:
+        del state[slug]
+
+    versioned: list[dict] = []
+    for entry in entries:
+        item = dict(entry)
+        versioned.append(item)
+        slug = entry["slug"]
+        known = state.get(slug)
+        if not isinstance(known, dict) or not isinstance(known.get("versiones"), list):
+            known = None
+        elif not isinstance(known.get("deltas"), dict):
+            known = None
+        if known and known["versiones"][-1:] == [entry.get("version")]:
+            item["version"] = known["versiones"][-1]
+            if known["deltas"]:
+                item["deltas"] = dict(known["deltas"])
+            continue
+
+        touched.add(slug)
+        state.pop(slug, None)
+        try:
+            materias = json.loads((output_dir / entry["materias"]).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            item.pop("version", None)
+            continue
+        current = plan_version(materias)
+
+        history_path = versions_dir / f"{slug}.json"
+        if known:
+            history = [str(version) for version in known["versiones"]]
+        else:
+            try:
+                history = [
+                    str(version) for version in json.loads(history_path.read_text(encoding="utf-8"))["versiones"]
+                ]
+            except (OSError, ValueError, KeyError, TypeError):
+                history = []
+        history = [version for version in history if version != current]
+        history = [version for version in history if (versions_dir / f"{slug}.{version}.json").is_file()]
+        history = [*history[-DELTA_HISTORY:], current]
+
+        snapshot_path = versions_dir / f"{slug}.{current}.json"
+        if write_text_if_changed(snapshot_path, minify_json(materias)):
+            changed.append(snapshot_path)
+        if write_text_if_changed(history_path, json.dumps({"versiones": history}, indent=2)):
+            changed.append(history_path)
+
+        deltas: dict[str, str] = {}
+        for previous in history[:-1]:
+            delta_name = f"{slug}.{previous}.{current}.json"
+            delta_path = deltas_dir / delta_name
+            if not delta_path.is_file():
+                old = json.loads((versions_dir / f"{slug}.{previous}.json").read_text(encoding="utf-8"))
+                delta = plan_delta(old, materias)
+                if delta is None:
+                    continue
+                payload = {"version": DELTA_VERSION, "desde": previous, "hasta": current, **delta}
+                write_text_atomic(delta_path, minify_json(payload))
+                changed.append(delta_path)
+            deltas[previous] = f"{DELTAS_DIR}/{delta_name}"
+        state[slug] = {"versiones": history, "deltas": deltas}
+        item["version"] = current
+        if deltas:
+            item["deltas"] = deltas
+
+    keep_versions: set[str] = set()
+    keep_deltas: set[str] = set()
+    for slug, known in state.items():
+        keep_versions.update([f"{slug}.json", *(f"{slug}.{version}.json" for version in known["versiones"])])
+        keep_deltas.update(Path(path).name for path in known["deltas"].values())
+    for directory, keep in ((versions_dir, keep_versions), (deltas_dir, keep_deltas)):
+        if full:
+            candidates = directory.iterdir()
+        else:
+            candidates = (path for slug in touched for path in directory.glob(f"{slug}.*"))
+        for path in sorted(candidates):
+            if path.is_file() and path.name not in keep:
+                path.unlink()
+                changed.append(path)
+    return versioned
+
+
+def write_catalog(
+    output_dir: Path,
+    records: Iterable[dict] = (),
+    publish: bool = False,
+    rescan: bool = False,
+    changed: list[Path] | None = None,
+) -> Path:
+    """
+    Rebuild catalog.json from the manifest after applying `records` (the
+    plans written by this run). Without a usable manifest, or with rescan,
+    the output folder is rescanned, which already picks those plans up.
+
+    With publish=True the catalog points at content-hashed, minified copies
+    (see publish_catalog_entries) and is itself minified. The digest of each
+    <slug>.json is kept in the manifest's "publicacion" state while its
+    generado_en_utc (which only moves with the content) stays the same, so
+    it is only computed by --publish runs and only for changed plans.
+    The search shards (see write_search_index) and the plan versions and
+    deltas (see write_plan_versions) are refreshed alongside.
+    Its timestamp only moves when the entries do; files whose bytes did not
+    change are not rewritten, and the ones that did go to `changed`.
+    """
+    changed = changed if changed is not None else []
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    manifest = None if rescan else CatalogManifest.load(output_dir)
+    if manifest is None:
+        manifest = CatalogManifest.rescan(output_dir)
+    else:
+        for record in records:
+            manifest.update(record)
+    manifest.drop_missing()
+
+    versions = manifest.state.setdefault("versiones", {})
+    entries = write_plan_versions(output_dir, manifest.catalog_entries(), changed, versions)
+    search = write_search_index(output_dir, entries, changed, manifest.state.setdefault("busqueda", {}))
+    if publish:
+        known = manifest.state.get("publicacion", {})
+        # The materias digest is the entry's version.
+        digests = {entry["materias"]: entry["version"] for entry in entries if entry.get("version")}
+        for entry in entries:
+            published = known.get(entry["slug"])
+            generated = manifest.records[entry["slug"]]["generado_en_utc"]
+            if isinstance(published, dict) and published.get("generado_en_utc") == generated and published.get("hash"):
+                digests[entry["metadata"]] = str(published["hash"])
+        entries = publish_catalog_entries(output_dir, entries, changed, digests)
+        # Hashed names are <slug>.<digest>.json.
+        manifest.state["publicacion"] = {
+            entry["slug"]: {
+                "generado_en_utc": manifest.records[entry["slug"]]["generado_en_utc"],
+                "hash": entry["metadata"].rsplit(".", 2)[1],
+            }
+            for entry in entries
+        }
+    else:
+        manifest.state.pop("publicacion", None)
+    manifest.save()
     catalog_payload = {
         "generado_en_utc": datetime.now(timezone.utc).isoformat(),
         "carreras": entries,
+        "busqueda": search,
     }
     catalog_path = output_dir / "catalog.json"
-    catalog_path.write_text(json.dumps(catalog_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    keep_timestamp(catalog_path, catalog_payload)
+    if publish:
+        catalog_text = minify_json(catalog_payload)
+    else:
+        catalog_text = json.dumps(catalog_payload, ensure_ascii=False, indent=2) + "\n"
+    if write_text_if_changed(catalog_path, catalog_text):
+        changed.append(catalog_path)
+    changed.extend(remove_sidecars(output_dir))
+    if not publish:
+        # Drop the hashed copies of a previous --publish run so they cannot
+        # go stale.
+        publish_dir = output_dir / PUBLISH_DIR
+        changed.extend(remove_unkept(publish_dir, set()))
+        if publish_dir.is_dir() and not any(publish_dir.iterdir()):
+            publish_dir.rmdir()
     return catalog_path
 
 
@@ -557,7 +2894,10 @@ def prune_unreferenced_json(output_dir: Path, catalog_path: Path, verbose: bool
     Remove JSON files in output_dir that are not referenced by catalog.json.
     Keeps:
     - catalog.json
-    - <slug>.json / <slug>.materias.json included in catalog
+    - <slug>.json / <slug>.materias.json included in catalog (also when the
+      catalog points at their --publish copies)
+    Copies under hashed/ that the catalog does not
+    point at are removed too, e.g. all of them after a run without --publish.
     """
     try:
         payload = json.loads(catalog_path.read_text(encoding="utf-8"))
@@ -569,15 +2909,21 @@ def prune_unreferenced_json(output_dir: Path, catalog_path: Path, verbose: bool
         return []
 
     keep_names: set[str] = {"catalog.json"}
+    keep_hashed: set[str] = set()
     for item in entries:
         if not isinstance(item, dict):
             continue
+        slug = str(item.get("slug", "")).strip()
+        if slug:
+            keep_names.update((f"{slug}.json", f"{slug}.materias.json"))
         materias_name = str(item.get("materias", "")).strip()
         metadata_name = str(item.get("metadata", "")).strip()
-        if materias_name:
-            keep_names.add(Path(materias_name).name)
-        if metadata_name:
-            keep_names.add(Path(metadata_name).name)
+        for name in (materias_name, metadata_name):
+            if not name:
+                continue
+            keep_names.add(Path(name).name)
+            if Path(name).parent.name == PUBLISH_DIR:
+                keep_hashed.add(Path(name).name)
 
     removed: list[Path] = []
     for json_path in sorted(output_dir.glob("*.json")):
@@ -588,18 +2934,365 @@ def prune_unreferenced_json(output_dir: Path, catalog_path: Path, verbose: bool
         if verbose:
             print(f"[PRUNE] Removed stale file: {json_path.name}")
 
+    for hashed_path in remove_unkept(output_dir / PUBLISH_DIR, keep_hashed):
+        removed.append(hashed_path)
+        if verbose:
+            print(f"[PRUNE] Removed stale file: {PUBLISH_DIR}/{hashed_path.name}")
+
     return removed
 
 
+def snapshot_pdfs(input_path: Path) -> dict[Path, tuple[int, int]]:
+    snapshot: dict[Path, tuple[int, int]] = {}
+    for pdf_path in iter_pdf_files(input_path):
+        try:
+            stat = pdf_path.stat()
+        except OSError:
+            continue
+        snapshot[pdf_path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def remove_outputs_for(output_dir: Path, pdf_path: Path) -> list[Path]:
+    """Delete the <slug>.json / <slug>.materias.json generated from pdf_path."""
+    removed: list[Path] = []
+    manifest = CatalogManifest.open(output_dir)
+    for slug in manifest.slugs_for_source(str(pdf_path)):
+        for path in (output_dir / f"{slug}.json", output_dir / f"{slug}.materias.json"):
+            if path.exists():
+                path.unlink()
+                removed.append(path)
+    return removed
+
+
+def watch(
+    input_path: Path,
+    options: BatchOptions,
+    jobs: int,
+    prune: bool,
+    interval: float,
+    debounce: float,
+    publish: bool = False,
+) -> int:
+    """
+    Poll input_path for added, changed (mtime/size) or removed PDFs and
+    reprocess only those. A burst of changes is handled once it has been
+    quiet for `debounce` seconds; catalog.json (and --prune cleanup) is then
+    refreshed. Workers and imports stay warm between rounds. Stops on Ctrl+C.
+    """
+    pool: ProcessPoolExecutor | None = None
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        pool = ProcessPoolExecutor(max_workers=jobs)
+    known: dict[Path, tuple[int, int]] = {}
+    print(f"[WATCH] Observando {input_path} cada {interval:g}s (Ctrl+C para salir).")
+    try:
+        while True:
+            current = snapshot_pdfs(input_path)
+            if current == known:
+                time.sleep(interval)
+                continue
+
+            # Debounce: wait until the folder stops changing.
+            while True:
+                time.sleep(debounce)
+                settled = snapshot_pdfs(input_path)
+                if settled == current:
+                    break
+                current = settled
+
+            changed = [path for path, state in current.items() if known.get(path) != state]
+            removed = [path for path in known if path not in current]
+            known = current
+
+            batch = process_batch(changed, options, jobs=jobs, pool=pool) if changed else BatchResult()
+            for pdf_path in removed:
+                print(f"[WATCH] PDF eliminado: {pdf_path}")
+                if prune:
+                    for path in remove_outputs_for(options.output_dir, pdf_path):
+                        if options.verbose:
+                            print(f"[PRUNE] Removed stale file: {path.name}")
+            if options.cache is not None:
+                options.cache.evict(list(current), options.split_map)
+            if options.store is not None:
+                with PlanStore(options.store) as plan_store:
+                    if prune:
+                        for pdf_path in removed:
+                            plan_store.remove_source(str(pdf_path))
+                    batch.records = export_store(plan_store, options.output_dir, batch.changed)
+
+            catalog_path = write_catalog(
+                options.output_dir, batch.records, publish=publish, changed=batch.changed
+            )
+            pruned: list[Path] = []
+            if prune:
+                pruned = prune_unreferenced_json(options.output_dir, catalog_path, verbose=options.verbose)
+            print(
+                f"[WATCH] {len(changed)} PDF(s) procesado(s), {batch.failures} con errores, "
+                f"{len(removed)} eliminado(s), {len(pruned)} JSON obsoleto(s), "
+                f"{len(batch.changed)} archivo(s) modificado(s). Catálogo: {catalog_path}"
+            )
+    except KeyboardInterrupt:
+        print("[WATCH] Detenido.")
+        return 0
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+
+# --serve: largest accepted upload.
+SERVE_MAX_UPLOAD = 50 * 1024 * 1024
+
+
+class ServiceBusy(Exception):
+    """The worker pool and its queue are full."""
+
+
+def _serve_worker(conn, extraction: ExtractionOptions) -> None:
+    """
+    Worker process loop: one (pdf bytes, split map, name) job per message,
+    until a None message or the server's end of the pipe closes.
+    """
+    # Ctrl+C is handled by the server, which then stops the workers.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return
+        if job is None:
+            return
+        data, split_map, name = job
+        try:
+            plan = parse_plan(data, split_map, extraction, fallback_name=Path(name).stem)
+            slug, payload, web_payload = plan_payloads(plan.as_dict(), name)
+            conn.send((True, {"slug": slug, "metadata": payload, "materias": web_payload}))
+        except Exception as exc:
+            conn.send((False, str(exc) or type(exc).__name__))
+
+
+class WorkerPool:
+    """
+    Worker processes started up front (imports loaded, ready to parse),
+    each driven over its own pipe. run() admits at most size + queue_limit
+    requests at once and refuses the rest with ServiceBusy; an admitted
+    request that is not answered within `timeout` seconds (queue wait
+    included) gets its worker killed and replaced, so a pathological PDF
+    cannot pin a worker.
+    """
+
+    def __init__(self, size: int, queue_limit: int, timeout: float, extraction: ExtractionOptions) -> None:
+        import multiprocessing
+
+        # Fresh interpreters: workers are replaced from request threads, where
+        # forking is unsafe, and they must not inherit each other's pipes.
+        self._context = multiprocessing.get_context("spawn")
+        self.size = size
+        self.timeout = timeout
+        self._extraction = extraction
+        self._admission = threading.BoundedSemaphore(size + queue_limit)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._idle: queue.Queue = queue.Queue()
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> tuple[BaseProcess, Connection]:
+        parent, child = self._context.Pipe()
+        process = self._context.Process(target=_serve_worker, args=(child, self._extraction), daemon=True)
+        process.start()
+        child.close()
+        return process, parent
+
+    def _replace(self, worker: tuple[BaseProcess, Connection]) -> None:
+        process, conn = worker
+        process.kill()
+        process.join()
+        conn.close()
+        self._idle.put(self._spawn())
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"procesos": self.size, "en_curso": self._active}
+
+    def run(self, data: bytes, split_map: dict[int, int], name: str) -> dict:
+        if not self._admission.acquire(blocking=False):
+            raise ServiceBusy
+        with self._lock:
+            self._active += 1
+        try:
+            deadline = time.monotonic() + self.timeout
+            try:
+                worker = self._idle.get(timeout=self.timeout)
+            except queue.Empty:
+                raise TimeoutError from None
+            process, conn = worker
+            try:
+                conn.send((data, split_map, name))
+                if not conn.poll(max(0.0, deadline - time.monotonic())):
+                    raise TimeoutError
+                ok, value = conn.recv()
+            except (TimeoutError, EOFError, OSError) as exc:
+                self._replace(worker)
+                if isinstance(exc, TimeoutError):
+                    raise
+                raise RuntimeError("El proceso de extracción terminó inesperadamente.") from exc
+            self._idle.put(worker)
+            if not ok:
+                raise RuntimeError(value)
+            return value
+        finally:
+            with self._lock:
+                self._active -= 1
+            self._admission.release()
+
+    def close(self) -> None:
+        while True:
+            try:
+                process, conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            with contextlib.suppress(OSError):
+                conn.send(None)
+            process.join(timeout=5)
+            if process.is_alive():
+                process.kill()
+            conn.close()
+
+
+class PlanRequests:
+    """
+    Request handling for --serve, mixed into http.server's request handler
+    by serve() (so http.server is only imported there).
+
+    POST /plan with the raw PDF as body (optional ?split=1:5,2:5 and
+    ?nombre=<archivo.pdf>) answers {"slug", "metadata", "materias"}: the
+    <slug>.json and <slug>.materias.json contents process_pdf would write.
+    GET /health reports the pool. Errors are {"error": "..."}.
+    """
+
+    # Set by serve() on the server instance: pool, split_map, verbose.
+    server_version = "pdf-to-plan"
+
+    def send_json(self, status: int, payload: dict, headers: dict[str, str] | None = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if urlsplit(self.path).path != "/health":
+            self.send_json(404, {"error": "Ruta inexistente."})
+            return
+        self.send_json(200, {"ok": True, **self.server.pool.stats()})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path != "/plan":
+            self.send_json(404, {"error": "Ruta inexistente."})
+            return
+        query = parse_qs(url.query)
+        try:
+            split_raw = query.get("split", [""])[0]
+            split_map = parse_split_map(split_raw) if split_raw else self.server.split_map
+        except SystemExit as exc:
+            self.send_json(400, {"error": str(exc)})
+            return
+        name = Path(query.get("nombre", ["upload.pdf"])[0]).name or "upload.pdf"
+
+        length_raw = self.headers.get("Content-Length")
+        if length_raw is None:
+            self.send_json(411, {"error": "Falta Content-Length."})
+            return
+        try:
+            length = int(length_raw)
+        except ValueError:
+            length = -1
+        if length <= 0 or length > SERVE_MAX_UPLOAD:
+            self.close_connection = True
+            status = 413 if length > SERVE_MAX_UPLOAD else 400
+            self.send_json(status, {"error": f"El PDF debe pesar entre 1 byte y {SERVE_MAX_UPLOAD} bytes."})
+            return
+        data = self.rfile.read(length)
+
+        try:
+            response = self.server.pool.run(data, split_map, name)
+        except ServiceBusy:
+            self.send_json(503, {"error": "Servicio ocupado, reintentar."}, {"Retry-After": "1"})
+        except TimeoutError:
+            self.send_json(504, {"error": f"Se superó el límite de {self.server.pool.timeout:g}s."})
+        except RuntimeError as exc:
+            self.send_json(422, {"error": str(exc)})
+        else:
+            self.send_json(200, response)
+
+    def log_message(self, format: str, *args) -> None:
+        if self.server.verbose:
+            print(f"[SERVE] {self.address_string()} {format % args}")
+
+
+def parse_serve_address(raw: str) -> tuple[str, int]:
+    host, _, port_raw = raw.rpartition(":")
+    try:
+        port = int(port_raw)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid --serve address '{raw}'. Expected PORT or HOST:PORT.") from exc
+    return host or "127.0.0.1", port
+
+
+def serve(
+    address: tuple[str, int],
+    split_map: dict[int, int],
+    extraction: ExtractionOptions,
+    jobs: int,
+    queue_limit: int,
+    timeout: float,
+    verbose: bool = False,
+) -> int:
+    """Run the HTTP extraction service (see PlanRequests) until Ctrl+C or SIGTERM."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    handler = type("PlanRequestHandler", (PlanRequests, BaseHTTPRequestHandler), {})
+    pool = WorkerPool(jobs, queue_limit, timeout, extraction)
+    try:
+        server = ThreadingHTTPServer(address, handler)
+    except OSError as exc:
+        pool.close()
+        print(f"No se pudo escuchar en {address[0]}:{address[1]}: {exc}", file=sys.stderr)
+        return 1
+    server.pool = pool
+    server.split_map = split_map
+    server.verbose = verbose
+    # Stop cleanly on SIGTERM too (service managers, `kill`).
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    host, port = server.server_address[:2]
+    print(
+        f"[SERVE] Escuchando en http://{host}:{port} con {jobs} proceso(s), "
+        f"cola de {queue_limit} y límite de {timeout:g}s por PDF (Ctrl+C para salir)."
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("[SERVE] Detenido.")
+    finally:
+        server.server_close()
+        pool.close()
+    return 0
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Parse PDFs de planes de estudio y exportar JSON para la web."
     )
     parser.add_argument(
         "--input",
-        required=True,
         type=Path,
-        help="PDF individual o carpeta con PDFs.",
+        help="PDF individual o carpeta con PDFs (obligatorio salvo con --serve).",
     )
     parser.add_argument(
         "--output",
@@ -620,6 +3313,142 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Imprime detalle de cada PDF procesado.",
     )
+    parser.add_argument(
+        "--jobs",
+        default=1,
+        type=int,
+        help=(
+            "Cantidad de procesos para parsear PDFs en paralelo "
+            "(default: 1; 0 = un proceso por CPU)."
+        ),
+    )
+    parser.add_argument(
+        "--page-jobs",
+        default=1,
+        type=int,
+        help=(
+            "Procesos para extraer las páginas de un mismo PDF en paralelo, útil con "
+            "PDFs muy grandes (default: 1; 0 = un proceso por CPU)."
+        ),
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=Path(".cache/pdf_to_plan"),
+        type=Path,
+        help=(
+            "Cache de planes extraídos, indexado por hash del PDF, versión del parser "
+            "y --split (default: .cache/pdf_to_plan)."
+        ),
+    )
+    cache_mode = parser.add_mutually_exclusive_group()
+    cache_mode.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="No lee ni escribe el cache: parsea todos los PDFs.",
+    )
+    cache_mode.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Ignora el cache existente, parsea todos los PDFs y lo regenera.",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=DEFAULT_BACKEND,
+        help=(
+            "Extractor de palabras y texto: pdfplumber (referencia) o pdfminer (lee los caracteres "
+            "de pdfminer directamente, más rápido). Comparar con bench_pdf_to_plan.py backends."
+        ),
+    )
+    parser.add_argument(
+        "--all-pages",
+        action="store_true",
+        help=(
+            "Extrae palabras de todas las páginas. Por defecto una pasada rápida de texto (pypdf) "
+            "elige las páginas con tablas de materias y el resto solo aporta texto."
+        ),
+    )
+    parser.add_argument(
+        "--pages",
+        help="Páginas (desde 1) a leer con el backend, p. ej. '3-5,8'. Reemplaza la selección automática.",
+    )
+    parser.add_argument(
+        "--words-dir",
+        type=Path,
+        help=(
+            "Guarda las palabras posicionadas de cada PDF en <DIR>/<pdf>.words.bin "
+            "para re-parsear luego con --from-words sin abrir los PDFs."
+        ),
+    )
+    parser.add_argument(
+        "--from-words",
+        action="store_true",
+        help=(
+            "--input es un sidecar .words.bin o una carpeta con ellos: solo se re-ejecuta "
+            "el parseo de materias y la salida (no usa pdfplumber ni el cache)."
+        ),
+    )
+    parser.add_argument(
+        "--timings",
+        type=Path,
+        help=(
+            "Escribe un reporte JSON con tiempo de pared, tiempo de CPU y pico de memoria "
+            "(tracemalloc) por etapa y por PDF."
+        ),
+    )
+    parser.add_argument(
+        "--profile-dir",
+        type=Path,
+        help="Guarda un volcado cProfile por PDF en <DIR>/<pdf>.prof.",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help=(
+            "Queda corriendo y reprocesa solo los PDFs agregados, modificados o eliminados "
+            "(detectados por fecha y tamaño), actualizando catalog.json."
+        ),
+    )
+    parser.add_argument(
+        "--watch-interval",
+        default=2.0,
+        type=float,
+        help="Segundos entre chequeos en --watch (default: 2).",
+    )
+    parser.add_argument(
+        "--debounce",
+        default=1.0,
+        type=float,
+        help="Segundos sin cambios antes de procesar una ráfaga en --watch (default: 1).",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PUERTO",
+        help=(
+            "Levanta un servicio HTTP local: POST /plan con el PDF como cuerpo devuelve "
+            "la metadata y materias en JSON. Usa --jobs procesos precargados."
+        ),
+    )
+    parser.add_argument(
+        "--serve-timeout",
+        default=60.0,
+        type=float,
+        help="Segundos máximos por PDF en --serve, incluida la espera en cola (default: 60).",
+    )
+    parser.add_argument(
+        "--serve-queue",
+        default=8,
+        type=int,
+        help="PDFs que pueden esperar un proceso libre en --serve; el resto recibe 503 (default: 8).",
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help=(
+            "Publica además copias minificadas con hash de contenido en <output>/hashed/ "
+            "y apunta catalog.json a ellas."
+        ),
+    )
     parser.add_argument(
         "--prune",
         action="store_true",
@@ -628,9 +3457,54 @@ def build_parser() -> argparse.ArgumentParser:
             "(evita acumulación de archivos obsoletos)."
         ),
     )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        help=(
+            "Guarda los planes en una base SQLite (carreras, materias, correlativas, hitos) "
+            "y exporta desde ahí todos los JSON de --output. Con --catalog-only solo re-exporta."
+        ),
+    )
+    parser.add_argument(
+        "--catalog-only",
+        action="store_true",
+        help=(
+            "Solo reconstruye catalog.json escaneando los <slug>.json de --output, sin abrir PDFs "
+            "(con --prune también limpia; respeta --publish)."
+        ),
+    )
+    parser.add_argument(
+        "--prune-only",
+        action="store_true",
+        help="Solo elimina los JSON de --output no referenciados por el catalog.json actual, sin abrir PDFs.",
+    )
     return parser
 
 
+def maintain_catalog(
+    output_dir: Path, rebuild: bool, prune: bool, publish: bool, verbose: bool, store: Path | None = None
+) -> int:
+    """--catalog-only / --prune-only: catalog upkeep on existing outputs, no PDF stack involved."""
+    catalog_path = output_dir / "catalog.json"
+    if rebuild:
+        changed: list[Path] = []
+        if store is not None:
+            if not store.is_file():
+                print(f"No existe el store {store}.", file=sys.stderr)
+                return 1
+            with PlanStore(store) as plan_store:
+                export_store(plan_store, output_dir, changed)
+        catalog_path = write_catalog(output_dir, publish=publish, rescan=True, changed=changed)
+        print(f"Catálogo reconstruido: {catalog_path} ({len(changed)} archivo(s) modificado(s)).")
+    elif not catalog_path.is_file():
+        print(f"No existe {catalog_path}; usar --catalog-only para generarlo.", file=sys.stderr)
+        return 1
+    if prune:
+        pruned = prune_unreferenced_json(output_dir, catalog_path, verbose=verbose)
+        print(f"Limpieza de JSON obsoletos: {len(pruned)} archivo(s) eliminado(s).")
+    return 0
+
+
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
@@ -639,36 +3513,159 @@ def main() -> int:
     output_dir: Path = args.output
     split_map = parse_split_map(args.split)
 
-    if not input_path.exists():
+    if args.catalog_only or args.prune_only:
+        return maintain_catalog(
+            output_dir,
+            rebuild=args.catalog_only,
+            prune=args.prune_only or args.prune,
+            publish=args.publish,
+            verbose=args.verbose,
+            store=args.store,
+        )
+    if input_path is None and not args.serve:
+        parser.error("--input es obligatorio salvo con --serve, --catalog-only o --prune-only.")
+    if input_path is not None and not input_path.exists():
         print(f"Input no existe: {input_path}", file=sys.stderr)
         return 1
 
-    pdf_files = list(iter_pdf_files(input_path))
-    if not pdf_files:
-        print(f"No se encontraron PDFs en: {input_path}", file=sys.stderr)
+    if args.jobs < 0:
+        print("--jobs debe ser >= 0.", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.page_jobs < 0:
+        print("--page-jobs debe ser >= 0.", file=sys.stderr)
         return 1
+    extraction = ExtractionOptions(
+        backend=args.backend,
+        prefilter=not args.all_pages,
+        pages=parse_page_ranges(args.pages),
+        page_jobs=args.page_jobs or os.cpu_count() or 1,
+    )
 
-    failures = 0
-    for pdf_path in pdf_files:
-        try:
-            process_pdf(pdf_path, output_dir=output_dir, split_map=split_map, verbose=args.verbose)
-        except Exception as exc:
-            failures += 1
-            print(f"[ERROR] {pdf_path}: {exc}", file=sys.stderr)
+    if args.serve:
+        if args.serve_timeout <= 0 or args.serve_queue < 0:
+            print("--serve-timeout debe ser > 0 y --serve-queue >= 0.", file=sys.stderr)
+            return 1
+        return serve(
+            parse_serve_address(args.serve),
+            split_map,
+            extraction,
+            jobs=jobs,
+            queue_limit=args.serve_queue,
+            timeout=args.serve_timeout,
+            verbose=args.verbose,
+        )
+
+    if args.watch:
+        if args.from_words or not input_path.is_dir():
+            print("--watch requiere que --input sea una carpeta de PDFs.", file=sys.stderr)
+            return 1
+        options = BatchOptions(
+            output_dir=output_dir,
+            split_map=split_map,
+            verbose=args.verbose,
+            cache=(
+                None
+                if args.no_cache
+                else PlanCache(directory=args.cache_dir, read=not args.rebuild, extraction=extraction)
+            ),
+            words_dir=args.words_dir,
+            profile_dir=args.profile_dir,
+            extraction=extraction,
+            store=args.store,
+        )
+        return watch(
+            input_path,
+            options,
+            jobs=jobs,
+            prune=args.prune,
+            interval=args.watch_interval,
+            debounce=args.debounce,
+            publish=args.publish,
+        )
+
+    batch_timings = StageTimings() if args.timings is not None else None
+    if batch_timings is not None:
+        tracemalloc.start()
+
+    if args.from_words:
+        sources = list(iter_word_sidecars(input_path))
+        source_label = "sidecar(s)"
+        if not sources:
+            print(f"No se encontraron sidecars {WORDS_SUFFIX} en: {input_path}", file=sys.stderr)
+            return 1
+
+        batch = BatchResult()
+        for sidecar_path in sources:
+            try:
+                outputs = process_word_sidecar(
+                    sidecar_path,
+                    output_dir=output_dir,
+                    split_map=split_map,
+                    verbose=args.verbose,
+                    store=args.store,
+                )
+            except Exception as exc:
+                batch.add(sidecar_path, PdfResult(error=str(exc)))
+            else:
+                batch.add(sidecar_path, PdfResult(record=outputs.record, changed=outputs.changed))
+    else:
+        sources = list(iter_pdf_files(input_path))
+        source_label = "PDF(s)"
+        if not sources:
+            print(f"No se encontraron PDFs en: {input_path}", file=sys.stderr)
+            return 1
+
+        cache = (
+            None
+            if args.no_cache
+            else PlanCache(directory=args.cache_dir, read=not args.rebuild, extraction=extraction)
+        )
+        options = BatchOptions(
+            output_dir=output_dir,
+            split_map=split_map,
+            verbose=args.verbose,
+            cache=cache,
+            words_dir=args.words_dir,
+            timings=args.timings is not None,
+            profile_dir=args.profile_dir,
+            extraction=extraction,
+            store=args.store,
+        )
 
-    if failures:
-        print(f"Procesados con errores: {failures}/{len(pdf_files)}", file=sys.stderr)
+        batch = process_batch(sources, options, jobs=jobs)
+        if cache is not None:
+            with timed(batch_timings, "cache_evict"):
+                evicted = cache.evict(sources, split_map)
+            for entry_path in evicted:
+                if args.verbose:
+                    print(f"[CACHE] Removed stale entry: {entry_path.name}")
+
+    if batch.failures:
+        print(f"Procesados con errores: {batch.failures}/{len(sources)}", file=sys.stderr)
+        if args.timings is not None:
+            write_timings_report(args.timings, batch.reports, batch_timings)
         return 2
 
-    catalog_path = write_catalog(output_dir)
+    if args.store is not None:
+        with timed(batch_timings, "export_store"), PlanStore(args.store) as plan_store:
+            batch.records = export_store(plan_store, output_dir, batch.changed)
+    with timed(batch_timings, "write_catalog"):
+        catalog_path = write_catalog(output_dir, batch.records, publish=args.publish, changed=batch.changed)
     pruned: list[Path] = []
     if args.prune:
-        pruned = prune_unreferenced_json(output_dir, catalog_path, verbose=args.verbose)
+        with timed(batch_timings, "prune"):
+            pruned = prune_unreferenced_json(output_dir, catalog_path, verbose=args.verbose)
+    if args.timings is not None:
+        write_timings_report(args.timings, batch.reports, batch_timings)
 
-    print(f"Procesados OK: {len(pdf_files)} PDF(s). Salida: {output_dir}")
+    print(f"Procesados OK: {len(sources)} {source_label}. Salida: {output_dir}")
     print(f"Catálogo actualizado: {catalog_path}")
+    print(f"Archivos modificados: {len(batch.changed)} (los demás ya estaban al día).")
     if args.prune:
         print(f"Limpieza de JSON obsoletos: {len(pruned)} archivo(s) eliminado(s).")
+    if args.timings is not None:
+        print(f"Reporte de tiempos: {args.timings}")
     return 0
 
 